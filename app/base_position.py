@@ -0,0 +1,112 @@
+"""
+Position estimation and PID control for the base rotation motor.
+The heading comes from a quadrature encoder when one is configured,
+otherwise from dead reckoning on the commanded speed.
+"""
+
+
+class DeadReckoningPosition:
+    """Integrate commanded speed over time into a heading estimate"""
+
+    def __init__(self, position_cfg):
+        """
+        Args:
+            position_cfg: "motors.base_rotation.position" config dict
+                          (degrees_per_second at 100% speed)
+        """
+        self.degrees_per_second = position_cfg.get("degrees_per_second", 90)
+        self.degrees = 0.0
+
+    def update(self, speed, dt):
+        """
+        Advance the estimate
+
+        Args:
+            speed: Signed commanded speed (-100 to 100, positive = cw)
+            dt: Time step in seconds
+        """
+        self.degrees += speed / 100 * self.degrees_per_second * dt
+
+    def zero(self):
+        """Make the current heading 0°"""
+        self.degrees = 0.0
+
+
+class EncoderPosition:
+    """Read the heading from a quadrature encoder (rotaryio)"""
+
+    def __init__(self, encoder_cfg):
+        """
+        Args:
+            encoder_cfg: Encoder config dict (pin_a, pin_b, counts_per_degree)
+        """
+        import board
+        import rotaryio
+
+        self.encoder = rotaryio.IncrementalEncoder(
+            getattr(board, encoder_cfg["pin_a"]),
+            getattr(board, encoder_cfg["pin_b"])
+        )
+        self.counts_per_degree = encoder_cfg.get("counts_per_degree", 1)
+        self._offset = self.encoder.position
+        self.degrees = 0.0
+
+    def update(self, speed, dt):
+        """Read the encoder (speed and dt are unused)"""
+        self.degrees = (self.encoder.position - self._offset) / self.counts_per_degree
+
+    def zero(self):
+        """Make the current heading 0°"""
+        self._offset = self.encoder.position
+        self.degrees = 0.0
+
+
+class PID:
+    """PID controller with output clamp and integral anti-windup"""
+
+    def __init__(self, pid_cfg):
+        """
+        Args:
+            pid_cfg: PID config dict (kp, ki, kd, max_output)
+        """
+        self.kp = pid_cfg.get("kp", 2.0)
+        self.ki = pid_cfg.get("ki", 0.0)
+        self.kd = pid_cfg.get("kd", 0.1)
+        self.max_output = pid_cfg.get("max_output", 80)
+        self.reset()
+
+    def reset(self):
+        """Clear integral and derivative history"""
+        self._integral = 0.0
+        self._last_error = None
+
+    def update(self, error, dt, max_output=None):
+        """
+        Compute the controller output
+
+        Args:
+            error: Setpoint minus measurement
+            dt: Time step in seconds
+            max_output: Output magnitude limit (defaults to configured max_output)
+
+        Returns:
+            float: Output clamped to ±max_output
+        """
+        limit = self.max_output if max_output is None else max_output
+
+        derivative = 0.0
+        if self._last_error is not None and dt > 0:
+            derivative = (error - self._last_error) / dt
+        self._last_error = error
+
+        integral = self._integral + error * dt
+        output = self.kp * error + self.ki * integral + self.kd * derivative
+
+        if output > limit:
+            output = limit
+        elif output < -limit:
+            output = -limit
+        else:
+            # Only integrate while unsaturated (anti-windup)
+            self._integral = integral
+        return output
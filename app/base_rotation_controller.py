@@ -1,11 +1,16 @@
 """
 Base rotation controller wrapper for DRV8837 motor driver.
-Provides high-level interface for platform rotation with sleep mode.
+Provides high-level interface for platform rotation with sleep mode,
+plus optional heading estimation and closed-loop goto.
 """
 
 import board
 import time
+import clock
+from clock import MAX_TICK_S
 from motor_controller import DRV8837Controller
+from base_position import DeadReckoningPosition, EncoderPosition, PID
+from logger import log
 
 
 class BaseRotationController:
@@ -23,36 +28,127 @@ class BaseRotationController:
         self.controller = DRV8837Controller(
             in1_pin=getattr(board, base_cfg["in1_pin"]),
             in2_pin=getattr(board, base_cfg["in2_pin"]),
-            sleep_pin=getattr(board, base_cfg["sleep_pin"])
+            sleep_pin=getattr(board, base_cfg["sleep_pin"]),
+            pwm=base_cfg.get("pwm")
         )
         
-        self.idle_sleep_timeout = config.get("safety", {}).get("idle_sleep_ms", 5000) / 1000.0
-        self.last_command_time = 0
+        self.idle_sleep_ms = config.get("safety", {}).get("idle_sleep_ms", 5000)
+        self.last_command_ms = 0
         self.current_direction = "stop"
         
+        # Optional heading estimate and PID goto
+        self.position = None
+        self.pid = None
+        self.goto_target = None
+        self._goto_speed = None
+        self._goto_deadline_ms = 0
+        self._last_tick_ns = time.monotonic_ns()
+        position_cfg = base_cfg.get("position", {})
+        if position_cfg.get("enabled", False):
+            if position_cfg.get("encoder"):
+                self.position = EncoderPosition(position_cfg["encoder"])
+            else:
+                self.position = DeadReckoningPosition(position_cfg)
+            self.pid = PID(position_cfg.get("pid", {}))
+            self.tolerance = position_cfg.get("tolerance_deg", 2)
+            self.min_speed = position_cfg.get("min_speed", 0)
+            self.goto_timeout_ms = position_cfg.get("goto_timeout_ms", 10000)
+        
         print("✓ Base rotation controller initialized")
+        if self.position:
+            source = "encoder" if isinstance(self.position, EncoderPosition) else "dead reckoning"
+            print(f"  Heading estimate enabled ({source}), base_goto available")
     
     def set_direction(self, direction, speed=100):
         """
-        Set base rotation direction and speed
+        Set base rotation direction and speed (cancels any goto in progress)
         
         Args:
             direction: 'cw', 'ccw', or 'stop'
             speed: Speed percentage (0-100)
         """
-        self.last_command_time = time.monotonic()
+        self.goto_target = None
+        self._drive(direction, speed)
+    
+    def _drive(self, direction, speed):
+        """Send a direction/speed to the driver"""
+        self.last_command_ms = clock.now_ms()
         self.current_direction = direction
         
         if direction == "cw":
-            self.controller.enable()
-            self.controller.set_speed_cw(speed)
+            self.controller.rotate_cw(speed)
         elif direction == "ccw":
-            self.controller.enable()
-            self.controller.set_speed_ccw(speed)
+            self.controller.rotate_ccw(speed)
         else:  # stop
             self.controller.brake()
             self.current_direction = "stop"
     
+    def goto(self, degrees, speed=None):
+        """
+        Rotate to an absolute heading under PID control
+        
+        Args:
+            degrees: Target heading (0° = power-up or last zero; cw positive)
+            speed: Optional speed limit percentage (defaults to pid.max_output)
+        
+        Returns:
+            bool: True if accepted, False if position control is disabled
+        """
+        if self.pid is None:
+            return False
+        self.goto_target = degrees
+        self._goto_speed = speed
+        self._goto_deadline_ms = clock.now_ms() + self.goto_timeout_ms
+        self.pid.reset()
+        return True
+    
+    def is_goto_active(self):
+        """Check if a goto is in progress"""
+        return self.goto_target is not None
+    
+    def zero(self):
+        """Make the current heading 0° (stops a goto, whose target was in the old frame)"""
+        if self.position:
+            if self.goto_target is not None:
+                self.goto_target = None
+                self._drive("stop", 0)
+            self.position.zero()
+    
+    def tick(self):
+        """
+        Update the heading estimate and run one PID step of an active goto
+        Should be called periodically from main loop (no-op without position)
+        """
+        now = time.monotonic_ns()
+        dt = min((now - self._last_tick_ns) / 1_000_000_000, MAX_TICK_S)
+        self._last_tick_ns = now
+        
+        if self.position is None:
+            return
+        self.position.update(self.controller.current_speed, dt)
+        
+        if self.goto_target is None:
+            return
+        
+        # Deadline first, so a goto always ends even if the error cannot be computed
+        if clock.now_ms() > self._goto_deadline_ms:
+            log.warning("base_goto timed out at %.1f° (target %s)", self.position.degrees, self.goto_target)
+            self.goto_target = None
+            self._drive("stop", 0)
+            return
+        
+        error = self.goto_target - self.position.degrees
+        if abs(error) <= self.tolerance:
+            self.goto_target = None
+            self._drive("stop", 0)
+            return
+        
+        output = self.pid.update(error, dt, self._goto_speed)
+        speed = int(abs(output) + 0.5)
+        if speed < self.min_speed:
+            speed = self.min_speed
+        self._drive("cw" if output > 0 else "ccw", speed)
+    
     def stop(self):
         """Stop base rotation"""
         self.set_direction("stop", 0)
@@ -63,17 +159,20 @@ class BaseRotationController:
         Should be called periodically from main loop
         """
         if self.current_direction == "stop":
-            idle_time = time.monotonic() - self.last_command_time
-            if idle_time > self.idle_sleep_timeout:
+            if clock.now_ms() - self.last_command_ms > self.idle_sleep_ms:
                 self.controller.disable()
     
     def get_status(self):
         """Get current base rotation status"""
-        return {
+        status = {
             "direction": self.current_direction,
             "speed": self.controller.current_speed,
             "sleeping": not (self.controller.sleep and self.controller.sleep.value)
         }
+        if self.position:
+            status["position"] = round(self.position.degrees, 1)
+            status["target"] = self.goto_target
+        return status
     
     def deinit(self):
         """Cleanup resources"""
@@ -0,0 +1,120 @@
+"""
+Compact binary WebSocket protocol for Pico2W tracked arm car.
+Fixed-layout frames for the hot control actions, negotiated per connection
+with a JSON "hello" and used alongside the JSON protocol.
+
+Request frames (byte 0 is the opcode):
+    TRACK        0x01  int8 left, int8 right
+    SERVO        0x02  uint8 channel, uint8 angle
+    SERVO_BATCH  0x03  uint8 angle * N (one per configured servo, in config order)
+    BASE         0x04  int8 direction (-1 ccw, 0 stop, 1 cw), uint8 speed
+    PING         0x05  (no payload)
+    SERVO_RESET  0x06  (no payload)
+
+Response frames are always 3 bytes: opcode | 0x80, status, value
+    status OK       value = 0
+    status CLAMPED  value = applied angle
+    status ERROR    value = error code
+PONG responses append a uint32 little-endian millisecond timestamp.
+
+Setting NOACK_FLAG (0x40) on a request opcode suppresses its OK response
+unless the command changed device state.
+"""
+
+PROTOCOL_NAME = "binary"
+PROTOCOL_VERSION = 1
+
+OP_TRACK = 0x01
+OP_SERVO = 0x02
+OP_SERVO_BATCH = 0x03
+OP_BASE = 0x04
+OP_PING = 0x05
+OP_SERVO_RESET = 0x06
+
+RESPONSE_FLAG = 0x80
+
+# Set on a request opcode to suppress the OK response for that frame
+NOACK_FLAG = 0x40
+
+STATUS_OK = 0
+STATUS_CLAMPED = 1
+STATUS_ERROR = 2
+
+# Error codes share names with the JSON protocol's "error" field
+ERROR_CODES = {
+    "invalid_action": 1,
+    "invalid_format": 2,
+    "speed_out_of_range": 3,
+    "channel_not_found": 4,
+    "invalid_direction": 5,
+    "length_mismatch": 6,
+    "not_negotiated": 7,
+    "execution_error": 8,
+    "no_feasible_angle": 9,
+    "not_controller": 10,
+}
+
+# Base direction byte -> JSON direction string
+BASE_DIRECTIONS = {0: "stop", 1: "cw", 0xFF: "ccw"}
+
+# Expected total frame length per opcode (None = variable)
+FRAME_LENGTHS = {
+    OP_TRACK: 3,
+    OP_SERVO: 3,
+    OP_SERVO_BATCH: None,
+    OP_BASE: 3,
+    OP_PING: 1,
+    OP_SERVO_RESET: 1,
+}
+
+# Opcode -> JSON action name (used for error reporting and logging)
+ACTION_NAMES = {
+    OP_TRACK: "track",
+    OP_SERVO: "servo",
+    OP_SERVO_BATCH: "servo_batch",
+    OP_BASE: "base",
+    OP_PING: "ping",
+    OP_SERVO_RESET: "servo_reset",
+}
+
+
+def int8(byte):
+    """Interpret an unsigned byte as a signed int8"""
+    return byte - 256 if byte > 127 else byte
+
+
+# OK frames are immutable and sent for every acknowledged command: build once
+_OK_FRAMES = {opcode: bytes((opcode | RESPONSE_FLAG, STATUS_OK, 0)) for opcode in FRAME_LENGTHS}
+
+
+def ok_frame(opcode):
+    """Get the (shared) OK response frame"""
+    frame = _OK_FRAMES.get(opcode)
+    if frame is None:
+        frame = bytes((opcode | RESPONSE_FLAG, STATUS_OK, 0))
+    return frame
+
+
+def clamped_frame(opcode, value):
+    """Build a CLAMPED response frame carrying the applied value"""
+    return bytes((opcode | RESPONSE_FLAG, STATUS_CLAMPED, int(value) & 0xFF))
+
+
+def clamped_batch_frame(opcode, values):
+    """Build a CLAMPED response frame whose value is the count, followed by all applied values"""
+    frame = bytearray((opcode | RESPONSE_FLAG, STATUS_CLAMPED, len(values)))
+    for value in values:
+        frame.append(int(value) & 0xFF)
+    return bytes(frame)
+
+
+def error_frame(opcode, error_code):
+    """Build an ERROR response frame"""
+    return bytes((opcode | RESPONSE_FLAG, STATUS_ERROR, ERROR_CODES.get(error_code, ERROR_CODES["execution_error"])))
+
+
+def pong_frame(timestamp_ms):
+    """Build a PONG response frame"""
+    ts = int(timestamp_ms) & 0xFFFFFFFF
+    return bytes((OP_PING | RESPONSE_FLAG, STATUS_OK, 0,
+                  ts & 0xFF, (ts >> 8) & 0xFF, (ts >> 16) & 0xFF, (ts >> 24) & 0xFF))
@@ -0,0 +1,15 @@
+"""
+Monotonic clock helpers for Pico2W tracked arm car.
+Shared by the timers, rate windows and motion ticks so every module reads
+time the same way.
+"""
+
+import time
+
+# Longest time step a motion tick may integrate (guards against main-loop stalls)
+MAX_TICK_S = 0.1
+
+
+def now_ms():
+    """Get the monotonic clock in integer milliseconds (no float rounding on long uptimes)"""
+    return time.monotonic_ns() // 1_000_000
@@ -3,16 +3,21 @@ Main entry point for Pico2W tracked arm car control system.
 Initializes WiFi, HTTP server, WebSocket handler, and hardware controllers.
 """
 
-import time
-import json
+import asyncio
 import wifi
 import socketpool
 import board
 import busio
+import clock
 from config_loader import ConfigLoader
 from device_state import DeviceState
 from http_handler import HTTPHandler
-from websocket_handler import WebSocketHandler
+from websocket_handler import WebSocketHandler, send_frame
+from scheduler import Scheduler
+from safety_watchdog import SafetyWatchdog
+from memory_monitor import MemoryMonitor
+from logger import log
+from profiler import LoopProfiler, STAGE_POLL, STAGE_RECEIVE, STAGE_HANDLE, STAGE_SEND, STAGE_SAFETY, STAGE_PUSH
 
 print("=" * 50)
 print("🤖 履带机械臂小车控制系统 v2.0")
@@ -23,6 +28,7 @@ print("=" * 50)
 print("\n[1/7] Loading configuration...")
 config_loader = ConfigLoader("config.json")
 config = config_loader.load()
+log.configure(config)
 print("✓ Configuration loaded successfully")
 
 # Initialize device state
@@ -40,10 +46,11 @@ try:
     wifi.radio.connect(ssid, password, timeout=30)
     print(f"✓ Connected to WiFi")
     print(f"  IP Address: {wifi.radio.ipv4_address}")
+    device_state.refresh_wifi()
 except Exception as e:
     print(f"✗ WiFi connection failed: {e}")
     print("  Please check WiFi credentials in config.json")
-    device_state.add_error(f"WiFi connection failed: {e}")
+    device_state.add_error(f"WiFi connection failed: {e}", "wifi")
 
 # Initialize I2C for PCA9685 (servo controller)
 print("\n[4/7] Initializing I2C bus...")
@@ -56,7 +63,7 @@ try:
 except Exception as e:
     print(f"✗ I2C initialization failed: {e}")
     i2c = None
-    device_state.add_error(f"I2C init failed: {e}")
+    device_state.add_error(f"I2C init failed: {e}", "i2c")
 
 # Initialize hardware controllers
 print("\n[5/7] Initializing hardware controllers...")
@@ -73,7 +80,7 @@ if i2c:
         controllers["servo"] = ServoController(i2c, config)
     except Exception as e:
         print(f"✗ Servo controller failed: {e}")
-        device_state.add_error(f"Servo init failed: {e}")
+        device_state.add_error(f"Servo init failed: {e}", "servo")
 
 # Initialize track controller
 try:
@@ -81,7 +88,7 @@ try:
     controllers["track"] = TrackController(config)
 except Exception as e:
     print(f"✗ Track controller failed: {e}")
-    device_state.add_error(f"Track init failed: {e}")
+    device_state.add_error(f"Track init failed: {e}", "track")
 
 # Initialize base rotation controller
 try:
@@ -89,17 +96,35 @@ try:
     controllers["base"] = BaseRotationController(config)
 except Exception as e:
     print(f"✗ Base rotation controller failed: {e}")
-    device_state.add_error(f"Base init failed: {e}")
+    device_state.add_error(f"Base init failed: {e}", "base")
+
+# Per-actuator deadman stop backed by the hardware watchdog
+safety = SafetyWatchdog(config, device_state, controllers)
+
+# Per-stage loop timing (off unless profiler.enabled or switched on at runtime)
+profiler = LoopProfiler(config)
+
+# Heap/GC telemetry; in "scheduled" gc_mode collections only run between commands
+memory = MemoryMonitor(config, device_state)
+
+def on_task_error(task_name, e):
+    # Logged once per distinct message; repeats only bump the count
+    device_state.add_error(str(e), task_name)
+
+# Main-loop scheduler (jobs are added once the server is up)
+scheduler = Scheduler(config, on_error=on_task_error)
 
 # Initialize handlers
 print("\n[6/7] Initializing request handlers...")
-http_handler = HTTPHandler(config, device_state)
+http_handler = HTTPHandler(config, device_state, safety, profiler, scheduler)
 ws_handler = WebSocketHandler(
     config, 
     device_state, 
     controllers.get("servo"),
     controllers.get("track"),
-    controllers.get("base")
+    controllers.get("base"),
+    safety,
+    profiler
 )
 print("✓ HTTP and WebSocket handlers ready")
 
@@ -107,50 +132,99 @@ print("✓ HTTP and WebSocket handlers ready")
 print("\n[7/7] Starting HTTP/WebSocket server...")
 
 try:
-    from adafruit_httpserver import Server, Request, Response, Websocket
+    from adafruit_httpserver import Server, Request, Response, FileResponse, Websocket
+    from static_files import StaticFiles
     
     pool = socketpool.SocketPool(wifi.radio)
     server = Server(pool, "/static", debug=True)
+    static_files = StaticFiles("/static")
     
-    active_websocket = None
+    # Round-robin position among non-controller clients, per scheduled job
+    observer_turns = {"poll": 0, "push": 0}
+    
+    # HTTP status texts for handler results
+    STATUS_TEXTS = {200: "OK", 304: "Not Modified", 400: "Bad Request", 404: "Not Found", 500: "Internal Server Error"}
+    
+    def api_response(request, result):
+        """Convert an HTTPHandler result dict into a Response"""
+        status = result["status"]
+        headers = {k: v for k, v in result["headers"].items() if k != "Content-Type"}
+        return Response(request, result["body"], status=(status, STATUS_TEXTS.get(status, "")),
+                        headers=headers, content_type="application/json")
     
     # Define HTTP routes
     @server.route("/api/status")
     def status_endpoint(request: Request):
         """GET /api/status"""
-        result = http_handler.handle_status(request)
-        return Response(request, result["body"], content_type="application/json")
+        return api_response(request, http_handler.handle_status(request))
     
     @server.route("/api/config")
     def config_endpoint(request: Request):
-        """GET /api/config"""
-        result = http_handler.handle_config(request)
-        return Response(request, result["body"], content_type="application/json")
+        """GET /api/config (ETag / If-None-Match aware)"""
+        return api_response(request, http_handler.handle_config(request))
     
     @server.route("/api/health")
     def health_endpoint(request: Request):
         """GET /api/health"""
-        result = http_handler.handle_health(request)
-        return Response(request, result["body"], content_type="application/json")
+        return api_response(request, http_handler.handle_health(request))
+    
+    @server.route("/api/logs")
+    def logs_endpoint(request: Request):
+        """GET /api/logs - drain the log ring buffer (?level=debug|info|warning|error)"""
+        return api_response(request, http_handler.handle_logs(request))
+    
+    @server.route("/api/metrics")
+    def metrics_endpoint(request: Request):
+        """GET /api/metrics (?enabled=1|0, ?reset=1)"""
+        return api_response(request, http_handler.handle_metrics(request))
     
     @server.route("/ws")
     def websocket_endpoint(request: Request):
-        """WebSocket endpoint for real-time control"""
-        global active_websocket
-        
-        if active_websocket is not None:
-            try:
-                active_websocket.close()
-            except:
-                pass
+        """WebSocket endpoint for real-time control (one controller, several observers)"""
+        if len(ws_handler.sessions) >= ws_handler.max_clients:
+            # Half-open sockets may be holding the slots
+            close_stale_sessions()
+        if len(ws_handler.sessions) >= ws_handler.max_clients:
+            log.warning("Rejected WebSocket client %s: %d connected", request.client_address, ws_handler.max_clients)
+            return Response(request, "Too many clients", status=(503, "Service Unavailable"))
         
         ws = Websocket(request)
-        active_websocket = ws
+        session = ws_handler.open_session(ws)
         
-        print(f"[INFO] WebSocket client connected from {request.client_address}")
+        log.info("WebSocket client %d connected from %s (%d/%d)", session.id, request.client_address,
+                 len(ws_handler.sessions), ws_handler.max_clients)
         # Return immediately - message processing will happen in main loop
         return ws
     
+    # Frontend routes last so they never shadow /api/* or /ws
+    def static_response(request, path):
+        """Serve a frontend file (gzip copy when available), streamed from flash"""
+        if safety.armed:
+            # Streaming a bundle can block the loop past the hardware watchdog timeout
+            return Response(request, "Motors running - retry when stopped", status=(503, "Service Unavailable"),
+                            headers={"Retry-After": "1"})
+        resolved = static_files.resolve(path, request.headers.get("Accept-Encoding", ""))
+        if resolved is None:
+            return Response(request, "Not Found", status=(404, "Not Found"))
+        filename, content_type, headers = resolved
+        return FileResponse(request, filename, static_files.root, headers=headers,
+                            content_type=content_type, buffer_size=static_files.chunk_size)
+    
+    @server.route("/")
+    def index_endpoint(request: Request):
+        """GET / - frontend entry page"""
+        return static_response(request, "/")
+    
+    @server.route("/assets/<name>")
+    def asset_endpoint(request: Request, name):
+        """GET /assets/* - content-hashed JS/CSS bundles"""
+        return static_response(request, "/assets/" + name)
+    
+    @server.route("/<name>")
+    def root_file_endpoint(request: Request, name):
+        """GET /* - other top-level frontend files (favicon, ...)"""
+        return static_response(request, "/" + name)
+    
     # Start server
     server.start(str(wifi.radio.ipv4_address), config["server"]["port"])
     
@@ -168,59 +242,180 @@ try:
     print("\nPress Ctrl+C to stop")
     print("=" * 50 + "\n")
     
-    # Main server loop
-    last_safety_check = time.monotonic()
+    # Scheduled jobs
+    def poll_http():
+        """Serve at most one pending HTTP request"""
+        # A blocking exchange gets the whole hardware watchdog timeout
+        safety.feed()
+        started = profiler.start()
+        server.poll()
+        profiler.stop(STAGE_POLL, started)
     
-    while True:
+    def close_connection(session):
+        """Close a connection and release its control lease"""
         try:
-            server.poll()
-            
-            # Process WebSocket messages if connected
-            if active_websocket is not None:
-                try:
-                    data = active_websocket.receive()
-                    if data:
-                        response = ws_handler.handle_message(data)
-                        active_websocket.send_message(json.dumps(response))
-                except OSError:
-                    # No data available
-                    pass
-                except Exception as e:
-                    print(f"[ERROR] WebSocket error: {e}")
-                    try:
-                        active_websocket.close()
-                    except:
-                        pass
-                    active_websocket = None
-            
-            # Safety checks every 100ms
-            current_time = time.monotonic()
-            if current_time - last_safety_check > 0.1:
-                # Safety timeout check
-                last_cmd_ms = device_state.get_last_command_time()
-                timeout_ms = config["safety"]["command_timeout_ms"]
-                
-                if last_cmd_ms > 0 and last_cmd_ms > timeout_ms:
-                    print(f"[WARNING] Command timeout ({last_cmd_ms}ms) - stopping motors")
-                    if controllers.get("track"):
-                        controllers["track"].stop()
-                    if controllers.get("base"):
-                        controllers["base"].stop()
-                    device_state.update_track_state(0, 0)
-                    device_state.update_base_rotation_state("stop", 0)
-                    device_state.update_last_command()
-                
-                # Check base idle sleep
-                if controllers.get("base"):
-                    controllers["base"].check_idle_sleep()
-                
-                last_safety_check = current_time
-            
+            session.websocket.close()
+        except:
+            pass
+        ws_handler.close_session(session)
+    
+    def drop_session(session, e):
+        """Close a failed connection"""
+        log.error("WebSocket client %d error: %s", session.id, e)
+        close_connection(session)
+    
+    def close_stale_sessions():
+        """Close connections that went silent (send errors on half-open sockets are swallowed)"""
+        for session in ws_handler.stale_sessions():
+            log.warning("WebSocket client %d silent for %dms - closing", session.id, ws_handler.client_timeout_ms)
+            close_connection(session)
+    
+    def next_observer(controller, job):
+        """Pick the job's next non-controller session in round-robin order, or None"""
+        sessions = ws_handler.sessions
+        turn = observer_turns[job]
+        for _ in range(len(sessions)):
+            turn = (turn + 1) % len(sessions)
+            if sessions[turn] is not controller:
+                observer_turns[job] = turn
+                return sessions[turn]
+        return None
+    
+    def serve_session(session):
+        """Process one pending WebSocket message from a session"""
+        ws = session.websocket
+        try:
+            started = profiler.start()
+            data = ws.receive()
+            profiler.stop(STAGE_RECEIVE, started)
+            if data:
+                session.last_receive_ms = clock.now_ms()
+                started = profiler.start()
+                if isinstance(data, (bytes, bytearray)):
+                    # Binary frames (negotiated via "hello") reply in binary
+                    response = ws_handler.handle_binary(session, data)
+                    opcode = Websocket.BINARY
+                else:
+                    response = ws_handler.handle_message(session, data)
+                    # None = acknowledgment suppressed by no-ack mode
+                    if response is not None:
+                        response = ws_handler.encode_response(response)
+                    # Preallocated acks come back as complete text frames
+                    opcode = None if isinstance(response, bytearray) else Websocket.TEXT
+                profiler.stop(STAGE_HANDLE, started)
+                if response is not None:
+                    started = profiler.start()
+                    if opcode is None:
+                        send_frame(ws, response)
+                    else:
+                        ws.send_message(response, opcode)
+                    profiler.stop(STAGE_SEND, started)
+                memory.note_activity()
+                # Arm the hardware watchdog before anything can stall
+                safety.watch()
+        except OSError:
+            # No data available
+            pass
         except Exception as e:
-            print(f"[ERROR] Server error: {e}")
-            device_state.add_error(str(e))
-        
-        time.sleep(0.001)
+            drop_session(session, e)
+    
+    def push_session(session):
+        """Send a due state delta to one subscribed session"""
+        try:
+            started = profiler.start()
+            message = session.state_stream.poll()
+            if message is not None:
+                session.websocket.send_message(message)
+            profiler.stop(STAGE_PUSH, started)
+        except OSError:
+            pass
+        except Exception as e:
+            drop_session(session, e)
+    
+    # The controller is served every slot; other clients take turns one per
+    # slot, so a slow observer link adds at most one exchange of latency
+    def poll_websocket():
+        """Process pending messages: the controller's, then one other client's"""
+        controller = ws_handler.controller_session()
+        if controller is not None:
+            serve_session(controller)
+        observer = next_observer(controller, "poll")
+        if observer is not None:
+            serve_session(observer)
+    
+    def push_state():
+        """Send state deltas: to the controller, then to one observer in turn"""
+        controller = ws_handler.controller_session()
+        if controller is not None:
+            push_session(controller)
+        observer = next_observer(controller, "push")
+        if observer is not None:
+            push_session(observer)
+    
+    def refresh_wifi():
+        """Sample WiFi status (RSSI) for /api/status and state subscribers"""
+        device_state.refresh_wifi()
+    
+    def check_base_idle():
+        """Put the base rotation driver to sleep after inactivity"""
+        if controllers.get("base"):
+            controllers["base"].check_idle_sleep()
+    
+    def tick_tracks():
+        """Ramp track speeds toward the latest command"""
+        if controllers.get("track"):
+            controllers["track"].tick()
+    
+    def tick_base():
+        """Update the base heading estimate and run the base_goto PID loop"""
+        base = controllers.get("base")
+        if base is None:
+            return
+        base.tick()
+        device_state.update_base_position(base.position.degrees, base.goto_target)
+        if not base.is_goto_active() and device_state.base_rotation_state["direction"] == "goto":
+            device_state.update_base_rotation_state("stop", 0)
+    
+    def tick_servos():
+        """Advance smooth servo motion toward the latest setpoints"""
+        if controllers.get("servo"):
+            controllers["servo"].tick()
+    
+    def check_safety():
+        """Run the deadman timers and feed the hardware watchdog"""
+        started = profiler.start()
+        safety.check()
+        profiler.stop(STAGE_SAFETY, started)
+    
+    # Command path gets the shortest period and highest priority so a slow
+    # HTTP exchange cannot hold back motor commands for more than one slot
+    scheduler.add("websocket", poll_websocket, period_ms=5, priority=0)
+    # Also feeds the hardware watchdog: keep period_ms well below hardware_timeout_ms
+    scheduler.add("safety", check_safety, period_ms=100, priority=1)
+    scheduler.add("http", poll_http, period_ms=20, priority=2)
+    # Runs at the highest allowed subscription rate; StateStream paces each client
+    max_rate_hz = config.get("state_stream", {}).get("max_rate_hz", 20)
+    scheduler.add("state_stream", push_state, period_ms=1000 // max_rate_hz, priority=2)
+    scheduler.add("wifi_status", refresh_wifi,
+                  period_ms=config.get("state_stream", {}).get("wifi_interval_ms", 5000), priority=3)
+    if config.get("servo_motion", {}).get("enabled", False):
+        scheduler.add("servo_motion", tick_servos,
+                      period_ms=config["servo_motion"].get("tick_ms", 20), priority=1)
+    track_ramp_cfg = config["motors"]["tracks"].get("ramp", {})
+    if track_ramp_cfg.get("enabled", False):
+        scheduler.add("track_ramp", tick_tracks,
+                      period_ms=track_ramp_cfg.get("tick_ms", 10), priority=1)
+    base_position_cfg = config["motors"]["base_rotation"].get("position", {})
+    if base_position_cfg.get("enabled", False):
+        scheduler.add("base_position", tick_base,
+                      period_ms=base_position_cfg.get("tick_ms", 20), priority=1)
+    scheduler.add("ws_sessions", close_stale_sessions, period_ms=1000, priority=3)
+    scheduler.add("base_idle", check_base_idle, period_ms=500, priority=3)
+    scheduler.add("error_rates", device_state.roll_error_rates, period_ms=1000, priority=3)
+    # Scheduled gc_mode collects here once no command arrived for memory.idle_ms
+    scheduler.add("memory", memory.tick, period_ms=config.get("memory", {}).get("tick_ms", 10), priority=3)
+    
+    asyncio.run(scheduler.run())
 
 except ImportError as e:
     print(f"\n✗ Failed to import adafruit_httpserver: {e}")
@@ -231,9 +426,10 @@ except ImportError as e:
 except KeyboardInterrupt:
     print("\n\n⏹️  Shutdown requested...")
     if controllers.get("track"):
-        controllers["track"].stop()
+        controllers["track"].stop(immediate=True)
     if controllers.get("base"):
         controllers["base"].stop()
+    safety.deinit()
     print("✓ Motors stopped")
     print("✓ System shutdown complete")
     
@@ -243,8 +439,9 @@ except Exception as e:
     traceback.print_exception(e)
     try:
         if controllers.get("track"):
-            controllers["track"].stop()
+            controllers["track"].stop(immediate=True)
         if controllers.get("base"):
             controllers["base"].stop()
+        safety.deinit()
     except:
         pass
@@ -58,9 +58,60 @@ class ConfigLoader:
         if 'base_rotation' not in self.config['motors']:
             raise ValueError("Missing base_rotation motor configuration")
         
+        # Validate servo lookup table resolution
+        steps = self.config['pca9685'].get('lut_steps_per_degree', 1)
+        if not isinstance(steps, int) or steps < 1:
+            raise ValueError("pca9685.lut_steps_per_degree must be a positive integer")
+        
+        # Validate motor PWM settings
+        for motor in ('tracks', 'base_rotation'):
+            pwm = self.config['motors'][motor].get('pwm', {})
+            bits = pwm.get('resolution_bits', 16)
+            if not isinstance(bits, int) or not (1 <= bits <= 16):
+                raise ValueError(f"motors.{motor}.pwm.resolution_bits must be 1-16")
+            if not (0 <= pwm.get('min_duty', 0) < 100) or not (0 <= pwm.get('deadband', 0) < 100):
+                raise ValueError(f"motors.{motor}.pwm min_duty/deadband must be 0-99")
+        
+        # Validate joint constraints
+        for constraint in self.config.get('servo_constraints', []):
+            if not constraint.get('coeffs'):
+                raise ValueError("Servo constraint must have non-empty 'coeffs'")
+            if 'min' not in constraint and 'max' not in constraint:
+                raise ValueError("Servo constraint must have 'min' and/or 'max'")
+        
+        # Clients ping every 25s; a shorter timeout would drop idle observers
+        if self.config.get('server', {}).get('client_timeout_ms', 60000) <= 25000:
+            raise ValueError("server.client_timeout_ms must exceed the 25000ms client ping interval")
+        
         # Validate safety config
         if 'command_timeout_ms' not in self.config['safety']:
             raise ValueError("Missing command_timeout_ms in safety config")
+        deadman = self.config['safety'].get('deadman', {})
+        if deadman.get('tick_ms', 20) <= 0:
+            raise ValueError("safety.deadman.tick_ms must be positive")
+        for group, timeout_ms in deadman.get('timeouts_ms', {}).items():
+            if group not in ('tracks', 'base', 'arm'):
+                raise ValueError(f"Unknown deadman group: {group}")
+            if timeout_ms <= 0:
+                raise ValueError(f"safety.deadman.timeouts_ms.{group} must be positive")
+        logging_cfg = self.config.get('logging', {})
+        for key in ('level', 'console_level'):
+            if str(logging_cfg.get(key, 'INFO')).upper() not in ('DEBUG', 'INFO', 'WARNING', 'ERROR'):
+                raise ValueError(f"logging.{key} must be DEBUG, INFO, WARNING or ERROR")
+        if not (1 <= logging_cfg.get('capacity', 64) <= 1024):
+            raise ValueError("logging.capacity must be between 1 and 1024")
+        memory = self.config.get('memory', {})
+        if memory.get('gc_mode', 'auto') not in ('auto', 'scheduled'):
+            raise ValueError("memory.gc_mode must be 'auto' or 'scheduled'")
+        if memory.get('reserve_bytes', 16384) > memory.get('collect_below_bytes', 65536):
+            raise ValueError("memory.reserve_bytes must not exceed memory.collect_below_bytes")
+        hardware_timeout_ms = self.config['safety'].get('watchdog', {}).get('hardware_timeout_ms', 500)
+        # The safety task feeds the watchdog; the RP2350 counter tops out near 8.3s
+        if not (200 <= hardware_timeout_ms <= 8000):
+            raise ValueError("safety.watchdog.hardware_timeout_ms must be between 200 and 8000")
+        idle_timeout_ms = self.config['safety'].get('watchdog', {}).get('idle_timeout_ms', 8000)
+        if not (hardware_timeout_ms <= idle_timeout_ms <= 8388):
+            raise ValueError("safety.watchdog.idle_timeout_ms must be between hardware_timeout_ms and 8388")
     
     def _validate_servo(self, servo):
         """Validate individual servo configuration"""
@@ -90,7 +141,10 @@ class ConfigLoader:
                 "password": "CONFIGURE_ME"
             },
             "server": {
-                "port": 80
+                "port": 80,
+                "max_clients": 4,
+                "lease_timeout_ms": 5000,
+                "client_timeout_ms": 60000
             },
             "i2c": {
                 "sda_pin": "GP0",
@@ -151,7 +205,16 @@ class ConfigLoader:
             },
             "safety": {
                 "command_timeout_ms": 2000,
-                "idle_sleep_ms": 5000
+                "idle_sleep_ms": 5000,
+                "deadman": {
+                    "tick_ms": 20,
+                    "timeouts_ms": {"tracks": 2000, "base": 2000, "arm": 2000}
+                },
+                "watchdog": {
+                    "enabled": True,
+                    "hardware_timeout_ms": 500,
+                    "idle_timeout_ms": 8000
+                }
             }
         }
     
@@ -0,0 +1,85 @@
+"""
+Exclusive control lease for multi-client WebSocket sessions.
+One session at a time may drive the actuators; it keeps the lease by
+sending messages and loses it after a period of silence or on disconnect.
+Every other session is a read-only observer.
+"""
+
+import clock
+from logger import log
+
+
+class ControlLease:
+    """Single-holder lease that expires without renewal"""
+
+    def __init__(self, timeout_ms=5000):
+        """
+        Initialize control lease
+
+        Args:
+            timeout_ms: Silence after which another session may take control
+        """
+        self.timeout_ms = timeout_ms
+        self.holder = None
+        self._expires_ms = 0
+
+    def _expire(self, now_ms):
+        """Drop the holder if its lease has run out"""
+        if self.holder is not None and now_ms >= self._expires_ms:
+            log.info("Control lease of client %d expired", self.holder.id)
+            self.holder = None
+
+    def is_held_by(self, session):
+        """Check if a session currently holds the lease"""
+        self._expire(clock.now_ms())
+        return self.holder is session
+
+    def acquire(self, session):
+        """
+        Take (or renew) the lease for a session
+
+        Args:
+            session: Requesting session
+
+        Returns:
+            bool: True if the session holds the lease afterwards
+        """
+        now_ms = clock.now_ms()
+        self._expire(now_ms)
+        if self.holder is None:
+            self.holder = session
+            log.info("Client %d acquired control lease", session.id)
+        elif self.holder is not session:
+            return False
+        self._expires_ms = now_ms + self.timeout_ms
+        return True
+
+    def renew(self, session):
+        """Extend the lease if the session holds it, returns True if it does"""
+        now_ms = clock.now_ms()
+        self._expire(now_ms)
+        if self.holder is not session:
+            return False
+        self._expires_ms = now_ms + self.timeout_ms
+        return True
+
+    def release(self, session):
+        """Give up the lease if the session holds it"""
+        if self.holder is session:
+            self.holder = None
+            log.info("Client %d released control lease", session.id)
+
+    def get_status(self, session):
+        """
+        Describe the lease from one session's point of view
+
+        Returns:
+            dict: controller (held by this session), holder id, expires_in_ms
+        """
+        now_ms = clock.now_ms()
+        self._expire(now_ms)
+        return {
+            "controller": self.holder is session,
+            "holder": self.holder.id if self.holder else None,
+            "expires_in_ms": max(0, self._expires_ms - now_ms) if self.holder else 0
+        }
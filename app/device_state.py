@@ -3,8 +3,14 @@ Device state management for Pico2W tracked arm car.
 Centralizes state tracking for WiFi, servos, motors, and system status.
 """
 
-import time
+import json
+import clock
 import wifi
+from error_log import ErrorLog
+from logger import log
+
+# Versioned status sections, in /api/status order
+SECTIONS = ("wifi", "servos", "tracks", "base_rotation", "errors", "memory")
 
 
 class DeviceState:
@@ -13,9 +19,19 @@ class DeviceState:
     def __init__(self, config):
         """Initialize device state"""
         self.config = config
-        self.start_time = time.monotonic()
-        self.last_command_time = 0
-        self.errors = []
+        self.start_ms = clock.now_ms()
+        self.last_command_ms = None
+        self.errors = ErrorLog(config.get("errors", {}).get("capacity", 10))
+        
+        # Global mutation counter and the version at which each section last changed
+        self.version = 0
+        self.section_versions = {}
+        for section in SECTIONS:
+            self.section_versions[section] = 0
+        
+        # Serialized sections / status body, rebuilt lazily after a mutation
+        self._section_json = {}
+        self._status_json = None
         
         # Initialize servo states
         self.servo_states = {}
@@ -27,6 +43,7 @@ class DeviceState:
                 "min_angle": servo["min_angle"],
                 "max_angle": servo["max_angle"]
             }
+        self._servo_list = list(self.servo_states.values())
         
         # Initialize track state
         self.track_state = {
@@ -39,11 +56,89 @@ class DeviceState:
         self.base_rotation_state = {
             "direction": "stop",
             "speed": 0,
-            "sleeping": True
+            "sleeping": True,
+            "position": None,
+            "target": None
         }
+        
+        # Heap/GC statistics, replaced once per MemoryMonitor window
+        self.memory_state = None
+        
+        self.wifi_status = self._read_wifi_status()
+    
+    def _touch(self, section):
+        """Record a mutation of one section and drop its cached JSON"""
+        self.version += 1
+        self.section_versions[section] = self.version
+        self._section_json.pop(section, None)
+        self._status_json = None
+    
+    def snapshot_since(self, version):
+        """
+        Get the sections that changed after a given version
+        
+        Args:
+            version: Version returned by a previous call (-1 for everything)
+            
+        Returns:
+            tuple: (current version, list of changed section names or None if none changed)
+        """
+        if version >= self.version and version >= 0:
+            return self.version, None
+        changed = [s for s in SECTIONS if self.section_versions[s] > version]
+        return self.version, changed or None
+    
+    def get_section(self, section):
+        """Get one section's live value (treat as read-only)"""
+        if section == "wifi":
+            return self.wifi_status
+        if section == "servos":
+            return self._servo_list
+        if section == "tracks":
+            return self.track_state
+        if section == "base_rotation":
+            return self.base_rotation_state
+        if section == "memory":
+            return self.memory_state
+        return self.errors.summary()
+    
+    def section_json(self, section):
+        """Get one section serialized as JSON, cached until it changes"""
+        encoded = self._section_json.get(section)
+        if encoded is None:
+            encoded = json.dumps(self.get_section(section))
+            self._section_json[section] = encoded
+        return encoded
+    
+    def get_status_json(self):
+        """
+        Get the full /api/status body
+        
+        The sections are serialized once per mutation; only the uptime and
+        last-command fields are formatted per call.
+        """
+        body = self._status_json
+        if body is None:
+            body = ",".join(f'"{s}":{self.section_json(s)}' for s in SECTIONS)
+            self._status_json = body
+        return (f'{{{body},"last_command_ms":{self.get_last_command_time()},'
+                f'"uptime_ms":{self.get_uptime()}}}')
+    
+    def refresh_wifi(self):
+        """Re-read WiFi status from the radio, returns True if it changed"""
+        status = self._read_wifi_status()
+        if status == self.wifi_status:
+            return False
+        self.wifi_status = status
+        self._touch("wifi")
+        return True
     
     def get_wifi_status(self):
-        """Get current WiFi status"""
+        """Get WiFi status as of the last refresh_wifi()"""
+        return self.wifi_status
+    
+    def _read_wifi_status(self):
+        """Query the radio for WiFi status (slow: includes ap_info lookup)"""
         try:
             connected = wifi.radio.connected
             ip = str(wifi.radio.ipv4_address) if connected else None
@@ -63,7 +158,7 @@ class DeviceState:
                 "rssi": rssi
             }
         except Exception as e:
-            print(f"ERROR getting WiFi status: {e}")
+            log.error("Getting WiFi status failed: %s", e)
             return {
                 "connected": False,
                 "ssid": "",
@@ -72,62 +167,99 @@ class DeviceState:
             }
     
     def get_servo_states(self):
-        """Get all servo states as list"""
-        return list(self.servo_states.values())
+        """Get all servo states as list (live, treat as read-only)"""
+        return self._servo_list
     
     def update_servo_state(self, channel, angle):
-        """Update servo state"""
-        if channel in self.servo_states:
-            self.servo_states[channel]["current_angle"] = angle
+        """Update servo state, returns True if the angle changed"""
+        state = self.servo_states.get(channel)
+        if state is None or state["current_angle"] == angle:
+            return False
+        state["current_angle"] = angle
+        self._touch("servos")
+        return True
     
     def get_track_state(self):
-        """Get track motor state"""
-        return self.track_state.copy()
+        """Get track motor state (live, treat as read-only)"""
+        return self.track_state
     
     def update_track_state(self, left_speed, right_speed):
-        """Update track state"""
-        self.track_state["left_speed"] = left_speed
-        self.track_state["right_speed"] = right_speed
+        """Update track state, returns True if either speed changed"""
+        state = self.track_state
+        if state["left_speed"] == left_speed and state["right_speed"] == right_speed:
+            return False
+        state["left_speed"] = left_speed
+        state["right_speed"] = right_speed
+        self._touch("tracks")
+        return True
     
     def get_base_rotation_state(self):
-        """Get base rotation state"""
-        return self.base_rotation_state.copy()
+        """Get base rotation state (live, treat as read-only)"""
+        return self.base_rotation_state
     
     def update_base_rotation_state(self, direction, speed):
-        """Update base rotation state"""
-        self.base_rotation_state["direction"] = direction
-        self.base_rotation_state["speed"] = speed
-        self.base_rotation_state["sleeping"] = (direction == "stop")
+        """Update base rotation state, returns True if direction or speed changed"""
+        state = self.base_rotation_state
+        if state["direction"] == direction and state["speed"] == speed:
+            return False
+        state["direction"] = direction
+        state["speed"] = speed
+        state["sleeping"] = (direction == "stop")
+        self._touch("base_rotation")
+        return True
+    
+    def update_base_position(self, position, target):
+        """Update base heading estimate and goto target, returns True if either changed"""
+        state = self.base_rotation_state
+        position = round(position, 1)
+        if state["position"] == position and state["target"] == target:
+            return False
+        state["position"] = position
+        state["target"] = target
+        self._touch("base_rotation")
+        return True
+    
+    def update_memory(self, stats):
+        """Replace the heap/GC statistics (one MemoryMonitor window)"""
+        self.memory_state = stats
+        self._touch("memory")
     
     def update_last_command(self):
         """Update timestamp of last command"""
-        self.last_command_time = time.monotonic()
+        self.last_command_ms = clock.now_ms()
     
     def get_last_command_time(self):
         """Get milliseconds since last command"""
-        if self.last_command_time == 0:
+        if self.last_command_ms is None:
             return -1
-        return int((time.monotonic() - self.last_command_time) * 1000)
+        return clock.now_ms() - self.last_command_ms
     
     def get_uptime(self):
         """Get system uptime in milliseconds"""
-        return int((time.monotonic() - self.start_time) * 1000)
-    
-    def add_error(self, error_message):
-        """Add error to error list (keep last 10)"""
-        print(f"[ERROR] Device error: {error_message}")
-        self.errors.append({
-            "message": error_message,
-            "timestamp": time.monotonic()
-        })
-        # Keep only last 10 errors
-        if len(self.errors) > 10:
-            self.errors.pop(0)
+        return clock.now_ms() - self.start_ms
+    
+    def add_error(self, error_message, subsystem="system"):
+        """
+        Record an error (repeats of a logged message only bump its count)
+        
+        Args:
+            error_message: Error message
+            subsystem: Failing part of the device, for per-subsystem rates
+        """
+        if self.errors.add(error_message, subsystem):
+            log.error("Device error (%s): %s", subsystem, error_message)
+        self._touch("errors")
+    
+    def roll_error_rates(self):
+        """Close the error-rate window if due (call periodically)"""
+        if self.errors.roll():
+            self._touch("errors")
     
     def get_errors(self):
-        """Get recent error messages"""
-        return [e["message"] for e in self.errors]
+        """Get recent error messages, oldest first"""
+        return self.errors.messages()
     
     def clear_errors(self):
         """Clear error list"""
-        self.errors = []
+        self.errors.clear()
+        self._touch("errors")
@@ -0,0 +1,149 @@
+"""
+Fixed-size error log for DeviceState.
+Errors live in preallocated ring-buffer slots; a repeat of a logged error
+bumps its occurrence count instead of taking a new slot, and per-subsystem
+counters track how often each part of the device is failing.
+"""
+
+import clock
+
+# Length of one error-rate window
+RATE_WINDOW_MS = 60000
+
+
+class ErrorLog:
+    """Ring buffer of recent errors with dedup counts and per-subsystem rates"""
+
+    def __init__(self, capacity=10):
+        """
+        Initialize error log
+
+        Args:
+            capacity: Number of distinct errors kept (oldest is overwritten)
+        """
+        self.capacity = capacity
+        self._start_ms = clock.now_ms()
+
+        # Parallel slot arrays, allocated once
+        self._messages = [None] * capacity
+        self._subsystems = [None] * capacity
+        self._counts = [0] * capacity
+        self._first_ms = [0] * capacity
+        self._last_ms = [0] * capacity
+        self._head = 0  # next slot to overwrite
+        self._size = 0
+
+        # subsystem -> [total, count in current window, count in last full window]
+        self._rates = {}
+        self._window_start_ms = self._start_ms
+
+    def add(self, message, subsystem="system"):
+        """
+        Record an error occurrence
+
+        Args:
+            message: Error message (also the dedup key within a subsystem)
+            subsystem: Part of the device that failed ("i2c", "wifi", task name, ...)
+
+        Returns:
+            bool: True if a new slot was used, False if an existing entry was counted
+        """
+        now = clock.now_ms()
+        self.roll(now)
+
+        counters = self._rates.get(subsystem)
+        if counters is None:
+            counters = [0, 0, 0]
+            self._rates[subsystem] = counters
+        counters[0] += 1
+        counters[1] += 1
+
+        slot = self._find(message, subsystem)
+        if slot >= 0:
+            self._counts[slot] += 1
+            self._last_ms[slot] = now - self._start_ms
+            return False
+
+        slot = self._head
+        self._messages[slot] = message
+        self._subsystems[slot] = subsystem
+        self._counts[slot] = 1
+        self._first_ms[slot] = self._last_ms[slot] = now - self._start_ms
+        self._head = (slot + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+        return True
+
+    def _find(self, message, subsystem):
+        """Get the slot holding a message, or -1"""
+        for i in range(self._size):
+            if self._messages[i] == message and self._subsystems[i] == subsystem:
+                return i
+        return -1
+
+    def roll(self, now_ms=None):
+        """
+        Close the rate window if it has elapsed
+
+        Args:
+            now_ms: Current monotonic time in ms (read if omitted)
+
+        Returns:
+            bool: True if any per-subsystem rate changed
+        """
+        now_ms = clock.now_ms() if now_ms is None else now_ms
+        elapsed = now_ms - self._window_start_ms
+        if elapsed < RATE_WINDOW_MS:
+            return False
+        # Skipping more than one window means the last full window was empty
+        skipped = elapsed >= 2 * RATE_WINDOW_MS
+        self._window_start_ms += elapsed - elapsed % RATE_WINDOW_MS
+
+        changed = False
+        for counters in self._rates.values():
+            last = 0 if skipped else counters[1]
+            if counters[2] != last or counters[1]:
+                changed = True
+            counters[2] = last
+            counters[1] = 0
+        return changed
+
+    def _slots(self):
+        """Yield occupied slot indices, oldest first"""
+        start = self._head if self._size == self.capacity else 0
+        for i in range(self._size):
+            yield (start + i) % self.capacity
+
+    def messages(self):
+        """Get logged messages, oldest first"""
+        return [self._messages[i] for i in self._slots()]
+
+    def summary(self):
+        """
+        Get the log as a JSON-ready dict
+
+        Returns:
+            dict: "recent" entries (oldest first, times in ms since boot) and
+                  per-subsystem "total" / "per_min" (errors in the last full window)
+        """
+        recent = []
+        for i in self._slots():
+            recent.append({
+                "message": self._messages[i],
+                "subsystem": self._subsystems[i],
+                "count": self._counts[i],
+                "first_ms": self._first_ms[i],
+                "last_ms": self._last_ms[i]
+            })
+        subsystems = {}
+        for name, counters in self._rates.items():
+            subsystems[name] = {"total": counters[0], "per_min": counters[2]}
+        return {"recent": recent, "subsystems": subsystems}
+
+    def clear(self):
+        """Drop logged entries (subsystem totals are kept)"""
+        for i in range(self.capacity):
+            self._messages[i] = None
+            self._subsystems[i] = None
+        self._head = 0
+        self._size = 0
@@ -1,76 +1,94 @@
 """
 HTTP handler for Pico2W tracked arm car.
-Provides REST API endpoints for status, config, and health checks.
+Provides REST API endpoints for status, config, health checks, metrics and logs.
 Serves static frontend files.
 """
 
 import json
+import binascii
+from logger import log, parse_level, LEVELS
+
+# Query string values accepted as "on" by /api/metrics switches
+TRUE_VALUES = ("1", "true", "on", "yes")
 
 
 class HTTPHandler:
     """Handle HTTP requests for status, config, and static files"""
     
-    def __init__(self, config, device_state):
+    def __init__(self, config, device_state, safety=None, profiler=None, scheduler=None):
         """
         Initialize HTTP handler
         
         Args:
             config: Loaded configuration dict
             device_state: Shared device state object
+            safety: Optional SafetyWatchdog reported by /api/health
+            profiler: Optional LoopProfiler reported by /api/metrics
+            scheduler: Optional Scheduler whose task statistics /api/health reports
         """
         self.config = config
         self.device_state = device_state
+        self.safety = safety
+        self.profiler = profiler
+        self.scheduler = scheduler
+        
+        # Config never changes after boot: serialize it once and tag it
+        config_body = json.dumps(self._build_config_response())
+        self._config_etag = '"%08x"' % (binascii.crc32(config_body.encode()) & 0xFFFFFFFF)
+        cache_headers = {
+            "ETag": self._config_etag,
+            # Browsers revalidate with If-None-Match instead of refetching
+            "Cache-Control": "no-cache"
+        }
+        self._config_response = self._raw_json_response(config_body)
+        self._config_response["headers"].update(cache_headers)
+        self._config_not_modified = {"status": 304, "headers": cache_headers, "body": ""}
     
     def handle_status(self, request):
         """GET /api/status - Return current device status"""
         try:
-            print("[INFO] GET /api/status")
-            status = {
-                "wifi": self.device_state.get_wifi_status(),
-                "servos": self.device_state.get_servo_states(),
-                "tracks": self.device_state.get_track_state(),
-                "base_rotation": self.device_state.get_base_rotation_state(),
-                "last_command_ms": self.device_state.get_last_command_time(),
-                "uptime_ms": self.device_state.get_uptime(),
-                "errors": self.device_state.get_errors()
-            }
-            
-            return self._json_response(status)
+            log.debug("GET /api/status")
+            # Sections are serialized once per state change, not per request
+            return self._raw_json_response(self.device_state.get_status_json())
             
         except Exception as e:
-            print(f"[ERROR] handle_status failed: {e}")
+            log.error("handle_status failed: %s", e)
             return self._error_response("Internal server error", 500)
     
+    def _build_config_response(self):
+        """Build the frontend-safe configuration (without WiFi password)"""
+        return {
+            "servos": [
+                {
+                    "channel": s["channel"],
+                    "name": s["name"],
+                    "min_angle": s["min_angle"],
+                    "max_angle": s["max_angle"],
+                    "initial_angle": s["initial_angle"]
+                }
+                for s in self.config.get("servos", [])
+            ],
+            "speed_presets": self.config.get("speed_presets", {
+                "slow": 30,
+                "medium": 60,
+                "fast": 100
+            }),
+            "safety": {
+                "command_timeout_ms": self.config.get("safety", {}).get("command_timeout_ms", 2000)
+            }
+        }
+    
     def handle_config(self, request):
         """GET /api/config - Return device configuration (without WiFi password)"""
         try:
-            print("[INFO] GET /api/config")
-            # Return safe configuration for frontend
-            config_response = {
-                "servos": [
-                    {
-                        "channel": s["channel"],
-                        "name": s["name"],
-                        "min_angle": s["min_angle"],
-                        "max_angle": s["max_angle"],
-                        "initial_angle": s["initial_angle"]
-                    }
-                    for s in self.config.get("servos", [])
-                ],
-                "speed_presets": self.config.get("speed_presets", {
-                    "slow": 30,
-                    "medium": 60,
-                    "fast": 100
-                }),
-                "safety": {
-                    "command_timeout_ms": self.config.get("safety", {}).get("command_timeout_ms", 2000)
-                }
-            }
-            
-            return self._json_response(config_response)
+            log.debug("GET /api/config")
+            # Prebuilt responses; a matching ETag costs no body at all
+            if request is not None and request.headers.get("If-None-Match") == self._config_etag:
+                return self._config_not_modified
+            return self._config_response
             
         except Exception as e:
-            print(f"[ERROR] handle_config failed: {e}")
+            log.error("handle_config failed: %s", e)
             return self._error_response("Internal server error", 500)
     
     def handle_health(self, request):
@@ -80,11 +98,64 @@ class HTTPHandler:
                 "status": "ok",
                 "uptime_ms": self.device_state.get_uptime()
             }
+            if self.safety is not None:
+                health["safety"] = self.safety.get_status()
+            if self.scheduler is not None:
+                health["tasks"] = self.scheduler.get_status()
             
             return self._json_response(health)
             
         except Exception as e:
-            print(f"[ERROR] handle_health failed: {e}")
+            log.error("handle_health failed: %s", e)
+            return self._error_response("Internal server error", 500)
+    
+    def handle_metrics(self, request):
+        """
+        GET /api/metrics - Main-loop stage timing histograms
+        
+        Optional query parameters switch the profiler at runtime:
+        ?enabled=1|0 turns the probes on or off, ?reset=1 clears the histograms.
+        """
+        try:
+            if self.profiler is None:
+                return self._error_response("Profiler not available", 404)
+            
+            params = request.query_params if request is not None else {}
+            enabled = params.get("enabled")
+            if enabled is not None:
+                self.profiler.set_enabled(enabled.lower() in TRUE_VALUES)
+            reset = params.get("reset")
+            if reset is not None and reset.lower() in TRUE_VALUES:
+                self.profiler.reset()
+            
+            response = self._json_response(self.profiler.get_metrics())
+            response["headers"]["Cache-Control"] = "no-store"
+            return response
+            
+        except Exception as e:
+            log.error("handle_metrics failed: %s", e)
+            return self._error_response("Internal server error", 500)
+    
+    def handle_logs(self, request):
+        """
+        GET /api/logs - Drain the log ring buffer (records are returned once)
+        
+        Optional ?level=debug|info|warning|error sets the recorded level first.
+        """
+        try:
+            params = request.query_params if request is not None else {}
+            level = params.get("level")
+            if level is not None:
+                if level.upper() not in LEVELS:
+                    return self._error_response(f"Unknown log level: {level}", 400)
+                log.set_level(parse_level(level))
+            
+            response = self._json_response(log.drain())
+            response["headers"]["Cache-Control"] = "no-store"
+            return response
+            
+        except Exception as e:
+            log.error("handle_logs failed: %s", e)
             return self._error_response("Internal server error", 500)
     
     def _json_response(self, data, status=200):
@@ -95,6 +166,14 @@ class HTTPHandler:
             "body": json.dumps(data)
         }
     
+    def _raw_json_response(self, body, status=200):
+        """Create JSON response from an already serialized body"""
+        return {
+            "status": status,
+            "headers": {"Content-Type": "application/json"},
+            "body": body
+        }
+    
     def _error_response(self, message, status=400):
         """Create error response"""
         return self._json_response({
@@ -0,0 +1,205 @@
+"""
+Linear joint constraints for the mechanical arm.
+Projects requested poses onto the nearest feasible pose instead of rejecting them.
+
+A constraint is  min <= sum(coeff[ch] * angle[ch]) <= max  (either side optional),
+loaded from config["servo_constraints"]:
+
+    {"coeffs": {"0": 1, "1": 1}, "min": 145}
+    {"coeffs": {"0": 1, "1": 6}, "max": 630}
+"""
+
+import math
+
+# Linkage interference model used when config has no "servo_constraints"
+DEFAULT_CONSTRAINTS = [
+    {"coeffs": {"0": 1, "1": 1}, "min": 145},
+    {"coeffs": {"0": 1, "1": 6}, "max": 630}
+]
+
+
+class JointConstraints:
+    """Feasible-region lookup and projection for linear joint constraints"""
+
+    def __init__(self, config, steps=1):
+        """
+        Initialize constraint engine
+
+        Args:
+            config: Configuration dict (servos and optional servo_constraints)
+            steps: Angle resolution per degree; bounds are snapped inward to it
+        """
+        self.steps = steps
+        self.box = {}
+        for servo in config["servos"]:
+            self.box[servo["channel"]] = (servo["min_angle"], servo["max_angle"])
+
+        self.constraints = []
+        for entry in config.get("servo_constraints", DEFAULT_CONSTRAINTS):
+            coeffs = {}
+            for channel, coeff in entry["coeffs"].items():
+                channel = int(channel)
+                # Constraints on unconfigured channels can never be evaluated
+                if channel in self.box and coeff != 0:
+                    coeffs[channel] = coeff
+            if coeffs:
+                self.constraints.append((coeffs, entry.get("min"), entry.get("max")))
+
+        # Per channel: constraints shared with exactly one other channel are
+        # precomputed into tables indexed by that partner's whole-degree angle
+        self._pair_tables = {}
+        self._general = {}
+        for channel in self.box:
+            self._pair_tables[channel] = []
+            self._general[channel] = []
+        self._build_tables()
+
+    def _build_tables(self):
+        """Precompute per-channel feasible intervals for two-joint constraints"""
+        pairs = {}
+        for constraint in self.constraints:
+            coeffs = constraint[0]
+            channels = list(coeffs)
+            if len(channels) == 2:
+                for channel, partner in ((channels[0], channels[1]), (channels[1], channels[0])):
+                    pairs.setdefault((channel, partner), []).append(constraint)
+            else:
+                for channel in channels:
+                    self._general[channel].append(constraint)
+
+        for (channel, partner), constraints in pairs.items():
+            partner_min, partner_max = self.box[partner]
+            table = []
+            for partner_angle in range(partner_min, partner_max + 1):
+                lo, hi = self.box[channel]
+                for constraint in constraints:
+                    lo, hi = self._narrow(constraint, channel, {partner: partner_angle}, lo, hi)
+                table.append(self._snap(lo, hi))
+            self._pair_tables[channel].append((partner, partner_min, table, constraints))
+
+    @staticmethod
+    def _narrow(constraint, channel, pose, lo, hi):
+        """Intersect [lo, hi] with the bound a constraint puts on one channel"""
+        coeffs, c_min, c_max = constraint
+        rest = 0
+        for other, coeff in coeffs.items():
+            if other != channel:
+                rest += coeff * pose[other]
+        coeff = coeffs[channel]
+        bound_lo = None if c_min is None else (c_min - rest) / coeff
+        bound_hi = None if c_max is None else (c_max - rest) / coeff
+        if coeff < 0:
+            bound_lo, bound_hi = bound_hi, bound_lo
+        if bound_lo is not None and bound_lo > lo:
+            lo = bound_lo
+        if bound_hi is not None and bound_hi < hi:
+            hi = bound_hi
+        return lo, hi
+
+    def _snap(self, lo, hi):
+        """Round an interval inward to the angle resolution"""
+        steps = self.steps
+        lo = math.ceil(lo * steps - 1e-9)
+        hi = math.floor(hi * steps + 1e-9)
+        if steps != 1:
+            return lo / steps, hi / steps
+        return lo, hi
+
+    def feasible_range(self, channel, pose):
+        """
+        Get the feasible interval for one channel with all others held
+
+        Args:
+            channel: Channel to move
+            pose: dict of channel -> angle for the other joints
+
+        Returns:
+            tuple: (lo, hi) angles; lo > hi if no angle is feasible
+        """
+        lo, hi = self.box[channel]
+        snapped = True
+        for partner, partner_min, table, constraints in self._pair_tables[channel]:
+            partner_angle = pose[partner]
+            index = partner_angle - partner_min
+            if isinstance(partner_angle, int) and 0 <= index < len(table):
+                table_lo, table_hi = table[index]
+                if table_lo > lo:
+                    lo = table_lo
+                if table_hi < hi:
+                    hi = table_hi
+            else:
+                for constraint in constraints:
+                    lo, hi = self._narrow(constraint, channel, pose, lo, hi)
+                snapped = False
+        for constraint in self._general[channel]:
+            lo, hi = self._narrow(constraint, channel, pose, lo, hi)
+            snapped = False
+        if not snapped:
+            lo, hi = self._snap(lo, hi)
+        return lo, hi
+
+    def clamp(self, channel, angle, pose):
+        """
+        Nearest feasible angle for a single-joint move
+
+        Args:
+            channel: Channel to move
+            angle: Requested angle
+            pose: Current angles of all joints
+
+        Returns:
+            Angle to apply, or None if no angle is feasible for this channel
+        """
+        lo, hi = self.feasible_range(channel, pose)
+        if lo > hi:
+            return None
+        return max(lo, min(hi, angle))
+
+    def project(self, current, requested):
+        """
+        Project a requested pose onto the feasible region, moving only some joints
+
+        One pass of Euclidean projections onto each violated constraint
+        (restricted to the moving joints), followed by a per-joint clamp to
+        its feasible interval, which guarantees the result is feasible.
+
+        Args:
+            current: dict of channel -> current angle (all joints)
+            requested: dict of channel -> requested angle (joints allowed to move)
+
+        Returns:
+            dict: channel -> applied angle (None if that joint has no feasible
+                  angle and keeps its current one)
+        """
+        moving = requested
+        pose = dict(current)
+        pose.update(requested)
+        for coeffs, c_min, c_max in self.constraints:
+            value = 0
+            norm = 0
+            for channel, coeff in coeffs.items():
+                value += coeff * pose[channel]
+                if channel in moving:
+                    norm += coeff * coeff
+            if norm == 0:
+                continue
+            if c_min is not None and value < c_min:
+                excess = value - c_min
+            elif c_max is not None and value > c_max:
+                excess = value - c_max
+            else:
+                continue
+            for channel, coeff in coeffs.items():
+                if channel in moving:
+                    pose[channel] -= excess * coeff / norm
+
+        result = {}
+        steps = self.steps
+        for channel in moving:
+            # Back onto the angle grid; the clamp keeps the result feasible
+            angle = round(pose[channel] * steps)
+            angle = angle if steps == 1 else angle / steps
+            applied = self.clamp(channel, angle, pose)
+            pose[channel] = current[channel] if applied is None else applied
+            result[channel] = applied
+        return result
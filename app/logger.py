@@ -0,0 +1,186 @@
+"""
+Leveled logging for Pico2W tracked arm car.
+Records go into a fixed-size binary ring buffer in RAM (drained by
+/api/logs) and, at or above the console level, to the serial console.
+Messages are %-formatted only after the level check, identical repeats
+collapse into one record with a repeat count, and a per-second record budget
+keeps a failing loop from flooding the buffer or the serial port.
+
+Usage:
+    from logger import log
+    log.info("Client %d connected", session.id)
+    if log.debug_enabled:  # skip even the call on the hot path
+        log.debug("WebSocket command: %s", action)
+"""
+
+import struct
+import clock
+
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+
+LEVEL_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARNING: "WARNING", ERROR: "ERROR"}
+LEVELS = {name: level for level, name in LEVEL_NAMES.items()}
+
+# Record layout: uint32 time_ms, uint8 level, uint8 text length, uint16 repeats, text
+_HEADER = "<IBBH"
+_HEADER_SIZE = 8
+RECORD_SIZE = 64
+MAX_TEXT = RECORD_SIZE - _HEADER_SIZE
+
+
+def parse_level(name, default=INFO):
+    """Convert a level name ("debug", "INFO", ...) to its number"""
+    if name is None:
+        return default
+    return LEVELS.get(str(name).upper(), default)
+
+
+class Logger:
+    """Leveled logger with a binary ring buffer and rate limiting"""
+
+    def __init__(self, capacity=64):
+        """
+        Initialize logger (reconfigured from config.json by configure())
+
+        Args:
+            capacity: Records kept in the ring buffer
+        """
+        self.console_level = INFO
+        self.rate_per_s = 20
+        self._allocate(capacity)
+        self.set_level(INFO)
+
+    def _allocate(self, capacity):
+        """Allocate the ring buffer and reset its state"""
+        self.capacity = capacity
+        self._buf = bytearray(RECORD_SIZE * capacity)
+        self._view = memoryview(self._buf)
+        self._head = 0
+        self._count = 0
+        self.dropped = 0
+        self._tokens = self.rate_per_s
+        self._refill_ms = clock.now_ms()
+        self._last_template = None
+        self._last_args = None
+        self._last_offset = -1
+
+    def configure(self, config):
+        """
+        Apply the "logging" config section
+
+        Args:
+            config: Loaded configuration dict
+        """
+        logging_cfg = config.get("logging", {})
+        self.console_level = parse_level(logging_cfg.get("console_level"), INFO)
+        self.rate_per_s = logging_cfg.get("rate_per_s", 20)
+        capacity = logging_cfg.get("capacity", 64)
+        if capacity != self.capacity:
+            self._allocate(capacity)
+        self._tokens = self.rate_per_s
+        self.set_level(parse_level(logging_cfg.get("level"), INFO))
+
+    def set_level(self, level):
+        """Set the lowest level that is recorded (and precompute the level flags)"""
+        self.level = level
+        self.debug_enabled = level <= DEBUG
+        self.info_enabled = level <= INFO
+
+    def debug(self, template, *args):
+        """Log at DEBUG level"""
+        if self.level <= DEBUG:
+            self._log(DEBUG, template, args)
+
+    def info(self, template, *args):
+        """Log at INFO level"""
+        if self.level <= INFO:
+            self._log(INFO, template, args)
+
+    def warning(self, template, *args):
+        """Log at WARNING level"""
+        if self.level <= WARNING:
+            self._log(WARNING, template, args)
+
+    def error(self, template, *args):
+        """Log at ERROR level"""
+        self._log(ERROR, template, args)
+
+    def _log(self, level, template, args):
+        """Collapse a repeat, apply the rate limit, then format and store"""
+        if template is self._last_template and args == self._last_args and self._last_offset >= 0:
+            offset = self._last_offset + 6
+            repeats = self._buf[offset] | (self._buf[offset + 1] << 8)
+            if repeats < 0xFFFF:
+                struct.pack_into("<H", self._buf, offset, repeats + 1)
+            return
+
+        now_ms = clock.now_ms()
+        elapsed = now_ms - self._refill_ms
+        if elapsed >= 1000:
+            self._tokens = self.rate_per_s
+            self._refill_ms = now_ms
+        if self._tokens <= 0:
+            self.dropped += 1
+            return
+        self._tokens -= 1
+
+        message = template % args if args else template
+        if level >= self.console_level:
+            print(f"[{LEVEL_NAMES[level]}] {message}")
+        self._store(now_ms, level, message)
+        self._last_template = template
+        self._last_args = args
+
+    def _store(self, now_ms, level, message):
+        """Write one record into the ring, overwriting the oldest when full"""
+        text = message.encode()
+        length = len(text)
+        if length > MAX_TEXT:
+            length = MAX_TEXT
+            # Do not cut a UTF-8 sequence in half
+            while length and (text[length] & 0xC0) == 0x80:
+                length -= 1
+        offset = self._head * RECORD_SIZE
+        struct.pack_into(_HEADER, self._buf, offset, now_ms & 0xFFFFFFFF, level, length, 1)
+        self._view[offset + _HEADER_SIZE:offset + _HEADER_SIZE + length] = text[:length]
+        self._last_offset = offset
+        self._head = (self._head + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def drain(self):
+        """
+        Remove and return all buffered records, oldest first
+
+        Returns:
+            dict: level, dropped (records lost to the rate limit since the
+                  last drain) and records [{t_ms, level, message, repeats}]
+        """
+        records = []
+        index = (self._head - self._count) % self.capacity
+        for _ in range(self._count):
+            offset = index * RECORD_SIZE
+            t_ms, level, length, repeats = struct.unpack_from(_HEADER, self._buf, offset)
+            start = offset + _HEADER_SIZE
+            records.append({
+                "t_ms": t_ms,
+                "level": LEVEL_NAMES.get(level, str(level)),
+                "message": bytes(self._view[start:start + length]).decode(),
+                "repeats": repeats
+            })
+            index = (index + 1) % self.capacity
+        dropped = self.dropped
+        self._count = 0
+        self.dropped = 0
+        # A drained record can no longer take repeats
+        self._last_template = None
+        self._last_args = None
+        self._last_offset = -1
+        return {"level": LEVEL_NAMES.get(self.level, str(self.level)), "dropped": dropped, "records": records}
+
+
+# Shared instance; code.py applies the config at boot
+log = Logger()
@@ -0,0 +1,142 @@
+"""
+Memory and garbage-collection telemetry for Pico2W tracked arm car.
+Samples gc.mem_free() each tick, counts and times collections per window
+and publishes the result as the "memory" status section. In "scheduled"
+GC mode automatic collection is disabled and gc.collect() runs only at
+idle points between commands (or right away if free memory falls below a
+reserve), so collection pauses do not land in the middle of a command.
+"""
+
+import gc
+import time
+import clock
+
+
+# Rise of mem_free between samples that counts as a collection we did not run
+_RECLAIM_SLACK_BYTES = 1024
+
+
+class MemoryMonitor:
+    """Heap sampler and idle-point garbage collector"""
+
+    def __init__(self, config, device_state):
+        """
+        Initialize memory monitor
+
+        Args:
+            config: Loaded configuration dict (optional "memory" section)
+            device_state: Shared device state object (receives the stats)
+        """
+        memory_cfg = config.get("memory", {})
+        self.device_state = device_state
+        self.scheduled = memory_cfg.get("gc_mode", "auto") == "scheduled"
+        self.window_ms = memory_cfg.get("window_ms", 1000)
+        self.idle_ms = memory_cfg.get("idle_ms", 20)
+        self.collect_below = memory_cfg.get("collect_below_bytes", 65536)
+        self.reserve = memory_cfg.get("reserve_bytes", 16384)
+        self.max_interval_ms = memory_cfg.get("max_interval_ms", 5000)
+
+        # CircuitPython only; on other ports the heap size is not reported
+        self._mem_free = getattr(gc, "mem_free", None)
+        self._mem_alloc = getattr(gc, "mem_alloc", None)
+
+        self.idle_collections = 0
+        self.forced_collections = 0
+        self.auto_collections = 0
+        self.gc_max_ns = 0
+
+        now_ms = clock.now_ms()
+        self._last_activity_ms = 0
+        self._last_collect_ms = now_ms
+        self._start_window(now_ms)
+
+        if self.scheduled:
+            gc.collect()
+            gc.disable()
+        self._last_free = self._read_free()
+
+        print(f"✓ Memory monitor initialized (gc {'scheduled at idle points' if self.scheduled else 'automatic'})")
+
+    def _read_free(self):
+        """Get free heap bytes, or None if the port does not report it"""
+        return self._mem_free() if self._mem_free else None
+
+    def _start_window(self, now_ms):
+        """Reset the per-window counters"""
+        self._window_start_ms = now_ms
+        self._window_collections = 0
+        self._window_auto = 0
+        self._window_gc_total_ns = 0
+        self._window_gc_max_ns = 0
+        self._window_min_free = None
+
+    def note_activity(self):
+        """Record that a command was just handled (the next idle point is after it)"""
+        self._last_activity_ms = clock.now_ms()
+
+    def tick(self):
+        """
+        Sample the heap, collect at an idle point if due (scheduled mode) and
+        publish the window when it ends. Scheduled as the "memory" task.
+        """
+        now_ms = clock.now_ms()
+        free = self._read_free()
+        if free is not None:
+            last_free = self._last_free
+            if last_free is not None and free > last_free + _RECLAIM_SLACK_BYTES:
+                # Memory came back without our collect: an automatic collection ran
+                self.auto_collections += 1
+                self._window_auto += 1
+            if self._window_min_free is None or free < self._window_min_free:
+                self._window_min_free = free
+
+        if self.scheduled:
+            if free is not None and free < self.reserve:
+                free = self._collect(now_ms)
+                self.forced_collections += 1
+            elif now_ms - self._last_activity_ms >= self.idle_ms and (
+                    (free is not None and free < self.collect_below)
+                    or now_ms - self._last_collect_ms >= self.max_interval_ms):
+                free = self._collect(now_ms)
+                self.idle_collections += 1
+        self._last_free = free
+
+        if now_ms - self._window_start_ms >= self.window_ms:
+            self._publish(now_ms, free)
+            self._start_window(now_ms)
+
+    def _collect(self, now_ms):
+        """Run gc.collect() and time it, returns free bytes afterwards"""
+        started = time.monotonic_ns()
+        gc.collect()
+        elapsed = time.monotonic_ns() - started
+        self._last_collect_ms = now_ms
+        self._window_collections += 1
+        self._window_gc_total_ns += elapsed
+        if elapsed > self._window_gc_max_ns:
+            self._window_gc_max_ns = elapsed
+        if elapsed > self.gc_max_ns:
+            self.gc_max_ns = elapsed
+        return self._read_free()
+
+    def _publish(self, now_ms, free):
+        """Hand the finished window to the device state"""
+        self.device_state.update_memory({
+            "gc_mode": "scheduled" if self.scheduled else "auto",
+            "free": free,
+            "alloc": self._mem_alloc() if self._mem_alloc else None,
+            "collections": {
+                "idle": self.idle_collections,
+                "forced": self.forced_collections,
+                "auto": self.auto_collections
+            },
+            "gc_max_ms": round(self.gc_max_ns / 1_000_000, 1),
+            "window": {
+                "ms": now_ms - self._window_start_ms,
+                "min_free": self._window_min_free,
+                "collections": self._window_collections,
+                "auto_collections": self._window_auto,
+                "gc_total_ms": round(self._window_gc_total_ns / 1_000_000, 1),
+                "gc_max_ms": round(self._window_gc_max_ns / 1_000_000, 1)
+            }
+        })
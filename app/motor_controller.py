@@ -2,17 +2,151 @@
 电机控制器模块
 支持TB6612双路电机驱动器和DRV8837单路电机驱动器
 """
+import array
 import board
 import pwmio
 import digitalio
 import time
 
+# 未配置时的PWM频率（Hz）
+DEFAULT_PWM_FREQUENCY = 1000
+
+
+class WriteCounter:
+    """硬件写入计数器（实际写入 / 因值未变化而跳过）"""
+    
+    def __init__(self):
+        self.issued = 0
+        self.skipped = 0
+    
+    def get_status(self):
+        """获取计数"""
+        return {
+            "issued": self.issued,
+            "skipped": self.skipped
+        }
+
+
+class ShadowPin:
+    """
+    数字输出引脚的影子寄存器
+    缓存最后写入的值，只有值变化时才写GPIO
+    """
+    
+    def __init__(self, pin, counter):
+        """
+        Args:
+            pin: board引脚
+            counter: 共享的WriteCounter
+        """
+        self.io = digitalio.DigitalInOut(pin)
+        self.io.direction = digitalio.Direction.OUTPUT
+        self.counter = counter
+        self._value = None  # 未知状态，第一次写入一定下发
+    
+    @property
+    def value(self):
+        return bool(self._value)
+    
+    @value.setter
+    def value(self, value):
+        if value == self._value:
+            self.counter.skipped += 1
+            return
+        self.io.value = value
+        self._value = value
+        self.counter.issued += 1
+    
+    def deinit(self):
+        self.io.deinit()
+
+
+class ShadowPWM:
+    """
+    PWM输出的影子寄存器
+    缓存最后写入的占空比，只有值变化时才写PWM寄存器
+    """
+    
+    def __init__(self, pin, counter, frequency=1000):
+        """
+        Args:
+            pin: board引脚
+            counter: 共享的WriteCounter
+            frequency: PWM频率（Hz）
+        """
+        self.pwm = pwmio.PWMOut(pin, frequency=frequency, duty_cycle=0)
+        self.counter = counter
+        self._duty_cycle = 0  # 构造时已写入0
+    
+    @property
+    def duty_cycle(self):
+        return self._duty_cycle
+    
+    @duty_cycle.setter
+    def duty_cycle(self, value):
+        if value == self._duty_cycle:
+            self.counter.skipped += 1
+            return
+        self.pwm.duty_cycle = value
+        self._duty_cycle = value
+        self.counter.issued += 1
+    
+    def deinit(self):
+        self.pwm.deinit()
+
+
+class DutyCurve:
+    """
+    速度(%) → 16位占空比查找表
+    支持死区、最小占空比补偿和占空比量化，启动时按整数速度预计算
+    """
+    
+    def __init__(self, pwm_cfg=None):
+        """
+        Args:
+            pwm_cfg: PWM配置字典（可选）
+                deadband: 小于该速度(%)的命令输出0
+                min_duty: 非零速度对应的最小占空比(%)，补偿电机静摩擦
+                resolution_bits: 占空比量化位数（1-16）
+        """
+        cfg = pwm_cfg or {}
+        self.deadband = cfg.get("deadband", 0)
+        self.min_duty = cfg.get("min_duty", 0)
+        self.resolution_bits = cfg.get("resolution_bits", 16)
+        
+        step = 1 << (16 - self.resolution_bits)
+        self.table = array.array("H", bytes(2 * 101))
+        for speed in range(1, 101):
+            if speed < self.deadband:
+                continue
+            # 死区边缘映射到min_duty，100%映射到满占空比
+            span = 100 - self.deadband
+            fraction = (speed - self.deadband) / span if span > 0 else 1
+            percent = self.min_duty + (100 - self.min_duty) * fraction
+            duty = int(percent * 655.35)
+            duty = min(0xFFFF, (duty + step // 2) // step * step)
+            self.table[speed] = duty
+    
+    def duty(self, speed):
+        """
+        查表获取占空比
+        
+        Args:
+            speed: 速度值（取绝对值，-100到100）
+            
+        Returns:
+            int: 16位占空比
+        """
+        index = int(abs(speed) + 0.5)
+        return self.table[index if index <= 100 else 100]
+
 
 class TB6612Controller:
     """TB6612双路电机驱动器控制类（用于履带）"""
     
     def __init__(self, pwma_pin, ain1_pin, ain2_pin, 
-                 pwmb_pin, bin1_pin, bin2_pin, stby_pin):
+                 pwmb_pin, bin1_pin, bin2_pin, stby_pin,
+                 pwm_a=None, pwm_b=None):
         """
         初始化TB6612控制器
         
@@ -24,24 +158,31 @@ class TB6612Controller:
             bin1_pin: B路方向引脚1
             bin2_pin: B路方向引脚2
             stby_pin: 待机引脚（高电平工作，低电平待机）
+            pwm_a: A路PWM配置（frequency及DutyCurve参数，可选）
+            pwm_b: B路PWM配置（同上，可选）
         """
+        pwm_a = pwm_a or {}
+        pwm_b = pwm_b or {}
+        
+        # 所有输出经过影子寄存器，重复命令不产生硬件写入
+        self.writes = WriteCounter()
+        
         # A路（左履带）PWM
-        self.pwma = pwmio.PWMOut(pwma_pin, frequency=1000, duty_cycle=0)
-        self.ain1 = digitalio.DigitalInOut(ain1_pin)
-        self.ain1.direction = digitalio.Direction.OUTPUT
-        self.ain2 = digitalio.DigitalInOut(ain2_pin)
-        self.ain2.direction = digitalio.Direction.OUTPUT
+        self.pwma = ShadowPWM(pwma_pin, self.writes,
+                              frequency=pwm_a.get("frequency", DEFAULT_PWM_FREQUENCY))
+        self.curve_a = DutyCurve(pwm_a)
+        self.ain1 = ShadowPin(ain1_pin, self.writes)
+        self.ain2 = ShadowPin(ain2_pin, self.writes)
         
         # B路（右履带）PWM
-        self.pwmb = pwmio.PWMOut(pwmb_pin, frequency=1000, duty_cycle=0)
-        self.bin1 = digitalio.DigitalInOut(bin1_pin)
-        self.bin1.direction = digitalio.Direction.OUTPUT
-        self.bin2 = digitalio.DigitalInOut(bin2_pin)
-        self.bin2.direction = digitalio.Direction.OUTPUT
+        self.pwmb = ShadowPWM(pwmb_pin, self.writes,
+                              frequency=pwm_b.get("frequency", DEFAULT_PWM_FREQUENCY))
+        self.curve_b = DutyCurve(pwm_b)
+        self.bin1 = ShadowPin(bin1_pin, self.writes)
+        self.bin2 = ShadowPin(bin2_pin, self.writes)
         
         # 待机控制
-        self.stby = digitalio.DigitalInOut(stby_pin)
-        self.stby.direction = digitalio.Direction.OUTPUT
+        self.stby = ShadowPin(stby_pin, self.writes)
         
         # 当前速度状态 (-100 到 100)
         self.left_speed = 0
@@ -62,63 +203,77 @@ class TB6612Controller:
         self.left_speed = 0
         self.right_speed = 0
     
-    def _set_motor_a(self, speed):
+    def _set_motor_a(self, speed, brake=False):
         """
         设置A路电机（左履带）速度
         
         Args:
             speed: -100到100的速度值，负数为反转
+            brake: 为True时短路刹车（忽略speed）
         """
-        speed = max(-100, min(100, speed))
+        speed = 0 if brake else max(-100, min(100, speed))
         self.left_speed = speed
         
-        if speed == 0:
+        if brake:
+            # 短路刹车：IN1=IN2=高
+            self.ain1.value = True
+            self.ain2.value = True
+            self.pwma.duty_cycle = 0
+        elif speed == 0:
             self.ain1.value = False
             self.ain2.value = False
             self.pwma.duty_cycle = 0
         elif speed > 0:
             self.ain1.value = True
             self.ain2.value = False
-            self.pwma.duty_cycle = int(abs(speed) * 655.35)  # 0-65535
+            self.pwma.duty_cycle = self.curve_a.duty(speed)  # 0-65535
         else:
             self.ain1.value = False
             self.ain2.value = True
-            self.pwma.duty_cycle = int(abs(speed) * 655.35)
+            self.pwma.duty_cycle = self.curve_a.duty(speed)
     
-    def _set_motor_b(self, speed):
+    def _set_motor_b(self, speed, brake=False):
         """
         设置B路电机（右履带）速度
         
         Args:
             speed: -100到100的速度值，负数为反转
+            brake: 为True时短路刹车（忽略speed）
         """
-        speed = max(-100, min(100, speed))
+        speed = 0 if brake else max(-100, min(100, speed))
         self.right_speed = speed
         
-        if speed == 0:
+        if brake:
+            # 短路刹车：IN1=IN2=高
+            self.bin1.value = True
+            self.bin2.value = True
+            self.pwmb.duty_cycle = 0
+        elif speed == 0:
             self.bin1.value = False
             self.bin2.value = False
             self.pwmb.duty_cycle = 0
         elif speed > 0:
             self.bin1.value = True
             self.bin2.value = False
-            self.pwmb.duty_cycle = int(abs(speed) * 655.35)
+            self.pwmb.duty_cycle = self.curve_b.duty(speed)
         else:
             self.bin1.value = False
             self.bin2.value = True
-            self.pwmb.duty_cycle = int(abs(speed) * 655.35)
+            self.pwmb.duty_cycle = self.curve_b.duty(speed)
     
-    def set_motors(self, left_speed, right_speed):
+    def set_motors(self, left_speed, right_speed, brake_left=False, brake_right=False):
         """
         设置两个电机速度
         
         Args:
             left_speed: 左履带速度 (-100到100)
             right_speed: 右履带速度 (-100到100)
+            brake_left: 左履带短路刹车
+            brake_right: 右履带短路刹车
         """
         self.enable()
-        self._set_motor_a(left_speed)
-        self._set_motor_b(right_speed)
+        self._set_motor_a(left_speed, brake_left)
+        self._set_motor_b(right_speed, brake_right)
     
     def forward(self, speed=50):
         """前进"""
@@ -145,7 +300,8 @@ class TB6612Controller:
         return {
             "left_speed": self.left_speed,
             "right_speed": self.right_speed,
-            "enabled": self.stby.value
+            "enabled": self.stby.value,
+            "writes": self.writes.get_status()
         }
     
     def deinit(self):
@@ -158,7 +314,7 @@ class TB6612Controller:
 class DRV8837Controller:
     """DRV8837单路电机驱动器控制类（用于底盘旋转）"""
     
-    def __init__(self, in1_pin, in2_pin, sleep_pin=None):
+    def __init__(self, in1_pin, in2_pin, sleep_pin=None, pwm=None):
         """
         初始化DRV8837控制器
         
@@ -166,16 +322,23 @@ class DRV8837Controller:
             in1_pin: 输入引脚1（PWM）
             in2_pin: 输入引脚2（PWM）
             sleep_pin: 休眠引脚（可选，高电平工作，低电平休眠）
+            pwm: PWM配置（frequency及DutyCurve参数，可选）
         """
-        # IN1和IN2都使用PWM
-        self.in1 = pwmio.PWMOut(in1_pin, frequency=1000, duty_cycle=0)
-        self.in2 = pwmio.PWMOut(in2_pin, frequency=1000, duty_cycle=0)
+        pwm = pwm or {}
+        
+        # 所有输出经过影子寄存器，重复命令不产生硬件写入
+        self.writes = WriteCounter()
+        
+        # IN1和IN2都使用PWM（同一电机，共用配置）
+        frequency = pwm.get("frequency", DEFAULT_PWM_FREQUENCY)
+        self.in1 = ShadowPWM(in1_pin, self.writes, frequency=frequency)
+        self.in2 = ShadowPWM(in2_pin, self.writes, frequency=frequency)
+        self.curve = DutyCurve(pwm)
         
         # 休眠控制（可选）
         self.sleep = None
         if sleep_pin:
-            self.sleep = digitalio.DigitalInOut(sleep_pin)
-            self.sleep.direction = digitalio.Direction.OUTPUT
+            self.sleep = ShadowPin(sleep_pin, self.writes)
             self.sleep.value = False  # 默认休眠
         
         self.current_speed = 0
@@ -217,12 +380,12 @@ class DRV8837Controller:
             self.in2.duty_cycle = 65535
         elif speed > 0:
             # 正转：IN1=PWM, IN2=0
-            self.in1.duty_cycle = int(abs(speed) * 655.35)
+            self.in1.duty_cycle = self.curve.duty(speed)
             self.in2.duty_cycle = 0
         else:
             # 反转：IN1=0, IN2=PWM
             self.in1.duty_cycle = 0
-            self.in2.duty_cycle = int(abs(speed) * 655.35)
+            self.in2.duty_cycle = self.curve.duty(speed)
     
     def rotate_cw(self, speed=50):
         """顺时针旋转"""
@@ -253,7 +416,8 @@ class DRV8837Controller:
         """获取当前状态"""
         return {
             "speed": self.current_speed,
-            "enabled": self.sleep.value if self.sleep else True
+            "enabled": self.sleep.value if self.sleep else True,
+            "writes": self.writes.get_status()
         }
     
     def deinit(self):
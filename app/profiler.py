@@ -0,0 +1,132 @@
+"""
+Main-loop profiler for Pico2W tracked arm car.
+Times the stages of the scheduled jobs (HTTP poll, WebSocket receive,
+message handling, send, safety check, state push) with monotonic_ns probes
+and counts the durations into fixed-bucket histograms held in preallocated
+arrays. Can be switched on and off at runtime; disabled probes cost one
+attribute check.
+"""
+
+import array
+import time
+
+# Profiled stages, indexed by the STAGE_* constants below
+STAGES = ("poll", "receive", "handle", "send", "safety", "push")
+STAGE_POLL = 0
+STAGE_RECEIVE = 1
+STAGE_HANDLE = 2
+STAGE_SEND = 3
+STAGE_SAFETY = 4
+STAGE_PUSH = 5
+
+# Histogram bucket upper bounds in microseconds (one more bucket catches the rest)
+BUCKET_BOUNDS_US = (50, 100, 200, 500, 1000, 2000, 5000, 10000, 20000, 50000)
+_BUCKETS = len(BUCKET_BOUNDS_US) + 1
+
+
+class LoopProfiler:
+    """Per-stage duration histograms for the main loop"""
+
+    def __init__(self, config):
+        """
+        Initialize profiler
+
+        Args:
+            config: Loaded configuration dict (optional "profiler" section)
+        """
+        self.enabled = config.get("profiler", {}).get("enabled", False)
+        count = len(STAGES)
+        # Row per stage: [bucket 0 .. bucket N] flattened into one array
+        self._buckets = array.array("I", bytes(4 * count * _BUCKETS))
+        self._counts = array.array("I", bytes(4 * count))
+        self._max_us = array.array("I", bytes(4 * count))
+        # Totals can outgrow 32 bits over a long session
+        self._total_us = [0] * count
+        self._since_ns = time.monotonic_ns()
+
+    def start(self):
+        """
+        Begin timing a stage
+
+        Returns:
+            int: Start timestamp, or 0 while the profiler is disabled
+        """
+        if not self.enabled:
+            return 0
+        return time.monotonic_ns()
+
+    def stop(self, stage, started):
+        """
+        Record a stage duration
+
+        Args:
+            stage: STAGE_* index
+            started: Value returned by start() (0 = not timed)
+        """
+        if not started:
+            return
+        elapsed_us = (time.monotonic_ns() - started) // 1000
+        bucket = 0
+        for bound in BUCKET_BOUNDS_US:
+            if elapsed_us <= bound:
+                break
+            bucket += 1
+        self._buckets[stage * _BUCKETS + bucket] += 1
+        self._counts[stage] += 1
+        self._total_us[stage] += elapsed_us
+        if elapsed_us > self._max_us[stage]:
+            self._max_us[stage] = elapsed_us
+
+    def set_enabled(self, enabled):
+        """Switch probes on or off (collected histograms are kept)"""
+        self.enabled = bool(enabled)
+
+    def reset(self):
+        """Clear all histograms"""
+        for i in range(len(self._buckets)):
+            self._buckets[i] = 0
+        for stage in range(len(STAGES)):
+            self._counts[stage] = 0
+            self._max_us[stage] = 0
+            self._total_us[stage] = 0
+        self._since_ns = time.monotonic_ns()
+
+    def _percentile_us(self, stage, fraction):
+        """Upper bound of the bucket holding the given fraction of samples"""
+        count = self._counts[stage]
+        needed = count * fraction
+        seen = 0
+        for bucket in range(_BUCKETS):
+            seen += self._buckets[stage * _BUCKETS + bucket]
+            if seen >= needed:
+                if bucket < len(BUCKET_BOUNDS_US):
+                    return min(BUCKET_BOUNDS_US[bucket], self._max_us[stage])
+                break
+        return self._max_us[stage]
+
+    def get_metrics(self):
+        """
+        Get histograms and summary statistics per stage
+
+        Returns:
+            dict: enabled, window_ms, bucket_bounds_us and per-stage count,
+                  mean_us, p50_us, p99_us, max_us and bucket counts
+        """
+        stages = {}
+        for stage, name in enumerate(STAGES):
+            count = self._counts[stage]
+            row = stage * _BUCKETS
+            stages[name] = {
+                "count": count,
+                "mean_us": self._total_us[stage] // count if count else 0,
+                "p50_us": self._percentile_us(stage, 0.5) if count else 0,
+                "p99_us": self._percentile_us(stage, 0.99) if count else 0,
+                "max_us": self._max_us[stage],
+                "buckets": list(self._buckets[row:row + _BUCKETS])
+            }
+        return {
+            "enabled": self.enabled,
+            "window_ms": (time.monotonic_ns() - self._since_ns) // 1_000_000,
+            "bucket_bounds_us": list(BUCKET_BOUNDS_US),
+            "stages": stages
+        }
@@ -0,0 +1,279 @@
+"""
+Motor safety watchdog for Pico2W tracked arm car.
+Keeps a deadman timer per actuator group (tracks, base, arm), refreshed only
+by that group's own commands, and stops a group when its timer runs out.
+Also arms the RP2350 hardware watchdog (microcontroller.watchdog, RESET mode)
+while tracks or base move. The hardware watchdog is fed only from the scheduled check, so a main
+loop that stalls for longer than its timeout resets the chip; the reset
+returns the driver pins to their pulled-down inputs and the motors stop.
+The raspberrypi port cannot leave RESET mode again, so once the motors stop
+the watchdog is relaxed to a long idle timeout instead of being disabled.
+"""
+
+import clock
+import microcontroller
+from timer_wheel import TimerWheel
+from logger import log
+
+try:
+    from watchdog import WatchDogMode
+except ImportError:
+    WatchDogMode = None
+
+# Actuator groups with their own deadman timer
+DEADMAN_GROUPS = ("tracks", "base", "arm")
+
+# Timer wheel size; deadlines beyond tick_ms * slots just take extra turns
+_WHEEL_SLOTS = 64
+
+
+class SafetyWatchdog:
+    """Per-actuator deadman stop backed by the hardware watchdog"""
+
+    def __init__(self, config, device_state, controllers):
+        """
+        Initialize safety watchdog
+
+        Args:
+            config: Loaded configuration dict ("safety" section)
+            device_state: Shared device state object
+            controllers: Dict with optional "track", "base" and "servo" controllers
+        """
+        safety_cfg = config["safety"]
+        watchdog_cfg = safety_cfg.get("watchdog", {})
+        self.device_state = device_state
+        self.controllers = controllers
+        self.command_timeout_ms = safety_cfg["command_timeout_ms"]
+        self.hardware_timeout_ms = watchdog_cfg.get("hardware_timeout_ms", 500)
+        # Used while parked when the watchdog cannot be disabled (covers blocking HTTP)
+        self.idle_timeout_ms = watchdog_cfg.get("idle_timeout_ms", 8000)
+
+        # Deadman timeouts per group (default: command_timeout_ms)
+        deadman_cfg = safety_cfg.get("deadman", {})
+        timeouts_cfg = deadman_cfg.get("timeouts_ms", {})
+        self.deadman_timeouts = {}
+        for group in DEADMAN_GROUPS:
+            self.deadman_timeouts[group] = timeouts_cfg.get(group, self.command_timeout_ms)
+        self.deadman = TimerWheel(deadman_cfg.get("tick_ms", 20), _WHEEL_SLOTS)
+        self.expired = {group: 0 for group in DEADMAN_GROUPS}
+        # Connected client whose arm setpoint the trajectory is running to
+        self.arm_owner = None
+
+        # Measured delay between a deadman deadline and the stop command
+        self.stops = 0
+        self.last_stop_latency_ms = None
+        self.worst_stop_latency_ms = None
+
+        self.watchdog = None
+        if watchdog_cfg.get("enabled", True) and WatchDogMode is not None:
+            self.watchdog = microcontroller.watchdog
+        self.armed = False
+        self._can_disarm = True
+        # Running at idle_timeout_ms because deinit() is not supported
+        self.relaxed = False
+        if self.watchdog is not None and self.watchdog.mode is not None:
+            # Still running from before a soft reload: keep it fed
+            self._can_disarm = False
+            self._relax()
+
+        self.reset_by_watchdog = False
+        try:
+            self.reset_by_watchdog = microcontroller.cpu.reset_reason == microcontroller.ResetReason.WATCHDOG
+        except AttributeError:
+            pass
+        if self.reset_by_watchdog:
+            device_state.add_error("Restarted by hardware watchdog (main loop stalled while motors ran)", "watchdog")
+
+        print("✓ Safety watchdog initialized")
+        if self.watchdog:
+            print(f"  Hardware watchdog {self.hardware_timeout_ms}ms while motors run")
+        else:
+            print("  Hardware watchdog unavailable - deadman timers only")
+
+    def motors_active(self):
+        """Check if any track or base motor is driven or ramping"""
+        track = self.controllers.get("track")
+        if track:
+            ramp = track.ramp
+            if ramp and not ramp.is_settled():
+                return True
+            if track.controller.left_speed or track.controller.right_speed:
+                return True
+        base = self.controllers.get("base")
+        if base and base.current_direction != "stop":
+            return True
+        return False
+
+    def refresh(self, group, owner=None):
+        """
+        Restart a group's deadman timer (call for every command to that group)
+
+        Args:
+            group: "tracks", "base" or "arm"
+            owner: Session that sent an arm command (the lease holder)
+        """
+        self.deadman.schedule(group, self.deadman_timeouts[group])
+        if group == "arm":
+            self.arm_owner = owner
+
+    def release(self, owner):
+        """
+        Forget a disconnected client, holding the arm if it was moving to that
+        client's setpoint
+        """
+        if owner is None or self.arm_owner is not owner:
+            return
+        self.arm_owner = None
+        if self._hold_arm():
+            log.warning("Client %d disconnected - holding arm", owner.id)
+
+    def check(self):
+        """
+        Stop groups whose deadman timer expired and feed/arm/disarm the
+        hardware watchdog. Scheduled as the "safety" task.
+        """
+        now_ms = clock.now_ms()
+        for group, deadline_ms in self.deadman.advance(now_ms):
+            self._expire(group, now_ms - deadline_ms)
+
+        if self.watchdog is None:
+            return
+        if self.motors_active():
+            if not self.armed:
+                self._arm()
+            self.watchdog.feed()
+        elif self.armed:
+            self._disarm()
+        elif self.relaxed:
+            self.watchdog.feed()
+
+    def watch(self):
+        """
+        Arm the hardware watchdog right away if a command just started a
+        motor, closing the gap until the next scheduled check
+        """
+        if self.watchdog is not None and not self.armed and self.motors_active():
+            self._arm()
+            self.watchdog.feed()
+
+    def feed(self):
+        """
+        Feed the hardware watchdog if it is running, so the blocking call
+        that follows (e.g. server.poll()) gets the whole timeout
+        """
+        if self.armed or self.relaxed:
+            self.watchdog.feed()
+
+    def _expire(self, group, latency_ms):
+        """Stop one actuator group after its deadman timeout, recording the latency"""
+        if group == "tracks":
+            stopped = self._stop_tracks()
+        elif group == "base":
+            stopped = self._stop_base()
+        else:
+            stopped = self._hold_arm()
+        self.expired[group] += 1
+        if not stopped:
+            # Timer ran out on an actuator that was already idle
+            return
+
+        log.warning("No %s command for %dms - stopping %s", group, self.deadman_timeouts[group], group)
+        self.stops += 1
+        self.last_stop_latency_ms = latency_ms
+        if self.worst_stop_latency_ms is None or latency_ms > self.worst_stop_latency_ms:
+            self.worst_stop_latency_ms = latency_ms
+
+    def _stop_tracks(self):
+        """Stop both tracks, returns True if they were moving"""
+        track = self.controllers.get("track")
+        if not track:
+            return False
+        ramp = track.ramp
+        moving = bool(track.controller.left_speed or track.controller.right_speed
+                      or (ramp and not ramp.is_settled()))
+        track.stop()
+        self.device_state.update_track_state(0, 0)
+        return moving
+
+    def _stop_base(self):
+        """Stop base rotation (not an active base_goto), returns True if it was turning"""
+        base = self.controllers.get("base")
+        # A base_goto is a single command bounded by its own timeout
+        if not base or base.is_goto_active():
+            return False
+        moving = base.current_direction != "stop"
+        base.stop()
+        self.device_state.update_base_rotation_state("stop", 0)
+        return moving
+
+    def _hold_arm(self):
+        """Stop a running arm motion (not one its connected sender set), returns True if it was moving"""
+        servo = self.controllers.get("servo")
+        # Like a base_goto, a trajectory is a single command bounded by its setpoint
+        if not servo or (self.arm_owner is not None and servo.is_moving()):
+            return False
+        held = servo.hold()
+        if held is None:
+            return False
+        for channel, angle in held.items():
+            self.device_state.update_servo_state(channel, angle)
+        return True
+
+    def _arm(self):
+        """Start the hardware watchdog in RESET mode (or tighten a relaxed one)"""
+        self.watchdog.timeout = self.hardware_timeout_ms / 1000
+        if self.watchdog.mode != WatchDogMode.RESET:
+            self.watchdog.mode = WatchDogMode.RESET
+        self.armed = True
+        self.relaxed = False
+
+    def _disarm(self):
+        """Stop the hardware watchdog, or relax it if the port cannot"""
+        if self._can_disarm:
+            try:
+                self.watchdog.deinit()
+                self.armed = False
+                return
+            except Exception as e:
+                log.warning("Hardware watchdog cannot be disabled (%s) - relaxing it to %dms while idle",
+                            e, self.idle_timeout_ms)
+                self._can_disarm = False
+        self._relax()
+
+    def _relax(self):
+        """Keep the hardware watchdog running with the idle timeout"""
+        # Setting the timeout restarts the countdown with the new value
+        self.watchdog.timeout = self.idle_timeout_ms / 1000
+        self.watchdog.feed()
+        self.armed = False
+        self.relaxed = True
+
+    def get_status(self):
+        """Get deadman timers, watchdog configuration and measured stop latencies"""
+        deadman = {}
+        for group in DEADMAN_GROUPS:
+            deadman[group] = {
+                "timeout_ms": self.deadman_timeouts[group],
+                "remaining_ms": self.deadman.remaining(group),
+                "expired": self.expired[group]
+            }
+        return {
+            "command_timeout_ms": self.command_timeout_ms,
+            "deadman": deadman,
+            "hardware_timeout_ms": self.hardware_timeout_ms if self.watchdog else None,
+            "idle_timeout_ms": self.idle_timeout_ms if self.watchdog else None,
+            "armed": self.armed,
+            "relaxed": self.relaxed,
+            "reset_by_watchdog": self.reset_by_watchdog,
+            "stops": self.stops,
+            "last_stop_latency_ms": self.last_stop_latency_ms,
+            "worst_stop_latency_ms": self.worst_stop_latency_ms
+        }
+
+    def deinit(self):
+        """Disarm the hardware watchdog (call on shutdown, before leaving code.py)"""
+        if self.watchdog is not None and self.armed:
+            self._disarm()
+        if self.relaxed:
+            # Nothing feeds it once code.py has exited
+            log.warning("Hardware watchdog stays in RESET mode - board resets in %dms", self.idle_timeout_ms)
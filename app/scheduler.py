@@ -0,0 +1,139 @@
+"""
+Cooperative scheduler for Pico2W tracked arm car.
+Runs periodic jobs (HTTP serving, WebSocket receive, safety checks) from one
+asyncio dispatcher loop: whenever several jobs are due, the one with the
+lowest priority value runs first.
+"""
+
+import asyncio
+import time
+
+
+class PeriodicTask:
+    """A job that is called at a fixed period by the scheduler"""
+
+    def __init__(self, name, callback, period_ms, priority):
+        """
+        Initialize periodic task
+
+        Args:
+            name: Task name (used for config overrides and status)
+            callback: Function called once per period (must not block)
+            period_ms: Call period in milliseconds
+            priority: Lower value runs first when several tasks are due together
+        """
+        self.name = name
+        self.callback = callback
+        self.period_ns = int(period_ms * 1_000_000)
+        self.priority = priority
+        self.next_run_ns = 0
+        self.runs = 0
+        self.overruns = 0
+        self.max_run_ns = 0
+
+    def get_status(self):
+        """Get task statistics"""
+        return {
+            "period_ms": self.period_ns // 1_000_000,
+            "priority": self.priority,
+            "runs": self.runs,
+            "overruns": self.overruns,
+            "max_run_ms": self.max_run_ns / 1_000_000
+        }
+
+
+class Scheduler:
+    """Cooperative asyncio scheduler with per-task period and priority"""
+
+    def __init__(self, config, on_error=None):
+        """
+        Initialize scheduler
+
+        Args:
+            config: Loaded configuration dict (optional "scheduler" section
+                    overrides period_ms/priority per task name)
+            on_error: Optional callable(task_name, exception) for task failures
+        """
+        self.overrides = config.get("scheduler", {})
+        self.on_error = on_error
+        self.tasks = []
+
+    def add(self, name, callback, period_ms, priority=10):
+        """
+        Register a periodic task
+
+        Args:
+            name: Task name
+            callback: Function called once per period
+            period_ms: Default period in milliseconds
+            priority: Default priority (lower value = higher priority)
+
+        Returns:
+            PeriodicTask: The registered task
+        """
+        override = self.overrides.get(name, {})
+        task = PeriodicTask(
+            name,
+            callback,
+            override.get("period_ms", period_ms),
+            override.get("priority", priority)
+        )
+        self.tasks.append(task)
+        return task
+
+    def _run_once(self, task):
+        """Call a task's callback once and schedule its next run"""
+        started = time.monotonic_ns()
+        try:
+            task.callback()
+        except Exception as e:
+            if self.on_error:
+                self.on_error(task.name, e)
+        finished = time.monotonic_ns()
+
+        task.runs += 1
+        run_ns = finished - started
+        if run_ns > task.max_run_ns:
+            task.max_run_ns = run_ns
+
+        task.next_run_ns += task.period_ns
+        if task.next_run_ns <= finished:
+            # Missed the slot - resynchronise instead of bursting to catch up
+            task.overruns += 1
+            task.next_run_ns = finished + task.period_ns
+
+    async def run(self):
+        """
+        Dispatch due tasks forever
+
+        After every run the due tasks are scanned again from the highest
+        priority, so a command poll that became due while a slow job ran
+        goes before the remaining lower-priority jobs.
+        """
+        # Stable sort keeps registration order among equal priorities
+        ordered = sorted(self.tasks, key=lambda t: t.priority)
+        now = time.monotonic_ns()
+        for task in ordered:
+            task.next_run_ns = now
+
+        while True:
+            now = time.monotonic_ns()
+            due = None
+            next_due_ns = None
+            for task in ordered:
+                if task.next_run_ns <= now:
+                    due = task
+                    break
+                if next_due_ns is None or task.next_run_ns < next_due_ns:
+                    next_due_ns = task.next_run_ns
+
+            if due is not None:
+                self._run_once(due)
+                # A run never leaves its own task due, so this cannot starve others
+                await asyncio.sleep(0)
+            else:
+                await asyncio.sleep((next_due_ns - now) / 1_000_000_000)
+
+    def get_status(self):
+        """Get statistics for all tasks"""
+        return {task.name: task.get_status() for task in self.tasks}
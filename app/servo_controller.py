@@ -1,8 +1,24 @@
 """
 Servo controller for PCA9685-based mechanical arm.
-Manages 3-joint servo angles with bounds checking and interference detection.
+Manages 3-joint servo angles with bounds checking and interference avoidance.
 """
 
+import array
+import time
+from clock import MAX_TICK_S
+from servo_trajectory import ServoTrajectory
+from joint_constraints import JointConstraints
+from logger import log
+
+# PCA9685 register map
+_MODE1 = 0x00
+_MODE1_AUTO_INCREMENT = 0x20
+_LED0_ON_L = 0x06
+_CHANNELS = 16
+
+# Servo actuation range used for the pulse-width mapping (matches adafruit_motor.servo)
+_ACTUATION_RANGE = 180
+
 
 class ServoController:
     """Control servos via PCA9685 PWM driver"""
@@ -16,7 +32,6 @@ class ServoController:
             config: Configuration dict with servos and pca9685 settings
         """
         from adafruit_pca9685 import PCA9685
-        from adafruit_motor import servo
         
         self.config = config
         
@@ -24,103 +39,291 @@ class ServoController:
         self.pca = PCA9685(i2c)
         self.pca.frequency = config["pca9685"]["frequency"]
         
-        # Create servo instances and track current angles
+        # Bulk writes rely on register auto-increment (the frequency setter
+        # enables it, but make sure in case the library changes)
+        if not self.pca.mode1_reg & _MODE1_AUTO_INCREMENT:
+            self.pca.mode1_reg = self.pca.mode1_reg | _MODE1_AUTO_INCREMENT
+        pwm_frequency = self.pca.frequency
+        
+        # Lookup table resolution (1 = whole degrees, 2 = half degrees, ...)
+        steps = config["pca9685"].get("lut_steps_per_degree", 1)
+        
+        # Build per-channel angle -> 12-bit duty tables and track current angles
         self.servos = []
+        self.servos_by_channel = {}
         self.current_angles = {}
         
+        # Preallocated register buffer (register address + 4 bytes per channel)
+        self._buf = bytearray(1 + 4 * _CHANNELS)
+        
+        initial_writes = []
         for servo_cfg in config["servos"]:
-            servo_obj = servo.Servo(
-                self.pca.channels[servo_cfg["channel"]],
-                min_pulse=servo_cfg["min_pulse"],
-                max_pulse=servo_cfg["max_pulse"]
-            )
-            # Set initial angle
+            servo_data = {
+                "config": servo_cfg,
+                "min_angle": servo_cfg["min_angle"],
+                "max_angle": servo_cfg["max_angle"],
+                "steps": steps,
+                "lut": self._build_lut(servo_cfg, pwm_frequency, steps)
+            }
+            self.servos.append(servo_data)
+            self.servos_by_channel[servo_cfg["channel"]] = servo_data
+            
             initial = servo_cfg["initial_angle"]
-            servo_obj.angle = initial
-            self.servos.append({
-                "obj": servo_obj,
-                "config": servo_cfg
-            })
+            initial_writes.append((servo_cfg["channel"], self._lookup(servo_data, initial)))
             self.current_angles[servo_cfg["channel"]] = initial
         
-        print(f"✓ Servo controller initialized ({len(self.servos)} servos)")
-        print(f"  Interference checking enabled for channels 0-1")
+        # Set initial angles in one burst
+        self._write_channels(initial_writes)
+        
+        # Linear interference constraints with per-channel feasible-interval tables
+        self.constraints = JointConstraints(config, steps)
+        
+        # Setpoints (equal to current_angles unless a trajectory is running)
+        self.target_angles = dict(self.current_angles)
+        
+        # Optional smooth motion: set_angle(s) become setpoints and tick() moves the joints
+        self.trajectory = None
+        self._last_tick_ns = time.monotonic_ns()
+        if config.get("servo_motion", {}).get("enabled", False):
+            self.trajectory = ServoTrajectory(config, self.current_angles)
+        
+        print(f"✓ Servo controller initialized ({len(self.servos)} servos, {steps} LUT steps/°)")
+        if self.trajectory:
+            print("  Smooth motion enabled (velocity/acceleration limited)")
+        print(f"  Interference avoidance enabled ({len(self.constraints.constraints)} constraints)")
     
-    def _check_interference(self, channel, angle):
+    @staticmethod
+    def _build_lut(servo_cfg, pwm_frequency, steps):
         """
-        Check if servo angle would cause mechanical interference
+        Precompute 12-bit PCA9685 OFF counts for every angle step in range
         
-        Based on mechanical arm interference model:
-        - Servo 1 (ch 0) and Servo 2 (ch 1) have linkage interference
-        - Lower limit: S1 + S2 >= 145
-        - Upper limit: S1 + 6*S2 <= 630
+        Uses the same pulse-width math as adafruit_motor.servo, so whole-degree
+        entries are identical to what Servo.angle would have written.
         
         Args:
-            channel: Channel being set
-            angle: Proposed angle
+            servo_cfg: Servo config (min/max angle and pulse)
+            pwm_frequency: Actual PCA9685 output frequency in Hz
+            steps: Table entries per degree
             
         Returns:
-            bool: True if safe, False if interference detected
+            array: Unsigned 16-bit OFF counts, index = (angle - min_angle) * steps
+        """
+        min_duty = int((servo_cfg["min_pulse"] * pwm_frequency) / 1000000 * 0xFFFF)
+        max_duty = (servo_cfg["max_pulse"] * pwm_frequency) / 1000000 * 0xFFFF
+        duty_range = int(max_duty - min_duty)
+        
+        min_angle = servo_cfg["min_angle"]
+        count = (servo_cfg["max_angle"] - min_angle) * steps + 1
+        lut = array.array("H", bytes(2 * count))
+        for i in range(count):
+            angle = min_angle + i / steps
+            duty = min_duty + int(angle / _ACTUATION_RANGE * duty_range)
+            lut[i] = (duty + 1) >> 4
+        return lut
+    
+    @staticmethod
+    def _lookup(servo_data, angle):
+        """Get the 12-bit OFF count for an in-range angle"""
+        index = (angle - servo_data["min_angle"]) * servo_data["steps"]
+        if not isinstance(index, int):
+            index = int(index + 0.5)
+        return servo_data["lut"][index]
+    
+    def set_angle(self, channel, angle):
         """
-        # Only check interference for channels 0 and 1
-        if channel not in [0, 1]:
-            return True
+        Set servo angle with bounds checking and interference avoidance
+        
+        Angles that would cause mechanical interference are moved to the
+        nearest feasible angle (other joints held at their setpoints).
         
-        # Get angles for both servos
-        s1 = angle if channel == 0 else self.current_angles.get(0)
-        s2 = angle if channel == 1 else self.current_angles.get(1)
+        Args:
+            channel: Servo channel number (0-15)
+            angle: Target angle in degrees
+            
+        Returns:
+            float: Applied angle value, or None if channel not found or no
+                   feasible angle exists for the current pose
+        """
+        servo_data = self.servos_by_channel.get(channel)
+        if servo_data is None:
+            log.error("Channel %s not found", channel)
+            return None
         
-        # Need both angles to check
-        if s1 is None or s2 is None:
-            return True
+        # Clamp angle to configured range, then into the feasible interval
+        clamped = max(servo_data["min_angle"], min(servo_data["max_angle"], angle))
+        applied = self.constraints.clamp(channel, clamped, self.target_angles)
+        if applied is None:
+            log.error("Channel %s: no feasible angle for current pose", channel)
+            return None
         
-        # Check lower limit interference
-        if s1 + s2 < 145:
-            print(f"[WARNING] Interference: Servo1({s1:.0f}) + Servo2({s2:.0f}) = {s1+s2:.0f} < 145")
-            return False
+        self.target_angles[channel] = applied
+        if self.trajectory:
+            # Setpoint only - tick() moves the joint
+            self.trajectory.set_target({channel: applied})
+        else:
+            # Write duty from lookup table and update tracking
+            self._write_channel(channel, self._lookup(servo_data, applied))
+            self.current_angles[channel] = applied
         
-        # Check upper limit interference
-        if s1 + 6 * s2 > 630:
-            print(f"[WARNING] Interference: Servo1({s1:.0f}) + 6*Servo2({s2:.0f}) = {s1+6*s2:.0f} > 630")
-            return False
+        # Log angle changes (per command: debug level, skipped unless enabled)
+        if log.debug_enabled:
+            if applied != clamped:
+                log.debug("Channel %s: %.0f° moved to %.0f° (interference)", channel, angle, applied)
+            elif abs(angle - clamped) > 0.5:
+                log.debug("Channel %s: %.0f° clamped to %.0f°", channel, angle, clamped)
         
-        return True
+        return applied
     
-    def set_angle(self, channel, angle):
+    def set_angles(self, angles):
         """
-        Set servo angle with bounds checking and interference detection
+        Set several servo angles in one I2C transaction per contiguous channel run
+        
+        The whole target pose is projected onto the nearest interference-free
+        pose (moving only the requested joints), then all pulse widths are
+        computed and sent as a single auto-increment register burst, so the
+        joints start moving together.
         
         Args:
-            channel: Servo channel number (0-15)
-            angle: Target angle in degrees
+            angles: dict of channel -> target angle in degrees
             
         Returns:
-            float: Clamped angle value, or None if channel not found or interference
+            dict: channel -> applied angle, or None if channel not found or
+                  no feasible angle exists
         """
+        results = {}
+        requested = {}
+        
         for servo_data in self.servos:
-            if servo_data["config"]["channel"] == channel:
-                cfg = servo_data["config"]
-                
-                # Clamp angle to configured range
-                clamped = max(cfg["min_angle"], min(cfg["max_angle"], angle))
-                
-                # Check for mechanical interference
-                if not self._check_interference(channel, clamped):
-                    print(f"[ERROR] Channel {channel} angle {clamped:.0f}° blocked by interference")
-                    return None
-                
-                # Set angle and update tracking
-                servo_data["obj"].angle = clamped
-                self.current_angles[channel] = clamped
-                
-                # Log angle changes
-                if abs(angle - clamped) > 0.5:
-                    print(f"[INFO] Channel {channel}: {angle:.0f}° clamped to {clamped:.0f}°")
-                
-                return clamped
-        
-        print(f"[ERROR] Channel {channel} not found")
-        return None
+            channel = servo_data["config"]["channel"]
+            if channel not in angles:
+                continue
+            clamped = max(servo_data["min_angle"], min(servo_data["max_angle"], angles[channel]))
+            requested[channel] = clamped
+        
+        for channel in angles:
+            if channel not in self.servos_by_channel:
+                log.error("Channel %s not found", channel)
+                results[channel] = None
+        
+        projected = self.constraints.project(self.target_angles, requested)
+        
+        writes = []
+        setpoints = {}
+        for channel, applied in projected.items():
+            results[channel] = applied
+            if applied is None:
+                log.error("Channel %s: no feasible angle for current pose", channel)
+                continue
+            if applied != requested[channel] and log.debug_enabled:
+                log.debug("Channel %s: %.0f° moved to %.0f° (interference)", channel, requested[channel], applied)
+            setpoints[channel] = applied
+            if not self.trajectory:
+                writes.append((channel, self._lookup(self.servos_by_channel[channel], applied)))
+                self.current_angles[channel] = applied
+        
+        self.target_angles.update(setpoints)
+        if self.trajectory:
+            self.trajectory.set_target(setpoints)
+        else:
+            self._write_channels(writes)
+        return results
+    
+    def is_moving(self):
+        """Check if a smooth motion is in progress"""
+        return bool(self.trajectory) and self.trajectory.is_moving()
+    
+    def hold(self):
+        """
+        Stop a running smooth motion, braking within the acceleration limits
+
+        Returns:
+            dict: channel -> angle the joints come to rest at, or None if no
+                  joint was moving
+        """
+        if not self.is_moving():
+            return None
+        held = {}
+        for channel, angle in self.trajectory.stop().items():
+            # Report the pose tick() will write (LUT resolution)
+            steps = self.servos_by_channel[channel]["steps"]
+            angle = round(angle * steps)
+            held[channel] = angle if steps == 1 else angle / steps
+        self.target_angles.update(held)
+        return held
+
+    def tick(self):
+        """
+        Advance smooth motion and write changed joints in one burst
+        Should be called periodically from main loop (no-op without servo_motion)
+        """
+        now = time.monotonic_ns()
+        dt = (now - self._last_tick_ns) / 1_000_000_000
+        self._last_tick_ns = now
+        
+        if not self.trajectory or not self.trajectory.tick(min(dt, MAX_TICK_S)):
+            return
+        
+        writes = []
+        for servo_data in self.servos:
+            channel = servo_data["config"]["channel"]
+            steps = servo_data["steps"]
+            # Quantize to LUT resolution and skip joints that did not step
+            angle = round(self.trajectory.position[channel] * steps)
+            angle = angle if steps == 1 else angle / steps
+            if angle != self.current_angles[channel]:
+                writes.append((channel, self._lookup(servo_data, angle)))
+                self.current_angles[channel] = angle
+        self._write_channels(writes)
+    
+    def _write_channel(self, channel, off):
+        """
+        Write one channel's 12-bit OFF count (ON = 0) in a single transaction
+        
+        Args:
+            channel: PCA9685 channel
+            off: OFF count (0-4095)
+        """
+        buf = self._buf
+        buf[0] = _LED0_ON_L + 4 * channel
+        buf[1] = 0
+        buf[2] = 0
+        buf[3] = off & 0xFF
+        buf[4] = off >> 8
+        with self.pca.i2c_device as i2c:
+            i2c.write(buf, end=5)
+    
+    def _write_channels(self, writes):
+        """
+        Write 12-bit OFF counts to PCA9685 channels using register bursts
+        
+        Args:
+            writes: list of (channel, off_count) tuples
+        """
+        if not writes:
+            return
+        writes.sort()
+        
+        start = 0
+        while start < len(writes):
+            # Extend the run while channels are consecutive
+            end = start + 1
+            while end < len(writes) and writes[end][0] == writes[end - 1][0] + 1:
+                end += 1
+            
+            buf = self._buf
+            buf[0] = _LED0_ON_L + 4 * writes[start][0]
+            for i in range(start, end):
+                off = writes[i][1]
+                offset = 1 + 4 * (i - start)
+                # ON = 0, OFF = pulse end count
+                buf[offset] = 0
+                buf[offset + 1] = 0
+                buf[offset + 2] = off & 0xFF
+                buf[offset + 3] = off >> 8
+            
+            with self.pca.i2c_device as i2c:
+                i2c.write(buf, end=1 + 4 * (end - start))
+            start = end
     
     def get_servo_config(self, channel):
         """Get servo configuration by channel"""
@@ -131,16 +334,16 @@ class ServoController:
     
     def reset_all(self):
         """Reset all servos to initial angles"""
-        print("[INFO] Resetting all servos to initial positions")
+        log.info("Resetting all servos to initial positions")
+        targets = {}
         for servo_data in self.servos:
             cfg = servo_data["config"]
-            channel = cfg["channel"]
-            initial_angle = cfg.get("initial_angle", 90)
-            
-            # Use set_angle to ensure interference checking
-            result = self.set_angle(channel, initial_angle)
+            targets[cfg["channel"]] = cfg.get("initial_angle", 90)
+        
+        # One burst for all joints, projected onto a feasible pose as a whole
+        for channel, result in self.set_angles(targets).items():
             if result is None:
-                print(f"[WARNING] Failed to reset channel {channel}")
+                log.warning("Failed to reset channel %s", channel)
     
     def get_status(self):
         """Get current status of all servos"""
@@ -151,6 +354,7 @@ class ServoController:
             status.append({
                 "channel": channel,
                 "current_angle": self.current_angles.get(channel, 0),
+                "target_angle": self.target_angles.get(channel, 0),
                 "min_angle": cfg["min_angle"],
                 "max_angle": cfg["max_angle"]
             })
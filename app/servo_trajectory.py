@@ -0,0 +1,218 @@
+"""
+Servo trajectory generator for the mechanical arm.
+Moves all joints along a straight line in joint space toward the setpoint
+with velocity and acceleration limits, ticked at a fixed rate.
+"""
+
+
+class ServoTrajectory:
+    """Coordinated trapezoidal-velocity motion for a set of joints"""
+
+    def __init__(self, config, start_angles):
+        """
+        Initialize trajectory generator
+
+        Args:
+            config: Configuration dict ("servo_motion" limits, optional
+                    per-servo "max_velocity"/"max_acceleration" overrides)
+            start_angles: dict of channel -> current angle
+        """
+        motion_cfg = config.get("servo_motion", {})
+        default_velocity = motion_cfg.get("max_velocity", 120)
+        default_acceleration = motion_cfg.get("max_acceleration", 600)
+
+        self.max_velocity = {}
+        self.max_acceleration = {}
+        for servo in config["servos"]:
+            channel = servo["channel"]
+            self.max_velocity[channel] = servo.get("max_velocity", default_velocity)
+            self.max_acceleration[channel] = servo.get("max_acceleration", default_acceleration)
+
+        self.position = dict(start_angles)
+        self.target = dict(start_angles)
+        # Per-joint velocity in degrees/second over the last tick
+        self.velocity = {channel: 0.0 for channel in start_angles}
+
+        # Current segment: straight line from start to end, parameterised
+        # by progress along the leading (longest-travel) joint in degrees
+        self._start = dict(start_angles)
+        self._end = dict(start_angles)
+        self._length = 0.0
+        self._progress = 0.0
+        self._speed = 0.0
+        self._speed_limit = 0.0
+        self._accel_limit = 0.0
+        # Set by set_target(); tick() starts the segment toward target once
+        # every joint can switch to it within its acceleration limit
+        self._retarget = False
+
+    def set_target(self, targets):
+        """
+        Move toward new targets, starting with the next tick
+
+        Straight-line motion keeps every intermediate pose on the segment
+        between two feasible poses, so convex joint constraints hold throughout.
+
+        Args:
+            targets: dict of channel -> target angle (other joints keep theirs)
+        """
+        for channel, angle in targets.items():
+            if channel in self.target:
+                self.target[channel] = angle
+        self._retarget = True
+
+    def stop(self):
+        """
+        Brake to rest along the current segment
+
+        Returns:
+            dict: channel -> angle the joints come to rest at
+        """
+        if self._progress < self._length:
+            # Shorten the segment to the braking distance
+            braking = self._speed * self._speed / (2 * self._accel_limit)
+            length = min(self._length, self._progress + braking)
+            fraction = length / self._length
+            for channel, angle in self._end.items():
+                start = self._start[channel]
+                self._end[channel] = start + (angle - start) * fraction
+            self._length = length
+        self.target = dict(self._end)
+        self._retarget = False
+        return dict(self.target)
+
+    def is_moving(self):
+        """Check if a segment is in progress or a new target is pending"""
+        return self._retarget or self._progress < self._length
+
+    def _begin_segment(self, dt):
+        """
+        Start a segment from the current position toward the target
+
+        Every joint's current velocity is projected onto the new direction:
+        the starting path speed keeps each joint's velocity change within
+        max_acceleration * dt.
+
+        Args:
+            dt: Time step of the tick the segment starts on
+
+        Returns:
+            bool: False if no such speed exists (the joints must slow down first)
+        """
+        length = 0.0
+        for channel, angle in self.target.items():
+            delta = abs(angle - self.position[channel])
+            if delta > length:
+                length = delta
+
+        low = 0.0
+        high = None
+        speed_limit = None
+        accel_limit = None
+        for channel, angle in self.target.items():
+            velocity = self.velocity[channel]
+            step = self.max_acceleration[channel] * dt
+            delta = angle - self.position[channel]
+            if delta == 0:
+                if abs(velocity) > step:
+                    return False
+                continue
+            # Joint velocity on the new segment is speed * direction
+            direction = delta / length
+            lower = (velocity - step) / direction
+            upper = (velocity + step) / direction
+            if direction < 0:
+                lower, upper = upper, lower
+            low = max(low, lower)
+            high = upper if high is None else min(high, upper)
+
+            # Scale limits so no joint exceeds its own velocity/acceleration
+            scale = length / abs(delta)
+            v = self.max_velocity[channel] * scale
+            a = self.max_acceleration[channel] * scale
+            if speed_limit is None or v < speed_limit:
+                speed_limit = v
+            if accel_limit is None or a < accel_limit:
+                accel_limit = a
+
+        if length:
+            high = min(high, speed_limit, self._braking_speed(length, accel_limit, dt))
+            if low > high:
+                return False
+
+        self._start = dict(self.position)
+        self._end = dict(self.target)
+        self._length = length
+        self._progress = 0.0
+        self._speed = 0.0
+        if length:
+            self._speed = high
+            self._speed_limit = speed_limit
+            self._accel_limit = accel_limit
+        self._retarget = False
+        return True
+
+    @staticmethod
+    def _braking_speed(remaining, accel, dt):
+        """
+        Fastest speed from which slowing by accel * dt per tick stops exactly
+        at the end of the remaining distance
+
+        Args:
+            remaining: Distance left along the segment
+            accel: Path acceleration limit
+            dt: Time step in seconds
+
+        Returns:
+            float: Path speed for this tick
+        """
+        # Speeds (n + f), (n - 1 + f) ... f in units of accel * dt cover
+        # (n + 1) * (n / 2 + f) units of accel * dt * dt, with 0 < f <= 1
+        step = accel * dt
+        units = remaining / (step * dt)
+        n = int(((8 * units + 1) ** 0.5 - 1) / 2)
+        if n * (n + 1) / 2 >= units:
+            n -= 1
+        return (n + units / (n + 1) - n / 2) * step
+
+    def tick(self, dt):
+        """
+        Advance the trajectory by dt seconds
+
+        Args:
+            dt: Time step in seconds
+
+        Returns:
+            bool: True if positions changed
+        """
+        # The first step of a new segment runs at its starting speed
+        started = self._retarget and self._begin_segment(dt)
+        accel = self._accel_limit
+        if self._retarget:
+            # New direction opposes the motion: brake to rest along the
+            # current segment, then start the new one
+            self._speed = max(0.0, self._speed - accel * dt)
+        elif not started and self._progress < self._length:
+            remaining = self._length - self._progress
+            self._speed = min(self._speed + accel * dt, self._speed_limit,
+                              self._braking_speed(remaining, accel, dt))
+
+        if self._progress >= self._length:
+            for channel in self.velocity:
+                self.velocity[channel] = 0.0
+            return False
+
+        self._progress += self._speed * dt
+        # Tolerate rounding on the last braking step
+        done = self._progress >= self._length - 1e-9
+        if done:
+            self._progress = self._length
+            self._speed = 0.0
+
+        fraction = self._progress / self._length
+        for channel, angle in self._end.items():
+            start = self._start[channel]
+            previous = self.position[channel]
+            self.position[channel] = angle if done else start + (angle - start) * fraction
+            self.velocity[channel] = (self.position[channel] - previous) / dt
+        return True
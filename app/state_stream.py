@@ -0,0 +1,85 @@
+"""
+Push-based device state streaming for WebSocket subscribers.
+Sends a full snapshot on subscribe, then only the status sections that
+changed, at most at the subscribed rate.
+"""
+
+import clock
+
+
+class StateStream:
+    """Per-connection state subscription producing JSON delta messages"""
+
+    def __init__(self, config, device_state):
+        """
+        Initialize state stream
+
+        Args:
+            config: Configuration dict (optional "state_stream" section)
+            device_state: Shared device state object
+        """
+        stream_cfg = config.get("state_stream", {})
+        self.default_rate_hz = stream_cfg.get("default_rate_hz", 5)
+        self.max_rate_hz = stream_cfg.get("max_rate_hz", 20)
+        self.device_state = device_state
+
+        self.subscribed = False
+        self.rate_hz = self.default_rate_hz
+        self._interval_ms = 0
+        self._next_push_ms = 0
+        self._seq = 0
+        # DeviceState version already sent to this subscriber (-1 = nothing yet)
+        self._version = -1
+
+    def subscribe(self, rate_hz=None):
+        """
+        Start (or restart) the stream; the next push is a full snapshot
+
+        Args:
+            rate_hz: Maximum pushes per second (default from config)
+
+        Returns:
+            bool: False if rate_hz is out of range
+        """
+        rate_hz = self.default_rate_hz if rate_hz is None else rate_hz
+        if not (0 < rate_hz <= self.max_rate_hz):
+            return False
+        self.rate_hz = rate_hz
+        self._interval_ms = int(1000 / rate_hz)
+        self._next_push_ms = 0
+        self._version = -1
+        self.subscribed = True
+        return True
+
+    def unsubscribe(self):
+        """Stop pushing state"""
+        self.subscribed = False
+        self._version = -1
+
+    def poll(self):
+        """
+        Build the next delta message if one is due and anything changed
+
+        Returns:
+            str: JSON "state" message, or None
+        """
+        if not self.subscribed:
+            return None
+        now_ms = clock.now_ms()
+        if now_ms < self._next_push_ms:
+            return None
+
+        state = self.device_state
+        full = self._version < 0
+        version, changed = state.snapshot_since(self._version)
+        if changed is None:
+            return None
+        self._version = version
+        self._next_push_ms = now_ms + self._interval_ms
+
+        self._seq += 1
+        body = ",".join(f'"{name}":{state.section_json(name)}' for name in changed)
+        return (f'{{"action":"state","seq":{self._seq},"full":{"true" if full else "false"},'
+                f'"uptime_ms":{state.get_uptime()},'
+                f'"last_command_ms":{state.get_last_command_time()},'
+                f'"changes":{{{body}}}}}')
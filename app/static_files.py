@@ -0,0 +1,96 @@
+"""
+Static frontend serving for the Vite build in /static.
+Prefers the gzip copies written by tools/deploy.py (`<file>.gz`), marks
+content-hashed assets as immutable, and leaves the transfer to
+FileResponse, which streams from flash in fixed-size chunks.
+"""
+
+import os
+
+# Vite puts content-hashed bundles here; their names change with their content
+HASHED_PREFIX = "/assets/"
+
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE = "no-cache"
+
+MIME_TYPES = {
+    "html": "text/html",
+    "js": "application/javascript",
+    "css": "text/css",
+    "json": "application/json",
+    "svg": "image/svg+xml",
+    "png": "image/png",
+    "jpg": "image/jpeg",
+    "ico": "image/x-icon",
+    "txt": "text/plain",
+    "woff2": "font/woff2",
+}
+
+
+def _exists(path):
+    try:
+        os.stat(path)
+        return True
+    except OSError:
+        return False
+
+
+class StaticFiles:
+    """Resolve request paths to files, encodings and cache headers"""
+
+    def __init__(self, root="/static", chunk_size=1024):
+        """
+        Initialize static file resolver
+
+        Args:
+            root: Directory holding the frontend build
+            chunk_size: Bytes read from flash per send
+        """
+        self.root = root
+        self.chunk_size = chunk_size
+        # path -> (has plain file, has .gz file); flash contents only change on redeploy
+        self._variants = {}
+
+    def _lookup(self, path):
+        """Get which variants of a file exist (only found files are cached)"""
+        variants = self._variants.get(path)
+        if variants is None:
+            full = self.root + path
+            variants = (_exists(full), _exists(full + ".gz"))
+            if variants[0] or variants[1]:
+                self._variants[path] = variants
+        return variants
+
+    def resolve(self, path, accept_encoding=""):
+        """
+        Pick the file and headers to serve for a request path
+
+        Args:
+            path: Request path ("/" means /index.html)
+            accept_encoding: Client Accept-Encoding header
+
+        Returns:
+            tuple: (filename relative to root, content type, headers dict), or None if missing
+        """
+        if path == "/":
+            path = "/index.html"
+        if ".." in path:
+            return None
+
+        plain, gz = self._lookup(path)
+        # Deploy may store only the .gz copy; every browser accepts gzip
+        use_gz = gz and ("gzip" in accept_encoding or not plain)
+        if not (plain or use_gz):
+            return None
+
+        headers = {
+            "Cache-Control": CACHE_IMMUTABLE if path.startswith(HASHED_PREFIX) else CACHE_REVALIDATE
+        }
+        filename = path
+        if use_gz:
+            headers["Content-Encoding"] = "gzip"
+            headers["Vary"] = "Accept-Encoding"
+            filename = path + ".gz"
+
+        ext = path[path.rfind(".") + 1:]
+        return filename, MIME_TYPES.get(ext, "application/octet-stream"), headers
@@ -0,0 +1,95 @@
+"""
+Hashed timing wheel for Pico2W tracked arm car.
+Keeps a small set of keyed one-shot deadlines (e.g. per-actuator deadman
+timers) in fixed time slots, so rescheduling a timer and checking for
+expired ones cost O(1) per tick regardless of how many timers exist.
+"""
+
+import clock
+
+
+class TimerWheel:
+    """One-shot keyed timers bucketed into a ring of tick_ms slots"""
+
+    def __init__(self, tick_ms=20, slots=64):
+        """
+        Initialize timer wheel
+
+        Args:
+            tick_ms: Slot width (expiry resolution) in milliseconds
+            slots: Number of slots; deadlines further than tick_ms * slots
+                   ahead simply stay in their slot for extra turns
+        """
+        self.tick_ms = tick_ms
+        # Each slot maps key -> deadline in ms
+        self._slots = [{} for _ in range(slots)]
+        self._slot_of = {}
+        self._tick = clock.now_ms() // tick_ms
+
+    def schedule(self, key, delay_ms, now_ms=None):
+        """
+        Start or restart the timer for a key
+
+        Args:
+            key: Timer name
+            delay_ms: Time until expiry
+            now_ms: Current time (defaults to the monotonic clock)
+        """
+        if now_ms is None:
+            now_ms = clock.now_ms()
+        self.cancel(key)
+        deadline = now_ms + delay_ms
+        # First tick boundary at or after the deadline, never the current tick
+        tick = -(-deadline // self.tick_ms)
+        if tick <= self._tick:
+            tick = self._tick + 1
+        index = tick % len(self._slots)
+        self._slots[index][key] = deadline
+        self._slot_of[key] = index
+
+    def cancel(self, key):
+        """Stop the timer for a key if it is running"""
+        index = self._slot_of.pop(key, None)
+        if index is not None:
+            del self._slots[index][key]
+
+    def remaining(self, key, now_ms=None):
+        """Get milliseconds until a key expires, or None if it is not running"""
+        index = self._slot_of.get(key)
+        if index is None:
+            return None
+        if now_ms is None:
+            now_ms = clock.now_ms()
+        return max(0, self._slots[index][key] - now_ms)
+
+    def advance(self, now_ms=None):
+        """
+        Visit the slots of every tick elapsed since the last call
+
+        Args:
+            now_ms: Current time (defaults to the monotonic clock)
+
+        Returns:
+            list: (key, deadline_ms) of timers that expired, removed from the wheel
+        """
+        if now_ms is None:
+            now_ms = clock.now_ms()
+        target = now_ms // self.tick_ms
+        count = len(self._slots)
+        # After a long stall one full turn already visits every slot
+        if target - self._tick > count:
+            self._tick = target - count
+
+        expired = []
+        while self._tick < target:
+            self._tick += 1
+            slot = self._slots[self._tick % count]
+            if not slot:
+                continue
+            for key, deadline in list(slot.items()):
+                # Later turns of the wheel share the slot; leave them for then
+                if deadline <= now_ms:
+                    del slot[key]
+                    del self._slot_of[key]
+                    expired.append((key, deadline))
+        return expired
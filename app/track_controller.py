@@ -4,7 +4,10 @@ Provides high-level interface for differential steering.
 """
 
 import board
+import time
+from clock import MAX_TICK_S
 from motor_controller import TB6612Controller
+from track_ramp import TrackRamp
 
 
 class TrackController:
@@ -19,6 +22,13 @@ class TrackController:
         """
         track_cfg = config["motors"]["tracks"]
         
+        # Shared PWM settings with optional per-track overrides
+        pwm_cfg = track_cfg.get("pwm", {})
+        pwm_left = dict(pwm_cfg)
+        pwm_left.update(pwm_cfg.get("left", {}))
+        pwm_right = dict(pwm_cfg)
+        pwm_right.update(pwm_cfg.get("right", {}))
+        
         self.controller = TB6612Controller(
             pwma_pin=getattr(board, track_cfg["pwma_pin"]),
             ain1_pin=getattr(board, track_cfg["ain1_pin"]),
@@ -26,12 +36,23 @@ class TrackController:
             pwmb_pin=getattr(board, track_cfg["pwmb_pin"]),
             bin1_pin=getattr(board, track_cfg["bin1_pin"]),
             bin2_pin=getattr(board, track_cfg["bin2_pin"]),
-            stby_pin=getattr(board, track_cfg["stby_pin"])
+            stby_pin=getattr(board, track_cfg["stby_pin"]),
+            pwm_a=pwm_left,
+            pwm_b=pwm_right
         )
         
+        # Optional slew-rate limiting: set_speeds() becomes a target and tick() ramps to it
+        self.ramp = None
+        self._last_tick_ns = time.monotonic_ns()
+        ramp_cfg = track_cfg.get("ramp", {})
+        if ramp_cfg.get("enabled", False):
+            self.ramp = TrackRamp(ramp_cfg)
+        
         # Enable by default
         self.controller.enable()
         print("✓ Track controller initialized")
+        if self.ramp:
+            print(f"  Speed ramp enabled (accel {self.ramp.accel}%/s, decel {self.ramp.decel}%/s)")
     
     def set_speeds(self, left_speed, right_speed):
         """
@@ -41,16 +62,51 @@ class TrackController:
             left_speed: Left track speed (-100 to 100)
             right_speed: Right track speed (-100 to 100)
         """
-        self.controller.set_motors(left_speed, right_speed)
+        if self.ramp:
+            # Target only - tick() ramps the driver toward it
+            self.ramp.set_target(left_speed, right_speed)
+        else:
+            self.controller.set_motors(left_speed, right_speed)
     
-    def stop(self):
-        """Stop all track motors"""
+    def tick(self):
+        """
+        Advance the speed ramp and write changed outputs to the driver
+        Should be called periodically from main loop (no-op without ramp)
+        """
+        now = time.monotonic_ns()
+        dt = (now - self._last_tick_ns) / 1_000_000_000
+        self._last_tick_ns = now
+        
+        if not self.ramp or not self.ramp.tick(min(dt, MAX_TICK_S)):
+            return
+        
+        output = self.ramp.output
+        braking = self.ramp.braking
+        self.controller.set_motors(output[0], output[1], braking[0], braking[1])
+    
+    def stop(self, immediate=False):
+        """
+        Stop all track motors
+        
+        Args:
+            immediate: Cut the outputs now instead of decelerating (shutdown)
+        """
+        if self.ramp and not immediate:
+            self.ramp.set_target(0, 0)
+            return
+        if self.ramp:
+            self.ramp.reset()
         self.controller.stop()
     
     def get_status(self):
         """Get current track status"""
-        return self.controller.get_status()
+        status = self.controller.get_status()
+        if self.ramp:
+            status["ramp"] = self.ramp.get_status()
+        return status
     
     def deinit(self):
         """Cleanup resources"""
+        if self.ramp:
+            self.ramp.reset()
         self.controller.deinit()
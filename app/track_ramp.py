@@ -0,0 +1,118 @@
+"""
+Slew-rate limiter for the track motors.
+Sits between TrackController.set_speeds and the TB6612 driver, limiting how
+fast each track's speed may change and braking briefly before reversing.
+"""
+
+
+class TrackRamp:
+    """Per-track acceleration/deceleration limiter with brake-before-reverse"""
+
+    def __init__(self, ramp_cfg):
+        """
+        Initialize ramp
+
+        Args:
+            ramp_cfg: "motors.tracks.ramp" config dict
+                      (accel/decel in %/s, brake_ms before reversing)
+        """
+        self.accel = ramp_cfg.get("accel", 400)
+        self.decel = ramp_cfg.get("decel", 800)
+        self.brake_s = ramp_cfg.get("brake_ms", 50) / 1000
+
+        # Index 0 = left track, 1 = right track
+        self.target = [0, 0]
+        self._speed = [0.0, 0.0]
+        self._brake_left = [0.0, 0.0]
+        self.output = [0, 0]
+        self.braking = [False, False]
+
+    def set_target(self, left_speed, right_speed):
+        """
+        Set the speeds the tracks should ramp toward
+
+        Args:
+            left_speed: Left track speed (-100 to 100)
+            right_speed: Right track speed (-100 to 100)
+        """
+        self.target[0] = max(-100, min(100, left_speed))
+        self.target[1] = max(-100, min(100, right_speed))
+
+    def reset(self):
+        """Drop all ramp state (tracks already stopped by the caller)"""
+        self.target = [0, 0]
+        self._speed = [0.0, 0.0]
+        self._brake_left = [0.0, 0.0]
+        self.output = [0, 0]
+        self.braking = [False, False]
+
+    def is_settled(self):
+        """Check if both tracks have reached their targets"""
+        return self.output == self.target and not (self.braking[0] or self.braking[1])
+
+    def tick(self, dt):
+        """
+        Advance both tracks by dt seconds
+
+        Args:
+            dt: Time step in seconds
+
+        Returns:
+            bool: True if output speeds or brake states changed
+        """
+        changed = False
+        for i in (0, 1):
+            if self._step(i, dt):
+                changed = True
+        return changed
+
+    def _step(self, i, dt):
+        """Advance one track; returns True if its output changed"""
+        target = self.target[i]
+        speed = self._speed[i]
+
+        if self.braking[i]:
+            self._brake_left[i] -= dt
+            if self._brake_left[i] > 0:
+                return False
+            self.braking[i] = False
+            self.output[i] = 0
+            return True
+
+        if speed != 0 and (speed > 0) != (target > 0) and target != 0:
+            # Reversing: decelerate to zero first, then brake
+            step = self.decel * dt
+            if abs(speed) <= step:
+                speed = 0.0
+                if self.brake_s > 0:
+                    self.braking[i] = True
+                    self._brake_left[i] = self.brake_s
+            else:
+                speed -= step if speed > 0 else -step
+        elif abs(target) > abs(speed):
+            step = self.accel * dt
+            if abs(target - speed) <= step:
+                speed = target
+            else:
+                speed += step if target > speed else -step
+        else:
+            step = self.decel * dt
+            if abs(target - speed) <= step:
+                speed = target
+            else:
+                speed += step if target > speed else -step
+
+        self._speed[i] = speed
+        output = int(round(speed))
+        if output == self.output[i] and not self.braking[i]:
+            return False
+        self.output[i] = output
+        return True
+
+    def get_status(self):
+        """Get ramp state"""
+        return {
+            "target": list(self.target),
+            "output": list(self.output),
+            "braking": list(self.braking)
+        }
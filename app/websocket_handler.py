@@ -4,16 +4,129 @@ Processes real-time control commands for tracks, servos, and base rotation.
 """
 
 import json
+import clock
+import binary_protocol as bp
+from state_stream import StateStream
+from control_lease import ControlLease
+from logger import log
 from base_rotation_controller import BaseRotationController
 from servo_controller import ServoController
 from track_controller import TrackController
-import time
+
+# Track shorthand command -> (left sign, right sign)
+TRACK_COMMANDS = {
+    "forward": (1, 1),
+    "backward": (-1, -1),
+    "left": (-1, 1),
+    "right": (1, -1),
+    "stop": (0, 0)
+}
+
+# Streamed actions whose OK response can be suppressed in no-ack mode
+CONTINUOUS_ACTIONS = ("track", "servo", "servo_batch", "base")
+CONTINUOUS_OPCODES = (bp.OP_TRACK, bp.OP_SERVO, bp.OP_SERVO_BATCH, bp.OP_BASE)
+
+# Actions that move actuators - only the control lease holder may send them
+CONTROL_ACTIONS = CONTINUOUS_ACTIONS + ("servo_reset", "base_goto", "base_zero")
+CONTROL_OPCODES = CONTINUOUS_OPCODES + (bp.OP_SERVO_RESET,)
+
+# Valid base rotation directions
+BASE_DIRECTIONS = ("cw", "ccw", "stop")
+
+# Speed used when a shorthand command names an unknown preset
+DEFAULT_TRACK_SPEED = 60
+
+def _is_number(value):
+    """Check for a JSON number (bool is an int subclass but not a number here)"""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# Width of the space-padded timestamp field in preallocated acknowledgments
+TIMESTAMP_DIGITS = 10
+
+# Header of a short unmasked server text frame (payload under 126 bytes)
+WS_FIN_TEXT = 0x81
+WS_HEADER_SIZE = 2
+
+
+class AckBuffer:
+    """Preallocated OK acknowledgment for one action, rendered in place"""
+    
+    def __init__(self, action):
+        """
+        Args:
+            action: Action name the acknowledgment is for
+        """
+        head = '{"status":"ok","action":"%s","timestamp":' % action
+        # Reused response dict (same keys as _success_response) and its JSON text
+        self.response = {"status": "ok", "action": action, "timestamp": 0}
+        text = (head + " " * TIMESTAMP_DIGITS + "}").encode()
+        # Complete WebSocket text frame: FIN + TEXT opcode, 7-bit payload length
+        self.buffer = bytearray(bytes((WS_FIN_TEXT, len(text)))) + text
+        self._start = WS_HEADER_SIZE + len(head)
+    
+    def render(self):
+        """
+        Write response["timestamp"] into the buffer (right-aligned, space padded)
+        
+        Returns:
+            bytearray: Complete text frame (valid until the next render)
+        """
+        value = self.response["timestamp"]
+        buf = self.buffer
+        i = self._start + TIMESTAMP_DIGITS
+        while i > self._start:
+            i -= 1
+            buf[i] = 48 + value % 10
+            value //= 10
+            if not value:
+                break
+        while i > self._start:
+            i -= 1
+            buf[i] = 32
+        return buf
+
+
+def send_frame(websocket, frame):
+    """
+    Write a complete, already framed message to a WebSocket
+    
+    Websocket.send_message() would encode and frame the payload again (and
+    only accepts str for text frames), so pre-framed acknowledgments go to
+    the connection directly through the same _send_bytes() it uses.
+    
+    Args:
+        websocket: adafruit_httpserver Websocket
+        frame: Frame bytes (header + payload)
+    """
+    if websocket.closed:
+        raise RuntimeError("Websocket connection is closed, cannot send message")
+    websocket._send_bytes(websocket._request.connection, frame)
+
+
+class WebSocketSession:
+    """Per-connection protocol state"""
+    
+    def __init__(self, session_id, websocket, state_stream):
+        """
+        Args:
+            session_id: Small integer identifying the client in logs and lease status
+            websocket: Connection object (None when driven directly, e.g. benchmarks)
+            state_stream: This connection's StateStream
+        """
+        self.id = session_id
+        self.websocket = websocket
+        self.binary_enabled = False
+        self.ack_enabled = True
+        self.state_stream = state_stream
+        # Last time anything arrived (half-open sockets never raise on send)
+        self.last_receive_ms = clock.now_ms()
 
 
 class WebSocketHandler:
     """Handle WebSocket messages and dispatch commands to controllers"""
     
-    def __init__(self, config, device_state, servo_controller: ServoController, track_controller: TrackController, base_controller: BaseRotationController):
+    def __init__(self, config, device_state, servo_controller: ServoController, track_controller: TrackController, base_controller: BaseRotationController, safety=None, profiler=None):
         """
         Initialize WebSocket handler
         
@@ -23,66 +136,437 @@ class WebSocketHandler:
             servo_controller: Servo controller instance
             track_controller: Track controller instance
             base_controller: Base rotation controller instance
+            safety: SafetyWatchdog whose deadman timers each command refreshes
+            profiler: Optional LoopProfiler served by the "metrics" action
         """
         self.config = config
         self.device_state = device_state
         self.servo_controller = servo_controller
         self.track_controller = track_controller
         self.base_controller = base_controller
+        self.safety = safety
+        self.profiler = profiler
         self.speed_presets = config.get("speed_presets", {
             "slow": 30,
             "medium": 60,
             "fast": 100
         })
+        self._state_changed = False
+        
+        # Connected clients; one of them may hold the control lease
+        server_cfg = config.get("server", {})
+        self.max_clients = server_cfg.get("max_clients", 4)
+        # Silence after which a session is dropped (clients ping every 25s)
+        self.client_timeout_ms = server_cfg.get("client_timeout_ms", 60000)
+        self.lease = ControlLease(server_cfg.get("lease_timeout_ms", 5000))
+        self.sessions = []
+        self._next_session_id = 1
+        # Session of the message being handled
+        self._session = None
+        
+        # Validation tables, precomputed once (config is immutable after boot)
+        self._servo_limits = {}
+        self._batch_limits = []
+        self._reset_angles = {}
+        for servo in config.get("servos", []):
+            limits = (servo["min_angle"], servo["max_angle"])
+            self._servo_limits[servo["channel"]] = limits
+            self._batch_limits.append((servo["channel"],) + limits)
+            self._reset_angles[servo["channel"]] = servo.get("initial_angle", 90)
+        self._track_table = self._build_track_table()
+        
+        # Preallocated acknowledgments for streamed commands (memory.gc_mode
+        # "scheduled"): no response dict or JSON string per message
+        self._acks = {}
+        if config.get("memory", {}).get("gc_mode", "auto") == "scheduled":
+            for action in CONTINUOUS_ACTIONS:
+                self._acks[action] = AckBuffer(action)
+        
+        # Action dispatch tables - new actions only add an entry here
+        self._handlers = {
+            "ping": self._handle_ping,
+            "track": self._handle_track,
+            "servo": self._handle_servo,
+            "servo_batch": self._handle_servo_batch,
+            "servo_reset": self._handle_servo_reset,
+            "base": self._handle_base,
+            "base_goto": self._handle_base_goto,
+            "base_zero": self._handle_base_zero,
+            "subscribe": self._handle_subscribe,
+            "lease": self._handle_lease,
+            "metrics": self._handle_metrics,
+            "hello": self._handle_hello
+        }
+        self._binary_handlers = {
+            bp.OP_TRACK: self._binary_track,
+            bp.OP_SERVO: self._binary_servo,
+            bp.OP_SERVO_BATCH: self._binary_servo_batch,
+            bp.OP_BASE: self._binary_base,
+            bp.OP_PING: self._binary_ping,
+            bp.OP_SERVO_RESET: self._binary_servo_reset
+        }
     
-    def handle_message(self, message_str):
+    def _build_track_table(self):
+        """Build (command, preset name) -> (left, right) speed table"""
+        table = {}
+        for command, (left_sign, right_sign) in TRACK_COMMANDS.items():
+            for preset, speed in self.speed_presets.items():
+                table[(command, preset)] = (left_sign * speed, right_sign * speed)
+            table[(command, None)] = (left_sign * DEFAULT_TRACK_SPEED, right_sign * DEFAULT_TRACK_SPEED)
+        return table
+    
+    def open_session(self, websocket):
+        """
+        Register a new connection
+        
+        Args:
+            websocket: Connection object
+            
+        Returns:
+            WebSocketSession: New session, or None if max_clients are connected
+        """
+        if len(self.sessions) >= self.max_clients:
+            return None
+        session = WebSocketSession(self._next_session_id, websocket,
+                                   StateStream(self.config, self.device_state))
+        self._next_session_id += 1
+        self.sessions.append(session)
+        return session
+    
+    def close_session(self, session):
+        """Forget a connection and give up its control lease"""
+        if session in self.sessions:
+            self.sessions.remove(session)
+        session.state_stream.unsubscribe()
+        self.lease.release(session)
+        if self.safety:
+            self.safety.release(session)
+    
+    def stale_sessions(self):
+        """Get the sessions that sent nothing for client_timeout_ms"""
+        now_ms = clock.now_ms()
+        return [session for session in self.sessions
+                if now_ms - session.last_receive_ms >= self.client_timeout_ms]
+    
+    def controller_session(self):
+        """Get the connected session holding the control lease, or None"""
+        holder = self.lease.holder
+        if holder is not None and self.lease.is_held_by(holder):
+            return holder
+        return None
+    
+    def _authorize(self, session, is_control):
+        """
+        Apply the control lease to one incoming message
+        
+        Control commands take a free lease; any message from the holder
+        renews it. Only control commands count as command activity (the
+        actuator deadman timers are refreshed where commands are applied).
+        
+        Returns:
+            bool: False if a control command came from an observer
+        """
+        if is_control:
+            if not self.lease.acquire(session):
+                return False
+            self.device_state.update_last_command()
+        else:
+            self.lease.renew(session)
+        return True
+    
+    def handle_message(self, session, message_str):
         """
         Process incoming WebSocket message
         
         Args:
+            session: Sending connection's WebSocketSession
             message_str: JSON string message
             
         Returns:
-            dict: Response message to send back
+            dict: Response message to send back, or None when a successful
+                  streamed command is not acknowledged (no-ack mode)
         """
         try:
             message = json.loads(message_str)
             action = message.get("action")
             
-            print(f"[INFO] WebSocket command: {action}")
-            
-            # Update last command timestamp
-            self.device_state.update_last_command()
+            # Per-message: debug level, skipped without formatting unless enabled
+            if log.debug_enabled:
+                log.debug("WebSocket command: %s", action)
             
             # Dispatch based on action
-            if action == "ping":
-                return self._handle_ping()
-            elif action == "track":
-                return self._handle_track(message)
-            elif action == "servo":
-                return self._handle_servo(message)
-            elif action == "servo_batch":
-                return self._handle_servo_batch(message)
-            elif action == "servo_reset":
-                return self._handle_servo_reset()
-            elif action == "base":
-                return self._handle_base(message)
-            else:
-                print(f"[WARNING] Unknown action: {action}")
+            handler = self._handlers.get(action)
+            if handler is None:
+                log.warning("Unknown action: %s", action)
                 return self._error_response(action, "invalid_action", f"Unknown action: {action}")
+            
+            if not self._authorize(session, action in CONTROL_ACTIONS):
+                return self._not_controller_response(action, session)
+            
+            self._session = session
+            self._state_changed = False
+            response = handler(message)
+            
+            # No-ack mode: only errors, clamps and state changes are reported
+            if (action in CONTINUOUS_ACTIONS
+                    and not message.get("ack", session.ack_enabled)
+                    and not self._state_changed
+                    and response["status"] == "ok"
+                    and "clamped_value" not in response
+                    and "clamped_values" not in response):
+                return None
+            return response
         
         except json.JSONDecodeError as e:
-            print(f"[ERROR] JSON decode failed: {e}")
+            log.error("JSON decode failed: %s", e)
             return self._error_response(None, "invalid_json", str(e))
         except Exception as e:
-            print(f"[ERROR] handle_message exception: {e}")
+            log.error("handle_message exception: %s", e)
             return self._error_response(None, "internal_error", str(e))
     
-    def _handle_ping(self):
+    def encode_response(self, response):
+        """
+        Serialize a handle_message() response for sending as a text frame
+        
+        Returns:
+            str or bytearray: JSON text for send_message(), or a preallocated
+                              acknowledgment rendered in place as a complete
+                              text frame (write it with send_frame())
+        """
+        ack = self._acks.get(response.get("action"))
+        if ack is not None and response is ack.response:
+            return ack.render()
+        return json.dumps(response)
+    
+    def handle_binary(self, session, frame):
+        """
+        Process incoming binary WebSocket frame
+        
+        Args:
+            session: Sending connection's WebSocketSession
+            frame: bytes frame in binary_protocol layout
+            
+        Returns:
+            bytes: Response frame to send back, or None when suppressed
+                   by no-ack mode
+        """
+        if not frame:
+            return bp.error_frame(0, "invalid_format")
+        
+        opcode = frame[0] & ~bp.NOACK_FLAG
+        ack = session.ack_enabled and not (frame[0] & bp.NOACK_FLAG)
+        try:
+            if not session.binary_enabled:
+                return bp.error_frame(opcode, "not_negotiated")
+            
+            handler = self._binary_handlers.get(opcode)
+            if handler is None:
+                log.warning("Unknown binary opcode: 0x%02x", opcode)
+                return bp.error_frame(opcode, "invalid_action")
+            
+            # Per-frame: debug level, skipped without formatting unless enabled
+            if log.debug_enabled:
+                log.debug("WebSocket binary command: %s", bp.ACTION_NAMES[opcode])
+            expected_length = bp.FRAME_LENGTHS[opcode]
+            if expected_length is not None and len(frame) != expected_length:
+                return bp.error_frame(opcode, "invalid_format")
+            
+            if not self._authorize(session, opcode in CONTROL_OPCODES):
+                return bp.error_frame(opcode, "not_controller")
+            
+            self._session = session
+            self._state_changed = False
+            response = handler(frame)
+            
+            # No-ack mode: only errors, clamps and state changes are reported
+            if (not ack
+                    and opcode in CONTINUOUS_OPCODES
+                    and not self._state_changed
+                    and response[1] == bp.STATUS_OK):
+                return None
+            return response
+        
+        except Exception as e:
+            log.error("handle_binary %s exception: %s", bp.ACTION_NAMES.get(opcode, "frame"), e)
+            return bp.error_frame(opcode, "execution_error")
+    
+    def _binary_track(self, frame):
+        """Handle binary track frame"""
+        left = bp.int8(frame[1])
+        right = bp.int8(frame[2])
+        if not (-100 <= left <= 100) or not (-100 <= right <= 100):
+            return bp.error_frame(bp.OP_TRACK, "speed_out_of_range")
+        self._apply_track(left, right)
+        return bp.ok_frame(bp.OP_TRACK)
+    
+    def _binary_servo(self, frame):
+        """Handle binary single servo frame"""
+        channel = frame[1]
+        angle = frame[2]
+        limits = self._servo_limits.get(channel)
+        if limits is None:
+            return bp.error_frame(bp.OP_SERVO, "channel_not_found")
+        applied = self._apply_servo(channel, max(limits[0], min(limits[1], angle)))
+        if applied is None:
+            return bp.error_frame(bp.OP_SERVO, "no_feasible_angle")
+        if applied != angle:
+            return bp.clamped_frame(bp.OP_SERVO, applied)
+        return bp.ok_frame(bp.OP_SERVO)
+    
+    def _binary_servo_batch(self, frame):
+        """Handle binary batch servo frame"""
+        if len(frame) - 1 != len(self._batch_limits):
+            return bp.error_frame(bp.OP_SERVO_BATCH, "length_mismatch")
+        angles = {}
+        for i, (channel, min_angle, max_angle) in enumerate(self._batch_limits):
+            angles[channel] = max(min_angle, min(max_angle, frame[i + 1]))
+        results = self._apply_servos(angles)
+        applied = [results.get(channel) for channel, _, _ in self._batch_limits]
+        if None in applied:
+            return bp.error_frame(bp.OP_SERVO_BATCH, "no_feasible_angle")
+        for i, angle in enumerate(applied):
+            if angle != frame[i + 1]:
+                return bp.clamped_batch_frame(bp.OP_SERVO_BATCH, applied)
+        return bp.ok_frame(bp.OP_SERVO_BATCH)
+    
+    def _binary_base(self, frame):
+        """Handle binary base rotation frame"""
+        direction = bp.BASE_DIRECTIONS.get(frame[1])
+        speed = frame[2]
+        if direction is None:
+            return bp.error_frame(bp.OP_BASE, "invalid_direction")
+        if speed > 100:
+            return bp.error_frame(bp.OP_BASE, "speed_out_of_range")
+        self._apply_base(direction, speed)
+        return bp.ok_frame(bp.OP_BASE)
+    
+    def _binary_ping(self, frame):
+        """Handle binary ping frame"""
+        return bp.pong_frame(clock.now_ms())
+    
+    def _binary_servo_reset(self, frame):
+        """Handle binary servo reset frame"""
+        self._apply_servo_reset()
+        return bp.ok_frame(bp.OP_SERVO_RESET)
+    
+    def _handle_hello(self, message):
+        """Negotiate the protocol for this connection"""
+        session = self._session
+        protocol = message.get("protocol", "json")
+        session.binary_enabled = (protocol == bp.PROTOCOL_NAME)
+        session.ack_enabled = bool(message.get("ack", True))
+        return {
+            "status": "ok",
+            "action": "hello",
+            "protocol": bp.PROTOCOL_NAME if session.binary_enabled else "json",
+            "version": bp.PROTOCOL_VERSION,
+            "ack": session.ack_enabled,
+            "client_id": session.id,
+            "lease": self.lease.get_status(session),
+            "timestamp": clock.now_ms()
+        }
+    
+    def _handle_subscribe(self, message):
+        """Start or stop pushed state deltas for this connection"""
+        state_stream = self._session.state_stream
+        if not message.get("enabled", True):
+            state_stream.unsubscribe()
+            response = self._success_response("subscribe")
+            response["enabled"] = False
+            return response
+        
+        if not state_stream.subscribe(message.get("rate_hz")):
+            return self._error_response("subscribe", "rate_out_of_range",
+                                       f"rate_hz must be between 0 and {state_stream.max_rate_hz}")
+        response = self._success_response("subscribe")
+        response["enabled"] = True
+        response["rate_hz"] = state_stream.rate_hz
+        return response
+    
+    def _handle_lease(self, message):
+        """Request or release the control lease"""
+        session = self._session
+        if message.get("release", False):
+            self.lease.release(session)
+        elif not self.lease.acquire(session):
+            return self._not_controller_response("lease", session)
+        response = self._success_response("lease")
+        response.update(self.lease.get_status(session))
+        return response
+    
+    def _handle_metrics(self, message):
+        """Switch the main-loop profiler and return its histograms"""
+        if self.profiler is None:
+            return self._error_response("metrics", "profiler_disabled", "Profiler not available")
+        if "enabled" in message:
+            self.profiler.set_enabled(message["enabled"])
+        if message.get("reset", False):
+            self.profiler.reset()
+        response = self._success_response("metrics")
+        response["metrics"] = self.profiler.get_metrics()
+        return response
+    
+    def _refresh_deadman(self, group):
+        """Restart the deadman timer of the actuator group a command drives"""
+        if self.safety:
+            self.safety.refresh(group, self._session)
+    
+    def _apply_track(self, left, right):
+        """Send validated track speeds to the controller"""
+        self._refresh_deadman("tracks")
+        if self.track_controller:
+            self.track_controller.set_speeds(left, right)
+            if self.device_state.update_track_state(left, right):
+                self._state_changed = True
+    
+    def _apply_servo(self, channel, angle):
+        """
+        Send a range-clamped servo angle to the controller
+        
+        Returns:
+            Angle actually applied (moved off interference), or None if infeasible
+        """
+        self._refresh_deadman("arm")
+        if not self.servo_controller:
+            return angle
+        applied = self.servo_controller.set_angle(channel, angle)
+        if applied is not None and self.device_state.update_servo_state(channel, applied):
+            self._state_changed = True
+        return applied
+    
+    def _apply_servos(self, angles):
+        """
+        Send several range-clamped servo angles as one bulk update
+        
+        Returns:
+            dict: channel -> applied angle (None if infeasible)
+        """
+        self._refresh_deadman("arm")
+        if not self.servo_controller:
+            return angles
+        results = self.servo_controller.set_angles(angles)
+        for channel, applied in results.items():
+            if applied is not None and self.device_state.update_servo_state(channel, applied):
+                self._state_changed = True
+        return results
+    
+    def _apply_servo_reset(self):
+        """Move all servos to their initial angles"""
+        self._apply_servos(self._reset_angles)
+    
+    def _apply_base(self, direction, speed):
+        """Send a validated base rotation command to the controller"""
+        self._refresh_deadman("base")
+        if self.base_controller:
+            self.base_controller.set_direction(direction, speed)
+            if self.device_state.update_base_rotation_state(direction, speed):
+                self._state_changed = True
+    
+    def _handle_ping(self, message):
         """Handle ping heartbeat"""
         return {
             "status": "pong",
-            "timestamp": int(time.monotonic() * 1000)
+            "timestamp": clock.now_ms()
         }
     
     def _handle_track(self, message):
@@ -91,21 +575,12 @@ class WebSocketHandler:
             # Check for shorthand command
             if "command" in message:
                 command = message["command"]
-                speed_name = message.get("speed", "medium")
-                speed = self.speed_presets.get(speed_name, 60)
-                
-                if command == "forward":
-                    left, right = speed, speed
-                elif command == "backward":
-                    left, right = -speed, -speed
-                elif command == "left":
-                    left, right = -speed, speed
-                elif command == "right":
-                    left, right = speed, -speed
-                elif command == "stop":
-                    left, right = 0, 0
-                else:
-                    return self._error_response("track", "invalid_command", f"Unknown command: {command}")
+                speeds = self._track_table.get((command, message.get("speed", "medium")))
+                if speeds is None:
+                    speeds = self._track_table.get((command, None))
+                    if speeds is None:
+                        return self._error_response("track", "invalid_command", f"Unknown command: {command}")
+                left, right = speeds
             else:
                 # Direct speed control
                 left = message.get("left", 0)
@@ -116,11 +591,9 @@ class WebSocketHandler:
                 return self._error_response("track", "speed_out_of_range", "Speed must be between -100 and 100")
             
             # Send to track controller
-            if self.track_controller:
-                self.track_controller.set_speeds(left, right)
-                self.device_state.update_track_state(left, right)
+            self._apply_track(left, right)
             
-            return self._success_response("track")
+            return self._ack_response("track")
             
         except Exception as e:
             return self._error_response("track", "execution_error", str(e))
@@ -134,28 +607,27 @@ class WebSocketHandler:
             if channel is None or angle is None:
                 return self._error_response("servo", "missing_parameters", "channel and angle are required")
             
-            # Get servo config for validation
-            servo_config = self._get_servo_config(channel)
-            if not servo_config:
+            # Get precomputed limits for validation
+            limits = self._servo_limits.get(channel)
+            if limits is None:
                 return self._error_response("servo", "channel_not_found", f"Servo channel {channel} not configured")
             
             # Clamp angle to configured range
-            min_angle = servo_config["min_angle"]
-            max_angle = servo_config["max_angle"]
+            min_angle, max_angle = limits
             original_angle = angle
             angle = max(min_angle, min(max_angle, angle))
             
-            # Send to servo controller
-            if self.servo_controller:
-                clamped = self.servo_controller.set_angle(channel, angle)
-                if clamped is not None:
-                    self.device_state.update_servo_state(channel, clamped)
+            # Send to servo controller (may move the angle off interference)
+            applied = self._apply_servo(channel, angle)
+            if applied is None:
+                return self._error_response("servo", "no_feasible_angle",
+                                           f"No interference-free angle for channel {channel}")
             
+            if original_angle == applied:
+                return self._ack_response("servo")
             response = self._success_response("servo")
-            if original_angle != angle:
-                response["clamped_value"] = angle
-                response["message"] = f"Angle clamped from {original_angle} to {angle}"
-            
+            response["clamped_value"] = applied
+            response["message"] = f"Angle clamped from {original_angle} to {applied}"
             return response
             
         except Exception as e:
@@ -169,43 +641,31 @@ class WebSocketHandler:
             if not isinstance(angles, list):
                 return self._error_response("servo_batch", "invalid_format", "angles must be a list")
             
-            servos = self.config.get("servos", [])
-            if len(angles) != len(servos):
+            if len(angles) != len(self._batch_limits):
                 return self._error_response("servo_batch", "length_mismatch", 
-                                           f"Expected {len(servos)} angles, got {len(angles)}")
-            
-            # Update all servos
-            for i, angle in enumerate(angles):
-                servo_config = servos[i]
-                channel = servo_config["channel"]
-                
-                # Clamp angle
-                clamped_angle = max(servo_config["min_angle"], min(servo_config["max_angle"], angle))
-                
-                if self.servo_controller:
-                    clamped = self.servo_controller.set_angle(channel, clamped_angle)
-                    if clamped is not None:
-                        self.device_state.update_servo_state(channel, clamped)
-            
-            return self._success_response("servo_batch")
+                                           f"Expected {len(self._batch_limits)} angles, got {len(angles)}")
+            
+            # Update all servos in one bulk write
+            targets = {}
+            for i, (channel, min_angle, max_angle) in enumerate(self._batch_limits):
+                targets[channel] = max(min_angle, min(max_angle, angles[i]))
+            results = self._apply_servos(targets)
+            
+            applied = [results.get(channel) for channel, _, _ in self._batch_limits]
+            if applied == angles:
+                return self._ack_response("servo_batch")
+            response = self._success_response("servo_batch")
+            # Angles actually used, in request order (None = kept previous)
+            response["clamped_values"] = applied
+            return response
             
         except Exception as e:
             return self._error_response("servo_batch", "execution_error", str(e))
     
-    def _handle_servo_reset(self):
+    def _handle_servo_reset(self, message):
         """Reset all servos to initial angles"""
         try:
-            servos = self.config.get("servos", [])
-            
-            for servo_config in servos:
-                channel = servo_config["channel"]
-                initial_angle = servo_config.get("initial_angle", 90)
-                
-                if self.servo_controller:
-                    clamped = self.servo_controller.set_angle(channel, initial_angle)
-                    if clamped is not None:
-                        self.device_state.update_servo_state(channel, clamped)
-            
+            self._apply_servo_reset()
             return self._success_response("servo_reset")
             
         except Exception as e:
@@ -217,7 +677,7 @@ class WebSocketHandler:
             direction = message.get("direction", "stop")
             speed = message.get("speed", 100)
             
-            if direction not in ["cw", "ccw", "stop"]:
+            if direction not in BASE_DIRECTIONS:
                 return self._error_response("base", "invalid_direction", 
                                            f"Direction must be 'cw', 'ccw', or 'stop', got '{direction}'")
             
@@ -225,31 +685,93 @@ class WebSocketHandler:
                 return self._error_response("base", "speed_out_of_range", "Speed must be between 0 and 100")
             
             # Send to base rotation controller
-            if self.base_controller:
-                self.base_controller.set_direction(direction, speed)
-                self.device_state.update_base_rotation_state(direction, speed)
+            self._apply_base(direction, speed)
             
-            return self._success_response("base")
+            return self._ack_response("base")
             
         except Exception as e:
             return self._error_response("base", "execution_error", str(e))
     
-    def _get_servo_config(self, channel):
-        """Get servo configuration by channel"""
-        servos = self.config.get("servos", [])
-        for servo in servos:
-            if servo["channel"] == channel:
-                return servo
-        return None
+    def _handle_base_goto(self, message):
+        """Handle closed-loop base rotation to a heading"""
+        try:
+            angle = message.get("angle")
+            speed = message.get("speed")
+            
+            if angle is None:
+                return self._error_response("base_goto", "missing_parameters", "angle is required")
+            
+            if not _is_number(angle) or (speed is not None and not _is_number(speed)):
+                return self._error_response("base_goto", "invalid_format", "angle and speed must be numbers")
+            
+            if speed is not None and not (0 < speed <= 100):
+                return self._error_response("base_goto", "speed_out_of_range", "Speed must be between 1 and 100")
+            
+            base = self.base_controller
+            if base is None or base.position is None:
+                return self._error_response("base_goto", "position_disabled",
+                                           "Enable motors.base_rotation.position in config.json")
+            
+            target = angle
+            if message.get("relative", False):
+                target = base.position.degrees + angle
+            base.goto(target, speed)
+            self._refresh_deadman("base")
+            if self.device_state.update_base_rotation_state("goto", speed or base.pid.max_output):
+                self._state_changed = True
+            self.device_state.update_base_position(base.position.degrees, target)
+            
+            response = self._success_response("base_goto")
+            response["target"] = target
+            return response
+            
+        except Exception as e:
+            return self._error_response("base_goto", "execution_error", str(e))
+    
+    def _handle_base_zero(self, message):
+        """Make the current base heading 0°"""
+        try:
+            base = self.base_controller
+            if base is None or base.position is None:
+                return self._error_response("base_zero", "position_disabled",
+                                           "Enable motors.base_rotation.position in config.json")
+            
+            base.zero()
+            if self.device_state.update_base_position(base.position.degrees, base.goto_target):
+                self._state_changed = True
+            return self._success_response("base_zero")
+            
+        except Exception as e:
+            return self._error_response("base_zero", "execution_error", str(e))
     
     def _success_response(self, action):
         """Create success response"""
         return {
             "status": "ok",
             "action": action,
-            "timestamp": int(time.monotonic() * 1000)
+            "timestamp": clock.now_ms()
         }
     
+    def _ack_response(self, action):
+        """
+        Create a plain success response for a streamed command
+        
+        Returns the action's preallocated response (timestamp updated) when
+        acknowledgments are preallocated; never add keys to it.
+        """
+        ack = self._acks.get(action)
+        if ack is None:
+            return self._success_response(action)
+        ack.response["timestamp"] = clock.now_ms()
+        return ack.response
+    
+    def _not_controller_response(self, action, session):
+        """Create the error sent to observers that try to take control"""
+        response = self._error_response(action, "not_controller",
+                                        f"Client {self.lease.holder.id} holds the control lease")
+        response["lease"] = self.lease.get_status(session)
+        return response
+    
     def _error_response(self, action, error_code, message):
         """Create error response"""
         return {
@@ -5,7 +5,7 @@
 
 import { useEffect } from 'react'
 import { useDeviceWebSocket } from './hooks/useDeviceWebSocket'
-import { useDeviceStore } from './hooks/useDeviceStore'
+import { useDeviceStore, DeviceStatus } from './hooks/useDeviceStore'
 import { ConnectionStatus } from './components/ConnectionStatus'
 import { TrackControls } from './components/TrackControls'
 import { SpeedSelector } from './components/SpeedSelector'
@@ -16,8 +16,9 @@ import { StatusPanel } from './components/StatusPanel'
 function App() {
   const {
     deviceIp,
+    config,
     setConfig,
-    setStatus,
+    mergeStatus,
     setErrorMessage,
     setWsConnected,
     errorMessage
@@ -30,6 +31,14 @@ function App() {
     connectionStatus
   } = useDeviceWebSocket(deviceIp, {
     onMessage: (message) => {
+      if (message.action === 'state') {
+        mergeStatus({
+          ...message.changes,
+          uptime_ms: message.uptime_ms,
+          last_command_ms: message.last_command_ms
+        } as Partial<DeviceStatus>)
+        return
+      }
       if (message.status === 'error') {
         setErrorMessage(message.message || 'Unknown error')
       }
@@ -43,7 +52,8 @@ function App() {
     },
     onError: () => {
       setErrorMessage('WebSocket connection error')
-    }
+    },
+    speedPresets: config?.speed_presets
   })
   
   // Load device configuration on mount
@@ -64,29 +74,6 @@ function App() {
     loadConfig()
   }, [deviceIp, setConfig, setErrorMessage])
   
-  // Poll device status every 2 seconds
-  useEffect(() => {
-    const pollStatus = async () => {
-      try {
-        const response = await fetch(`http://${deviceIp}/api/status`)
-        if (response.ok) {
-          const status = await response.json()
-          setStatus(status)
-        }
-      } catch (error) {
-        console.error('Failed to poll status:', error)
-      }
-    }
-    
-    // Initial poll
-    pollStatus()
-    
-    // Set up polling interval
-    const interval = setInterval(pollStatus, 2000)
-    
-    return () => clearInterval(interval)
-  }, [deviceIp, setStatus])
-  
   return (
     <div className="app">
       <header className="app-header">
@@ -0,0 +1,131 @@
+/**
+ * Compact binary WebSocket protocol
+ * Encodes hot control commands into fixed-layout frames (see app/binary_protocol.py).
+ * Only used after the device acknowledges { action: 'hello', protocol: 'binary' }.
+ */
+
+export const OP_TRACK = 0x01
+export const OP_SERVO = 0x02
+export const OP_SERVO_BATCH = 0x03
+export const OP_BASE = 0x04
+export const OP_PING = 0x05
+export const OP_SERVO_RESET = 0x06
+
+const RESPONSE_FLAG = 0x80
+const STATUS_CLAMPED = 1
+const STATUS_ERROR = 2
+
+const ACTION_NAMES: Record<number, string> = {
+  [OP_TRACK]: 'track',
+  [OP_SERVO]: 'servo',
+  [OP_SERVO_BATCH]: 'servo_batch',
+  [OP_BASE]: 'base',
+  [OP_PING]: 'ping',
+  [OP_SERVO_RESET]: 'servo_reset'
+}
+
+const ERROR_NAMES: Record<number, string> = {
+  1: 'invalid_action',
+  2: 'invalid_format',
+  3: 'speed_out_of_range',
+  4: 'channel_not_found',
+  5: 'invalid_direction',
+  6: 'length_mismatch',
+  7: 'not_negotiated',
+  8: 'execution_error',
+  9: 'no_feasible_angle',
+  10: 'not_controller'
+}
+
+const BASE_DIRECTIONS: Record<string, number> = { stop: 0, cw: 1, ccw: -1 }
+
+export type SpeedPresets = Record<string, number>
+
+interface Command {
+  action?: string
+  [key: string]: unknown
+}
+
+const trackSpeeds = (command: Command, presets: SpeedPresets): [number, number] | null => {
+  if (typeof command.command !== 'string') {
+    return [Number(command.left ?? 0), Number(command.right ?? 0)]
+  }
+  const speed = presets[String(command.speed ?? 'medium')] ?? 60
+  switch (command.command) {
+    case 'forward': return [speed, speed]
+    case 'backward': return [-speed, -speed]
+    case 'left': return [-speed, speed]
+    case 'right': return [speed, -speed]
+    case 'stop': return [0, 0]
+    default: return null
+  }
+}
+
+/**
+ * Encode a JSON-style command as a binary frame.
+ * Returns null when the command has no binary form (it is then sent as JSON).
+ */
+export const encodeCommand = (command: Command, presets: SpeedPresets): Uint8Array | null => {
+  switch (command.action) {
+    case 'track': {
+      const speeds = trackSpeeds(command, presets)
+      if (!speeds) return null
+      const frame = new Uint8Array(3)
+      const view = new DataView(frame.buffer)
+      frame[0] = OP_TRACK
+      view.setInt8(1, speeds[0])
+      view.setInt8(2, speeds[1])
+      return frame
+    }
+    case 'servo':
+      return Uint8Array.of(OP_SERVO, Number(command.channel), Math.round(Number(command.angle)))
+    case 'servo_batch': {
+      const angles = command.angles as number[]
+      return Uint8Array.of(OP_SERVO_BATCH, ...angles.map(a => Math.round(a)))
+    }
+    case 'base': {
+      const direction = BASE_DIRECTIONS[String(command.direction ?? 'stop')]
+      if (direction === undefined) return null
+      const frame = new Uint8Array(3)
+      const view = new DataView(frame.buffer)
+      frame[0] = OP_BASE
+      view.setInt8(1, direction)
+      frame[2] = Number(command.speed ?? 100)
+      return frame
+    }
+    case 'ping':
+      return Uint8Array.of(OP_PING)
+    case 'servo_reset':
+      return Uint8Array.of(OP_SERVO_RESET)
+    default:
+      return null
+  }
+}
+
+/**
+ * Decode a binary response frame into the JSON response shape.
+ */
+export const decodeResponse = (buffer: ArrayBuffer) => {
+  const frame = new Uint8Array(buffer)
+  const opcode = frame[0] & ~RESPONSE_FLAG
+  const action = ACTION_NAMES[opcode]
+
+  if (opcode === OP_PING && frame.length >= 7) {
+    return {
+      status: 'pong',
+      timestamp: new DataView(buffer).getUint32(3, true)
+    }
+  }
+  if (frame[1] === STATUS_ERROR) {
+    const error = ERROR_NAMES[frame[2]] ?? 'execution_error'
+    return { status: 'error', action, error, message: error }
+  }
+  if (frame[1] === STATUS_CLAMPED) {
+    if (opcode === OP_SERVO_BATCH) {
+      // Value is the joint count; the applied angles follow
+      return { status: 'ok', action, clamped_values: Array.from(frame.subarray(3, 3 + frame[2])) }
+    }
+    return { status: 'ok', action, clamped_value: frame[2] }
+  }
+  return { status: 'ok', action }
+}
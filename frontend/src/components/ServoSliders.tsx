@@ -60,8 +60,7 @@ export const ServoSliders: React.FC<ServoSlidersProps> = ({
     }
   }, [servoStates, isDragging, initialized, localAngles])
   
-  const handleAngleChange = (channel: number, angle: number) => {
-    setLocalAngles(prev => ({ ...prev, [channel]: angle }))
+  const sendAngle = (channel: number, angle: number) => {
     sendCommand({
       action: 'servo',
       channel,
@@ -69,11 +68,23 @@ export const ServoSliders: React.FC<ServoSlidersProps> = ({
     })
   }
   
+  // The device interpolates toward each setpoint, so while dragging only the
+  // final angle is sent on release (keyboard changes are sent immediately)
+  const handleAngleChange = (channel: number, angle: number) => {
+    setLocalAngles(prev => ({ ...prev, [channel]: angle }))
+    if (!isDragging[channel]) {
+      sendAngle(channel, angle)
+    }
+  }
+  
   const handleMouseDown = (channel: number) => {
     setIsDragging(prev => ({ ...prev, [channel]: true }))
   }
   
   const handleMouseUp = (channel: number) => {
+    if (isDragging[channel] && localAngles[channel] !== undefined) {
+      sendAngle(channel, localAngles[channel])
+    }
     setIsDragging(prev => ({ ...prev, [channel]: false }))
   }
   
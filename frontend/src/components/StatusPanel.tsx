@@ -18,7 +18,7 @@ export const StatusPanel: React.FC = () => {
     )
   }
   
-  const { wifi, servos, tracks, base_rotation, errors } = status
+  const { wifi, servos, tracks, base_rotation, errors, memory } = status
   
   return (
     <div className="status-panel">
@@ -125,14 +125,36 @@ export const StatusPanel: React.FC = () => {
           </div>
         </div>
         
+        {/* Memory */}
+        {memory && (
+          <div className="status-section">
+            <h4 className="status-section-title">🧠 内存</h4>
+            <div className="status-items">
+              {memory.free !== null && (
+                <div className="status-item">
+                  <span className="status-key">空闲:</span>
+                  <span className="status-value">{Math.round(memory.free / 1024)} KB</span>
+                </div>
+              )}
+              <div className="status-item">
+                <span className="status-key">GC:</span>
+                <span className="status-value">
+                  {memory.window.collections}次/{memory.window.ms}ms, 最长 {memory.gc_max_ms}ms
+                </span>
+              </div>
+            </div>
+          </div>
+        )}
+        
         {/* Errors */}
-        {errors && errors.length > 0 && (
+        {errors && errors.recent.length > 0 && (
           <div className="status-section status-errors">
             <h4 className="status-section-title">⚠️ 错误信息</h4>
             <div className="error-list">
-              {errors.map((error, index) => (
+              {errors.recent.map((error, index) => (
                 <div key={index} className="error-item">
-                  {error}
+                  [{error.subsystem}] {error.message}
+                  {error.count > 1 && ` ×${error.count}`}
                 </div>
               ))}
             </div>
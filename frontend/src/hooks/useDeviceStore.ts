@@ -20,9 +20,11 @@ export interface TrackState {
 }
 
 export interface BaseRotationState {
-  direction: 'cw' | 'ccw' | 'stop'
+  direction: 'cw' | 'ccw' | 'stop' | 'goto'
   speed: number
   sleeping: boolean
+  position?: number | null
+  target?: number | null
 }
 
 export interface WiFiStatus {
@@ -50,6 +52,35 @@ export interface DeviceConfig {
   }
 }
 
+export interface ErrorEntry {
+  message: string
+  subsystem: string
+  count: number
+  first_ms: number
+  last_ms: number
+}
+
+export interface ErrorSummary {
+  recent: ErrorEntry[]
+  subsystems: Record<string, { total: number; per_min: number }>
+}
+
+export interface MemoryStats {
+  gc_mode: 'auto' | 'scheduled'
+  free: number | null
+  alloc: number | null
+  collections: { idle: number; forced: number; auto: number }
+  gc_max_ms: number
+  window: {
+    ms: number
+    min_free: number | null
+    collections: number
+    auto_collections: number
+    gc_total_ms: number
+    gc_max_ms: number
+  }
+}
+
 export interface DeviceStatus {
   wifi: WiFiStatus
   servos: ServoState[]
@@ -57,7 +88,9 @@ export interface DeviceStatus {
   base_rotation: BaseRotationState
   last_command_ms: number
   uptime_ms: number
-  errors: string[]
+  errors: ErrorSummary
+  // null until the first memory window has been published
+  memory: MemoryStats | null
 }
 
 interface DeviceStore {
@@ -72,6 +105,8 @@ interface DeviceStore {
   // Device status
   status: DeviceStatus | null
   setStatus: (status: DeviceStatus) => void
+  // Apply a pushed state delta (only the changed sections)
+  mergeStatus: (changes: Partial<DeviceStatus>) => void
   
   // Selected speed preset
   selectedSpeed: 'slow' | 'medium' | 'fast'
@@ -98,6 +133,9 @@ export const useDeviceStore = create<DeviceStore>((set) => ({
   // Device status
   status: null,
   setStatus: (status) => set({ status }),
+  mergeStatus: (changes) => set((state) => ({
+    status: { ...(state.status ?? {}), ...changes } as DeviceStatus
+  })),
   
   // Selected speed preset
   selectedSpeed: 'medium',
@@ -5,6 +5,10 @@
 
 import { useEffect, useRef, useCallback, useState } from 'react'
 import useWebSocket, { ReadyState } from 'react-use-websocket'
+import { encodeCommand, decodeResponse, SpeedPresets } from '../binaryProtocol'
+
+// Pushed state messages start with this exact prefix (see app/state_stream.py)
+const STATE_PREFIX = '{"action":"state"'
 
 export interface WebSocketMessage {
   status?: string
@@ -12,6 +16,14 @@ export interface WebSocketMessage {
   error?: string
   message?: string
   timestamp?: number
+  protocol?: string
+  clamped_value?: number
+  clamped_values?: (number | null)[]
+  // Pushed state deltas ("state" messages after subscribe)
+  full?: boolean
+  uptime_ms?: number
+  last_command_ms?: number
+  changes?: Record<string, unknown>
 }
 
 interface UseDeviceWebSocketOptions {
@@ -19,12 +31,20 @@ interface UseDeviceWebSocketOptions {
   onOpen?: () => void
   onClose?: () => void
   onError?: (event: Event) => void
+  // Presets used to encode shorthand track commands in binary mode
+  speedPresets?: SpeedPresets
 }
 
 export const useDeviceWebSocket = (deviceIp: string, options: UseDeviceWebSocketOptions = {}) => {
   const wsUrl = `ws://${deviceIp}/ws`
   const [isManualClose, setIsManualClose] = useState(false)
   const heartbeatIntervalRef = useRef<number | null>(null)
+  // Set once the device acknowledges the binary protocol for this connection
+  const binaryRef = useRef(false)
+  const speedPresetsRef = useRef<SpeedPresets>({ slow: 30, medium: 60, fast: 100 })
+  if (options.speedPresets) {
+    speedPresetsRef.current = options.speedPresets
+  }
   
   const {
     sendMessage,
@@ -37,19 +57,53 @@ export const useDeviceWebSocket = (deviceIp: string, options: UseDeviceWebSocket
       shouldReconnect: () => !isManualClose,
       reconnectAttempts: 10,
       reconnectInterval: 3000,
-      onOpen: () => {
+      onOpen: (event) => {
         console.log('WebSocket connected')
+        const ws = event.target as WebSocket
+        ws.binaryType = 'arraybuffer'
+        binaryRef.current = false
+        // Offer the compact binary protocol; the device falls back to JSON if it declines.
+        // ack: false - streamed commands are only answered on errors, clamps and state changes
+        ws.send(JSON.stringify({ action: 'hello', protocol: 'binary', ack: false }))
+        // Device pushes status deltas on this socket instead of /api/status polling
+        ws.send(JSON.stringify({ action: 'subscribe', rate_hz: 5 }))
         options.onOpen?.()
         startHeartbeat()
       },
       onClose: () => {
         console.log('WebSocket disconnected')
+        binaryRef.current = false
         options.onClose?.()
         stopHeartbeat()
       },
       onError: (event) => {
         console.error('WebSocket error:', event)
         options.onError?.(event)
+      },
+      // State deltas and the hello reply are handled per message: lastMessage
+      // may skip one when two frames arrive together. A skipped delta would
+      // leave stale state, and the hello reply arrives right next to the
+      // subscribe reply - skipping it would silently keep the socket on JSON
+      onMessage: (event) => {
+        if (typeof event.data !== 'string') {
+          return
+        }
+        if (event.data.startsWith(STATE_PREFIX)) {
+          try {
+            options.onMessage?.(JSON.parse(event.data))
+          } catch (error) {
+            console.error('Failed to parse state message:', error)
+          }
+        } else if (event.data.includes('hello')) {
+          try {
+            const data: WebSocketMessage = JSON.parse(event.data)
+            if (data.action === 'hello') {
+              binaryRef.current = data.protocol === 'binary'
+            }
+          } catch (error) {
+            console.error('Failed to parse hello reply:', error)
+          }
+        }
       }
     },
     !isManualClose // Only connect if not manually closed
@@ -79,7 +133,14 @@ export const useDeviceWebSocket = (deviceIp: string, options: UseDeviceWebSocket
   useEffect(() => {
     if (lastMessage !== null) {
       try {
-        const data = JSON.parse(lastMessage.data) as WebSocketMessage
+        const data: WebSocketMessage = lastMessage.data instanceof ArrayBuffer
+          ? decodeResponse(lastMessage.data)
+          : JSON.parse(lastMessage.data)
+        
+        // Already handled by the per-message handler
+        if (data.action === 'hello' || data.action === 'state') {
+          return
+        }
         
         // Filter out pong responses from heartbeat
         if (data.status !== 'pong') {
@@ -101,7 +162,10 @@ export const useDeviceWebSocket = (deviceIp: string, options: UseDeviceWebSocket
   // Send command helper
   const sendCommand = useCallback((command: object) => {
     if (readyState === ReadyState.OPEN) {
-      sendMessage(JSON.stringify(command))
+      const frame = binaryRef.current
+        ? encodeCommand(command as Record<string, unknown>, speedPresetsRef.current)
+        : null
+      sendMessage(frame ?? JSON.stringify(command))
     } else {
       console.warn('WebSocket not connected, command not sent:', command)
     }
@@ -0,0 +1,239 @@
+"""
+命令→PWM延迟基准测试
+通过 WebSocketHandler.handle_message 在模拟硬件上回放 track / servo /
+servo_batch / base 消息，统计从消息到达到最后一次占空比写入的延迟分位数和吞吐量
+"""
+import io
+import sys
+import json
+import time
+import argparse
+import contextlib
+from datetime import datetime
+
+import sim_env
+
+# 视为"执行器动作"的硬件写入类型
+ACTUATION_KINDS = ("pwm", "pca9685")
+
+
+def build_script(config, repeat):
+    """
+    生成默认的测试消息序列
+
+    Args:
+        config: 设备配置
+        repeat: 每组消息重复次数
+
+    Returns:
+        list: (action, message_str) 列表
+    """
+    servos = config["servos"]
+    messages = []
+
+    for command in ("forward", "backward", "left", "right", "stop"):
+        for speed in ("slow", "medium", "fast"):
+            messages.append({"action": "track", "command": command, "speed": speed})
+    for left, right in ((100, 100), (-60, 60), (30, -30), (0, 0)):
+        messages.append({"action": "track", "left": left, "right": right})
+
+    for servo in servos:
+        lo, hi = servo["min_angle"], servo["max_angle"]
+        for angle in (lo, (lo + hi) // 2, hi, servo["initial_angle"]):
+            messages.append({"action": "servo", "channel": servo["channel"], "angle": angle})
+
+    messages.append({"action": "servo_batch", "angles": [s["initial_angle"] for s in servos]})
+    messages.append({"action": "servo_batch", "angles": [(s["min_angle"] + s["max_angle"]) // 2 for s in servos]})
+
+    for direction in ("cw", "ccw", "stop"):
+        messages.append({"action": "base", "direction": direction, "speed": 80})
+
+    script = [(m["action"], json.dumps(m)) for m in messages]
+    return script * repeat
+
+
+def percentile(sorted_values, pct):
+    """最近秩法计算分位数"""
+    if not sorted_values:
+        return None
+    index = max(0, min(len(sorted_values) - 1, int(round(pct / 100.0 * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+def summarize(latencies_ns):
+    """把延迟列表（纳秒）汇总为毫秒统计"""
+    values = sorted(latencies_ns)
+    if not values:
+        return {"count": 0}
+    to_ms = lambda ns: round(ns / 1_000_000, 4)
+    return {
+        "count": len(values),
+        "p50_ms": to_ms(percentile(values, 50)),
+        "p95_ms": to_ms(percentile(values, 95)),
+        "p99_ms": to_ms(percentile(values, 99)),
+        "max_ms": to_ms(values[-1]),
+        "mean_ms": to_ms(sum(values) / len(values)),
+    }
+
+
+def run_benchmark(config, repeat):
+    """
+    执行基准测试
+
+    Returns:
+        dict: 测试结果
+    """
+    recorder = sim_env.install()
+
+    # 平滑运动/履带斜坡模式下命令只更新设定点，由tick()逐步写入；
+    # 这里测量的是命令→直接写入的管线延迟，因此关闭平滑运动和履带斜坡
+    tracks = dict(config["motors"]["tracks"], ramp={"enabled": False})
+    motors = dict(config["motors"], tracks=tracks)
+    config = dict(config, servo_motion={"enabled": False}, motors=motors)
+
+    from device_state import DeviceState
+    from websocket_handler import WebSocketHandler
+    from servo_controller import ServoController
+    from track_controller import TrackController
+    from base_rotation_controller import BaseRotationController
+    import board
+    import busio
+
+    # 控制器初始化时的打印不计入测试
+    with contextlib.redirect_stdout(io.StringIO()):
+        device_state = DeviceState(config)
+        i2c = busio.I2C(getattr(board, config["i2c"]["scl_pin"]), getattr(board, config["i2c"]["sda_pin"]))
+        handler = WebSocketHandler(
+            config,
+            device_state,
+            ServoController(i2c, config),
+            TrackController(config),
+            BaseRotationController(config)
+        )
+        session = handler.open_session(None)
+
+    script = build_script(config, repeat)
+    per_action = {}
+    all_latencies = []
+    no_actuation = {}
+    errors = {}
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        started = time.perf_counter_ns()
+        for action, message in script:
+            recorder.reset()
+            arrival = time.monotonic_ns()
+            response = handler.handle_message(session, message)
+
+            final_write = None
+            for event in reversed(recorder.events):
+                if event[1] in ACTUATION_KINDS:
+                    final_write = event[0]
+                    break
+
+            if response is not None and response.get("status") == "error":
+                errors[action] = errors.get(action, 0) + 1
+            if final_write is None:
+                no_actuation[action] = no_actuation.get(action, 0) + 1
+                continue
+
+            latency = final_write - arrival
+            per_action.setdefault(action, []).append(latency)
+            all_latencies.append(latency)
+        elapsed_ns = time.perf_counter_ns() - started
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "messages": len(script),
+        "elapsed_s": round(elapsed_ns / 1e9, 4),
+        "throughput_msgs_per_s": round(len(script) / (elapsed_ns / 1e9), 1),
+        "latency": summarize(all_latencies),
+        "per_action": {action: summarize(values) for action, values in sorted(per_action.items())},
+        "no_actuation": no_actuation,
+        "errors": errors,
+    }
+
+
+def compare(result, baseline, tolerance):
+    """
+    与基线结果比较
+
+    Args:
+        result: 本次结果
+        baseline: 基线结果
+        tolerance: 允许的相对退化比例（如0.2表示20%）
+
+    Returns:
+        list: 退化描述列表
+    """
+    regressions = []
+    for key in ("p50_ms", "p95_ms", "p99_ms"):
+        old = baseline.get("latency", {}).get(key)
+        new = result["latency"].get(key)
+        if old and new and new > old * (1 + tolerance):
+            regressions.append(f"latency {key}: {old} -> {new}")
+    old_tp = baseline.get("throughput_msgs_per_s")
+    if old_tp and result["throughput_msgs_per_s"] < old_tp * (1 - tolerance):
+        regressions.append(f"throughput: {old_tp} -> {result['throughput_msgs_per_s']} msgs/s")
+    return regressions
+
+
+def print_report(result):
+    """打印结果表格"""
+    print("=" * 60)
+    print("命令→PWM延迟基准测试")
+    print("=" * 60)
+    print(f"消息数: {result['messages']}  耗时: {result['elapsed_s']}s  "
+          f"吞吐量: {result['throughput_msgs_per_s']} msgs/s")
+    print(f"\n{'action':<14}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    rows = list(result["per_action"].items()) + [("ALL", result["latency"])]
+    for action, stats in rows:
+        if not stats.get("count"):
+            continue
+        print(f"{action:<14}{stats['count']:>7}{stats['p50_ms']:>10}{stats['p95_ms']:>10}"
+              f"{stats['p99_ms']:>10}{stats['max_ms']:>10}")
+    if result["no_actuation"]:
+        print(f"\n⚠ 无执行器写入的消息: {result['no_actuation']}")
+    if result["errors"]:
+        print(f"⚠ 返回错误的消息: {result['errors']}")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='命令→PWM延迟基准测试（模拟硬件）')
+    parser.add_argument('--repeat', type=int, default=200,
+                        help='消息序列重复次数，默认200')
+    parser.add_argument('--config', type=str,
+                        help='配置文件路径，默认 app/config.json')
+    parser.add_argument('--output', type=str,
+                        help='把结果保存为JSON文件')
+    parser.add_argument('--baseline', type=str,
+                        help='与之前保存的JSON结果比较，退化时返回非零退出码')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='允许的退化比例，默认0.2（20%%）')
+    args = parser.parse_args()
+
+    config = sim_env.load_config(args.config)
+    result = run_benchmark(config, args.repeat)
+    print_report(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"\n✓ 结果已保存: {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(result, baseline, args.tolerance)
+        if regressions:
+            print("\n✗ 性能退化:")
+            for line in regressions:
+                print(f"  - {line}")
+            sys.exit(1)
+        print("\n✓ 未发现性能退化")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+WebSocket连接表测试
+在模拟硬件上运行完整的 app/code.py，用 server.max_clients 个不再发送任何消息的连接
+（模拟半开套接字：发送错误被吞掉，连接不会因异常而关闭）占满连接表，然后：
+  full    - 超时前新的连接应得到 503
+  timeout - 时钟前进 server.client_timeout_ms 后，新的连接应能建立，
+            静默的连接被关闭，期间发送过 ping 的连接保留
+"""
+import io
+import sys
+import time
+import runpy
+import argparse
+import threading
+import contextlib
+import _thread
+
+import sim_env
+
+
+def run_scenario(config, results):
+    """
+    在后台线程中执行测试，结束后中断主线程上的 code.py
+
+    Args:
+        config: 设备配置
+        results: 写入测试结果的dict
+    """
+    import clock
+    from adafruit_httpserver import Server, Websocket
+
+    server_cfg = config.get("server", {})
+    max_clients = server_cfg.get("max_clients", 4)
+    timeout_ms = server_cfg.get("client_timeout_ms", 60000)
+
+    # 模拟时钟前进，无需真的等待 client_timeout_ms
+    offset = [0]
+    monotonic_ms = clock.now_ms
+    clock.now_ms = lambda: monotonic_ms() + offset[0]
+
+    try:
+        while not Server.instances or Server.instances[0].port is None:
+            time.sleep(0.05)
+        server = Server.instances[0]
+
+        sockets = [server.request("/ws") for _ in range(max_clients)]
+        results["opened"] = sum(isinstance(ws, Websocket) for ws in sockets)
+        rejected = server.request("/ws")
+        results["full_status"] = None if isinstance(rejected, Websocket) else rejected.status[0]
+
+        # 第一个连接在超时前发送心跳，其余保持静默
+        offset[0] += timeout_ms - 2000
+        sockets[0].inject('{"action": "ping"}')
+        deadline = time.monotonic() + 2
+        while not sockets[0].sent and time.monotonic() < deadline:
+            time.sleep(0.01)
+        offset[0] += 3000
+
+        accepted = server.request("/ws")
+        results["timeout_connected"] = isinstance(accepted, Websocket)
+        results["stale_closed"] = sum(ws.closed for ws in sockets[1:])
+        results["active_kept"] = not sockets[0].closed
+    finally:
+        clock.now_ms = monotonic_ms
+        _thread.interrupt_main()
+
+
+def print_report(config, results):
+    """打印结果"""
+    server_cfg = config.get("server", {})
+    max_clients = server_cfg.get("max_clients", 4)
+    print("=" * 60)
+    print("WebSocket连接表测试")
+    print("=" * 60)
+    print(f"max_clients: {max_clients}  client_timeout_ms: {server_cfg.get('client_timeout_ms', 60000)}")
+    print(f"full     连接表已满时的新连接: {results.get('full_status')}（应为503）")
+    print(f"timeout  超时后的新连接: {'已建立' if results.get('timeout_connected') else '被拒绝'}，"
+          f"关闭静默连接 {results.get('stale_closed')}/{max_clients - 1}，"
+          f"发送过ping的连接{'保留' if results.get('active_kept') else '被关闭'}")
+
+
+def passed(config, results):
+    """检查结果是否符合预期"""
+    max_clients = config.get("server", {}).get("max_clients", 4)
+    return (results.get("opened") == max_clients
+            and results.get("full_status") == 503
+            and results.get("timeout_connected")
+            and results.get("stale_closed") == max_clients - 1
+            and results.get("active_kept"))
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='WebSocket连接表测试（半开连接占满连接表）')
+    parser.parse_args()
+
+    sim_env.install()
+    config = sim_env.load_config()
+    results = {}
+    threading.Thread(target=run_scenario, args=(config, results), daemon=True).start()
+
+    # code.py 从 app/config.json 读取配置，与上面加载的相同
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            runpy.run_path("code.py", run_name="__main__")
+        except KeyboardInterrupt:
+            pass
+
+    print_report(config, results)
+    sys.exit(0 if passed(config, results) else 1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+机械臂轨迹加速度测试（ServoTrajectory）
+以固定的 servo_motion.tick_ms 推进轨迹，检查每个关节相邻两个tick的速度变化
+|Δv| 不超过 max_acceleration·dt（包括新目标切换和急停的瞬间）：
+  start    - 静止开始运动
+  retarget - 运动途中改变方向（另一关节加入运动）
+  reversal - 运动途中反向（须先减速到静止再开始新的线段）
+  hold     - 运动途中急停（SafetyWatchdog 的机械臂死人开关）
+  random   - 随机时刻设置随机目标/急停
+"""
+import sys
+import json
+import random
+import argparse
+from datetime import datetime
+
+import sim_env
+
+
+def run_scenario(config, dt, commands, ticks):
+    """
+    推进一段轨迹并统计速度变化
+
+    Args:
+        config: 设备配置
+        dt: tick时长（秒）
+        commands: tick序号 -> 目标角度dict，或 "hold" 表示急停
+        ticks: 总tick数
+
+    Returns:
+        dict: 最大 |Δv|/(max_acceleration·dt)，以及结束时是否到达目标
+    """
+    from servo_trajectory import ServoTrajectory
+
+    start = {servo["channel"]: servo["initial_angle"] for servo in config["servos"]}
+    trajectory = ServoTrajectory(config, start)
+    previous = dict(trajectory.velocity)
+    worst = 0.0
+    for tick in range(ticks):
+        command = commands.get(tick)
+        if command == "hold":
+            trajectory.stop()
+        elif command:
+            trajectory.set_target(command)
+        trajectory.tick(dt)
+        for channel, velocity in trajectory.velocity.items():
+            ratio = abs(velocity - previous[channel]) / (trajectory.max_acceleration[channel] * dt)
+            if ratio > worst:
+                worst = ratio
+            previous[channel] = velocity
+
+    arrived = not trajectory.is_moving() and all(
+        abs(trajectory.position[channel] - angle) < 1e-6 for channel, angle in trajectory.target.items())
+    return {"worst_ratio": worst, "arrived": arrived}
+
+
+def run_benchmark(config, dt, trials, seed):
+    """
+    执行全部场景
+
+    Returns:
+        dict: 测试结果
+    """
+    sim_env.install()
+    rng = random.Random(seed)
+
+    servos = config["servos"]
+    first, second = servos[0], servos[1]
+    a, b = first["channel"], second["channel"]
+    a0, b0 = first["initial_angle"], second["initial_angle"]
+    # 朝行程较大的一侧运动
+    a_dir = 1 if first["max_angle"] - a0 >= a0 - first["min_angle"] else -1
+    b_dir = 1 if second["max_angle"] - b0 >= b0 - second["min_angle"] else -1
+    ticks = int(10 / dt)
+    # 运动途中（约全速时）的tick
+    mid = int(0.3 / dt)
+
+    fixed = {
+        "start": {0: {a: a0 + 60 * a_dir}},
+        "retarget": {0: {a: a0 + 60 * a_dir}, mid: {a: a0 + 70 * a_dir, b: b0 + 40 * b_dir}},
+        "reversal": {0: {a: a0 + 60 * a_dir}, mid: {a: a0 - 20 * a_dir}},
+        "hold": {0: {a: a0 + 60 * a_dir, b: b0 + 30 * b_dir}, mid: "hold"},
+    }
+    scenarios = {name: run_scenario(config, dt, commands, ticks) for name, commands in fixed.items()}
+
+    worst = 0.0
+    not_arrived = 0
+    for _ in range(trials):
+        commands = {}
+        for tick in range(ticks // 2):
+            if rng.random() < 0.05:
+                commands[tick] = {servo["channel"]: rng.uniform(servo["min_angle"], servo["max_angle"])
+                                  for servo in servos if rng.random() < 0.7}
+            elif rng.random() < 0.01:
+                commands[tick] = "hold"
+        result = run_scenario(config, dt, commands, ticks)
+        worst = max(worst, result["worst_ratio"])
+        not_arrived += not result["arrived"]
+    scenarios["random"] = {"trials": trials, "worst_ratio": worst, "not_arrived": not_arrived}
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "dt_ms": dt * 1000,
+        "scenarios": scenarios,
+    }
+
+
+def failures(result, tolerance=1e-6):
+    """超出加速度限制或未到达目标的场景名"""
+    failed = []
+    for name, stats in result["scenarios"].items():
+        if stats["worst_ratio"] > 1 + tolerance or not stats.get("arrived", True) or stats.get("not_arrived"):
+            failed.append(name)
+    return failed
+
+
+def print_report(result):
+    """打印结果表格"""
+    print("=" * 60)
+    print("机械臂轨迹加速度测试")
+    print("=" * 60)
+    print(f"tick: {result['dt_ms']:g}ms  限制: |Δv| <= max_acceleration·dt（比值 <= 1）")
+    print(f"\n{'scenario':<10}{'max |Δv| ratio':>16}  到达目标")
+    for name, stats in result["scenarios"].items():
+        if "trials" in stats:
+            arrived = f"{stats['trials'] - stats['not_arrived']}/{stats['trials']}"
+        else:
+            arrived = "是" if stats["arrived"] else "否"
+        print(f"{name:<10}{stats['worst_ratio']:>16.3f}  {arrived}")
+    for name in failures(result):
+        print(f"⚠ {name}: 超出加速度限制或未到达目标")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='机械臂轨迹加速度测试（新目标切换/反向/急停）')
+    parser.add_argument('--tick-ms', type=int,
+                        help='tick时长，默认 servo_motion.tick_ms')
+    parser.add_argument('--trials', type=int, default=100,
+                        help='random 场景的测试次数，默认100')
+    parser.add_argument('--seed', type=int, default=1,
+                        help='random 场景的随机种子，默认1')
+    parser.add_argument('--config', type=str,
+                        help='配置文件路径，默认 app/config.json')
+    parser.add_argument('--output', type=str,
+                        help='把结果保存为JSON文件')
+    args = parser.parse_args()
+
+    config = sim_env.load_config(args.config)
+    tick_ms = args.tick_ms or config.get("servo_motion", {}).get("tick_ms", 20)
+
+    result = run_benchmark(config, tick_ms / 1000, args.trials, args.seed)
+    print_report(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"\n✓ 结果已保存: {args.output}")
+
+    sys.exit(1 if failures(result) else 0)
+
+
+if __name__ == '__main__':
+    main()
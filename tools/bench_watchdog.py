@@ -0,0 +1,260 @@
+"""
+急停延迟测试（安全看门狗）
+在模拟硬件上驱动履带和底盘后停止发送命令，测量电机实际停转的延迟：
+  normal - 主循环正常运行，期间持续刷新机械臂的死人开关（模拟只发舵机命令的客户端），
+           履带和底盘的死人开关到期后由 safety 任务停机，测量从超时时刻到PWM停转的延迟
+  stall  - 超时前主循环被阻塞（模拟 server.poll() 卡在慢客户端上），
+           由硬件看门狗复位芯片停机，测量从阻塞开始到PWM停转的延迟
+  parked - 停机后主循环阻塞 3×hardware_timeout_ms（模拟停车时较长的HTTP传输），
+           硬件看门狗此时应已放宽到 idle_timeout_ms，不应复位芯片
+           （模拟看门狗与 raspberrypi 移植版一致，进入RESET模式后无法 deinit）
+"""
+import io
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import contextlib
+from datetime import datetime
+
+import sim_env
+
+
+def motors_stopped(pwm, pins):
+    """
+    根据各PWM引脚的当前占空比判断电机是否停转
+
+    Args:
+        pwm: 引脚名 -> 最近一次写入的占空比
+        pins: (履带PWM引脚列表, 底盘(IN1, IN2)引脚)
+
+    Returns:
+        bool: 履带PWM为0且底盘IN1/IN2相等（刹车或滑行）
+    """
+    track_pins, (in1, in2) = pins
+    if any(pwm.get(pin, 0) for pin in track_pins):
+        return False
+    return pwm.get(in1, 0) == pwm.get(in2, 0)
+
+
+def run_trial(config, pins, stall_at_ms=None, stall_ms=0, parked_stall_ms=0):
+    """
+    执行一次停机测试
+
+    Args:
+        config: 设备配置
+        pins: motors_stopped() 使用的引脚
+        stall_at_ms: 命令后多久阻塞主循环（None表示不阻塞）
+        stall_ms: 阻塞时长
+        parked_stall_ms: 停机后再阻塞主循环的时长（0表示不阻塞）
+
+    Returns:
+        tuple: (停机延迟（毫秒），未停机为None; 停机后的阻塞是否导致复位)
+    """
+    import hwsim
+    from device_state import DeviceState
+    from track_controller import TrackController
+    from base_rotation_controller import BaseRotationController
+    from safety_watchdog import SafetyWatchdog
+    from scheduler import Scheduler
+
+    hwsim.OUTPUTS.clear()
+    hwsim.RECORDER.reset()
+    reset = {}
+    hwsim.RESET_HANDLER = lambda reason: reset.setdefault("t_ns", time.monotonic_ns())
+
+    device_state = DeviceState(config)
+    controllers = {"track": TrackController(config), "base": BaseRotationController(config)}
+    safety = SafetyWatchdog(config, device_state, controllers)
+    timeout_ms = max(safety.deadman_timeouts["tracks"], safety.deadman_timeouts["base"])
+
+    # 记录每个PWM引脚的占空比，找到电机全部停转的时刻
+    pwm = {}
+    stopped = {}
+
+    def on_write(event):
+        t_ns, kind, target, value = event
+        if kind != "pwm":
+            return
+        pwm[target] = value
+        if "command_ns" in marks and "t_ns" not in stopped and motors_stopped(pwm, pins):
+            stopped["t_ns"] = t_ns
+
+    marks = {}
+    hwsim.RECORDER.listeners.append(on_write)
+
+    def tick_tracks():
+        controllers["track"].tick()
+
+    def refresh_arm():
+        # 其他执行器组的命令不能让履带和底盘继续运转
+        safety.refresh("arm")
+
+    def stall():
+        if stall_at_ms is None or "stall_ns" in marks:
+            return
+        if time.monotonic_ns() - marks["command_ns"] >= stall_at_ms * 1_000_000:
+            marks["stall_ns"] = time.monotonic_ns()
+            # 阻塞整个事件循环，模拟卡死的同步调用
+            time.sleep(stall_ms / 1000)
+
+    async def run():
+        scheduler = Scheduler(config)
+        scheduler.add("safety", safety.check, period_ms=100, priority=1)
+        if controllers["track"].ramp:
+            scheduler.add("track_ramp", tick_tracks, period_ms=10, priority=1)
+        scheduler.add("stall", stall, period_ms=5, priority=2)
+        scheduler.add("arm_commands", refresh_arm, period_ms=100, priority=2)
+
+        controllers["track"].set_speeds(60, 60)
+        controllers["base"].set_direction("cw", 60)
+        safety.refresh("tracks")
+        safety.refresh("base")
+        marks["command_ns"] = time.monotonic_ns()
+        safety.watch()
+
+        runner = asyncio.create_task(scheduler.run())
+        limit_s = (timeout_ms + stall_ms) / 1000 + 2
+        started = time.monotonic()
+        while "t_ns" not in stopped and "t_ns" not in reset and time.monotonic() - started < limit_s:
+            await asyncio.sleep(0.005)
+        if parked_stall_ms and "t_ns" in stopped and "t_ns" not in reset:
+            # 等 safety 任务放宽看门狗，再阻塞事件循环
+            await asyncio.sleep(0.25)
+            marks["parked_ns"] = time.monotonic_ns()
+            time.sleep(parked_stall_ms / 1000)
+            await asyncio.sleep(0.05)
+        runner.cancel()
+        try:
+            await runner
+        except asyncio.CancelledError:
+            pass
+
+    try:
+        asyncio.run(run())
+    finally:
+        hwsim.RECORDER.listeners.remove(on_write)
+        # 复位后的芯片不会再执行这里
+        if "t_ns" not in reset:
+            safety.deinit()
+
+    parked_reset = "parked_ns" in marks and reset.get("t_ns", 0) >= marks["parked_ns"]
+    if "t_ns" not in stopped:
+        return None, parked_reset
+    if stall_at_ms is None:
+        reference_ns = marks["command_ns"] + timeout_ms * 1_000_000
+    else:
+        reference_ns = marks["stall_ns"]
+    return (stopped["t_ns"] - reference_ns) / 1_000_000, parked_reset
+
+
+def run_benchmark(config, trials, seed):
+    """
+    执行正常/阻塞两种场景
+
+    Returns:
+        dict: 测试结果
+    """
+    sim_env.install()
+    rng = random.Random(seed)
+
+    tracks = config["motors"]["tracks"]
+    base = config["motors"]["base_rotation"]
+    pins = ((tracks["pwma_pin"], tracks["pwmb_pin"]), (base["in1_pin"], base["in2_pin"]))
+    timeouts = config["safety"].get("deadman", {}).get("timeouts_ms", {})
+    timeout_ms = max(timeouts.get(group, config["safety"]["command_timeout_ms"]) for group in ("tracks", "base"))
+    hardware_timeout_ms = config["safety"].get("watchdog", {}).get("hardware_timeout_ms", 500)
+
+    scenarios = {"normal": [], "stall": []}
+    parked_resets = 0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(trials):
+            latency, parked_reset = run_trial(config, pins, parked_stall_ms=3 * hardware_timeout_ms)
+            scenarios["normal"].append(latency)
+            parked_resets += parked_reset
+        for _ in range(trials):
+            stall_at = rng.uniform(0, timeout_ms)
+            latency, _ = run_trial(config, pins, stall_at, timeout_ms + 3 * hardware_timeout_ms)
+            scenarios["stall"].append(latency)
+
+    def summarize(values):
+        measured = [v for v in values if v is not None]
+        return {
+            "trials": len(values),
+            "not_stopped": len(values) - len(measured),
+            "mean_ms": round(sum(measured) / len(measured), 2) if measured else None,
+            "worst_ms": round(max(measured), 2) if measured else None,
+        }
+
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "python": sys.version.split()[0],
+        "command_timeout_ms": timeout_ms,
+        "hardware_timeout_ms": hardware_timeout_ms,
+        "normal": summarize(scenarios["normal"]),
+        "stall": summarize(scenarios["stall"]),
+        "parked": {"trials": trials, "stall_ms": 3 * hardware_timeout_ms, "resets": parked_resets},
+    }
+
+
+def print_report(result):
+    """打印结果表格"""
+    print("=" * 60)
+    print("急停延迟测试（安全看门狗）")
+    print("=" * 60)
+    print(f"命令超时: {result['command_timeout_ms']}ms  硬件看门狗: {result['hardware_timeout_ms']}ms")
+    print(f"\n{'scenario':<10}{'trials':>8}{'mean ms':>10}{'worst ms':>10}  参考时刻")
+    for name, reference in (("normal", "命令超时"), ("stall", "主循环阻塞")):
+        stats = result[name]
+        print(f"{name:<10}{stats['trials']:>8}{str(stats['mean_ms']):>10}{str(stats['worst_ms']):>10}  {reference}")
+        if stats["not_stopped"]:
+            print(f"⚠ {name}: {stats['not_stopped']} 次未停机")
+    parked = result["parked"]
+    print(f"parked    {parked['trials']:>8}  停机后阻塞 {parked['stall_ms']}ms，复位 {parked['resets']} 次")
+    if parked["resets"]:
+        print(f"⚠ parked: 停车时的阻塞导致 {parked['resets']} 次复位")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='急停延迟测试（模拟硬件与硬件看门狗）')
+    parser.add_argument('--trials', type=int, default=5,
+                        help='每种场景的测试次数，默认5')
+    parser.add_argument('--timeout-ms', type=int,
+                        help='覆盖 safety.command_timeout_ms 和各组死人开关超时（缩短测试时间）')
+    parser.add_argument('--hardware-timeout-ms', type=int,
+                        help='覆盖 safety.watchdog.hardware_timeout_ms')
+    parser.add_argument('--seed', type=int, default=1,
+                        help='阻塞时刻的随机种子，默认1')
+    parser.add_argument('--config', type=str,
+                        help='配置文件路径，默认 app/config.json')
+    parser.add_argument('--output', type=str,
+                        help='把结果保存为JSON文件')
+    args = parser.parse_args()
+
+    config = sim_env.load_config(args.config)
+    safety = dict(config["safety"])
+    if args.timeout_ms:
+        safety["command_timeout_ms"] = args.timeout_ms
+        # 覆盖所有执行器组的死人开关
+        safety["deadman"] = dict(safety.get("deadman", {}), timeouts_ms={})
+    if args.hardware_timeout_ms:
+        safety["watchdog"] = dict(safety.get("watchdog", {}), hardware_timeout_ms=args.hardware_timeout_ms)
+    config = dict(config, safety=safety)
+
+    result = run_benchmark(config, args.trials, args.seed)
+    print_report(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+        print(f"\n✓ 结果已保存: {args.output}")
+
+    stalled = result["normal"]["not_stopped"] + result["stall"]["not_stopped"]
+    sys.exit(1 if stalled or result["parked"]["resets"] else 0)
+
+
+if __name__ == '__main__':
+    main()
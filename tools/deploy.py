@@ -5,6 +5,7 @@ Pico部署工具
 import os
 import sys
 import json
+import gzip
 import hashlib
 import shutil
 from pathlib import Path
@@ -40,12 +41,18 @@ class PicoDeployer:
     # 部署记录文件（存储在Pico上）
     DEPLOY_RECORD_FILE = ".deploy_record.json"
     
-    def __init__(self, project_root=None):
+    # 前端中需要预压缩的文本类文件（设备端以 Content-Encoding: gzip 发送 .gz 副本）
+    GZIP_EXTENSIONS = {'.html', '.js', '.css', '.json', '.svg', '.txt'}
+    # 小于此大小的文件压缩收益太小，原样复制
+    GZIP_MIN_SIZE = 512
+    
+    def __init__(self, project_root=None, use_gzip=True):
         """
         初始化部署器
         
         Args:
             project_root: 项目根目录，默认为脚本所在目录的上级目录
+            use_gzip: 是否将前端文本文件预压缩为 .gz 部署
         """
         if project_root is None:
             project_root = Path(__file__).parent.parent
@@ -54,6 +61,7 @@ class PicoDeployer:
         self.app_dir = self.project_root / "app"
         self.lib_dir = self.project_root / "lib"
         self.frontend_dist_dir = self.project_root / "frontend" / "dist"
+        self.use_gzip = use_gzip
         self.pico_path = None
         self.deploy_record = {}
         
@@ -201,6 +209,81 @@ class PicoDeployer:
             print(f"✗ 复制文件失败 {src_path} -> {dest_path}: {e}")
             return False
     
+    def gzip_file(self, src_path, dest_path, relative_path):
+        """
+        将文件压缩为 .gz 写入目标位置并更新记录
+        
+        压缩结果固定 mtime=0，源文件不变时输出逐字节相同。
+        记录中保存源文件哈希，因此增量判断与普通文件一致。
+        
+        Args:
+            src_path: 源文件路径
+            dest_path: 目标 .gz 文件路径
+            relative_path: 相对路径（用于记录）
+        
+        Returns:
+            bool: 是否成功
+        """
+        try:
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            
+            with open(src_path, 'rb') as f:
+                data = gzip.compress(f.read(), compresslevel=9, mtime=0)
+            with open(dest_path, 'wb') as f:
+                f.write(data)
+            
+            record_key = str(relative_path).replace('\\', '/')
+            self.deploy_record[record_key] = {
+                'hash': self.calculate_file_hash(src_path),
+                'size': len(data),
+                'original_size': src_path.stat().st_size,
+                'mtime': datetime.now().isoformat(),
+            }
+            
+            return True
+        except Exception as e:
+            print(f"✗ 压缩文件失败 {src_path} -> {dest_path}: {e}")
+            return False
+    
+    def should_gzip(self, src_path):
+        """
+        判断前端文件是否以 .gz 形式部署
+        
+        Args:
+            src_path: 源文件路径
+        
+        Returns:
+            bool: 是否预压缩
+        """
+        if not self.use_gzip or src_path.suffix.lower() not in self.GZIP_EXTENSIONS:
+            return False
+        return src_path.stat().st_size >= self.GZIP_MIN_SIZE
+    
+    def list_frontend_files(self):
+        """
+        列出前端构建文件及其在Pico上的相对路径
+        
+        Returns:
+            list: (源文件路径, static/下的相对路径, 是否预压缩) 列表
+        """
+        frontend_files = []
+        for root, dirs, files in os.walk(self.frontend_dist_dir):
+            # 跳过隐藏目录
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+            
+            for file in files:
+                if file.startswith('.'):
+                    continue
+                
+                src_path = Path(root) / file
+                rel_path = src_path.relative_to(self.frontend_dist_dir)
+                compress = self.should_gzip(src_path)
+                if compress:
+                    # 只部署 .gz 副本，节省闪存
+                    rel_path = rel_path.with_name(rel_path.name + '.gz')
+                frontend_files.append((src_path, rel_path, compress))
+        return frontend_files
+    
     def deploy_app(self):
         """部署应用代码"""
         print("\n" + "="*60)
@@ -328,18 +411,7 @@ class PicoDeployer:
         pico_static_dir.mkdir(exist_ok=True)
         
         # 获取所有前端文件
-        frontend_files = []
-        for root, dirs, files in os.walk(self.frontend_dist_dir):
-            # 跳过隐藏目录
-            dirs[:] = [d for d in dirs if not d.startswith('.')]
-            
-            for file in files:
-                if file.startswith('.'):
-                    continue
-                
-                src_path = Path(root) / file
-                rel_path = src_path.relative_to(self.frontend_dist_dir)
-                frontend_files.append((src_path, rel_path))
+        frontend_files = self.list_frontend_files()
         
         print(f"找到 {len(frontend_files)} 个前端文件")
         
@@ -348,14 +420,19 @@ class PicoDeployer:
         skipped = 0
         failed = 0
         
-        for src_path, rel_path in frontend_files:
+        for src_path, rel_path, compress in frontend_files:
             dest_path = pico_static_dir / rel_path
             full_rel_path = Path("static") / rel_path
             
             # 检查是否需要复制
             if self.should_copy_file(src_path, dest_path, full_rel_path):
-                if self.copy_file(src_path, dest_path, full_rel_path):
-                    print(f"  ✓ static/{rel_path}")
+                write = self.gzip_file if compress else self.copy_file
+                if write(src_path, dest_path, full_rel_path):
+                    if compress:
+                        info = self.deploy_record[str(full_rel_path).replace('\\', '/')]
+                        print(f"  ✓ static/{rel_path} ({info['original_size']} -> {info['size']} 字节)")
+                    else:
+                        print(f"  ✓ static/{rel_path}")
                     copied += 1
                 else:
                     failed += 1
@@ -407,16 +484,10 @@ class PicoDeployer:
                     rel_path = src_path.relative_to(self.lib_dir)
                     project_files.add(f"lib/{str(rel_path).replace(chr(92), '/')}")
         
-        # 前端文件
+        # 前端文件（预压缩的文件以 .gz 名称计入，旧的未压缩副本会被清理）
         if self.frontend_dist_dir.exists():
-            for root, dirs, files in os.walk(self.frontend_dist_dir):
-                dirs[:] = [d for d in dirs if not d.startswith('.')]
-                for file in files:
-                    if file.startswith('.'):
-                        continue
-                    src_path = Path(root) / file
-                    rel_path = src_path.relative_to(self.frontend_dist_dir)
-                    project_files.add(f"static/{str(rel_path).replace(chr(92), '/')}")
+            for src_path, rel_path, compress in self.list_frontend_files():
+                project_files.add(f"static/{str(rel_path).replace(chr(92), '/')}")
         
         # 检查Pico上的文件
         to_delete = []
@@ -582,6 +653,7 @@ def main():
   python deploy.py --force         # 强制重新部署所有文件
   python deploy.py --status        # 查看部署状态
   python deploy.py --check-clean   # 检查需要清理的文件（不实际删除）
+  python deploy.py --no-gzip       # 前端文件不预压缩，原样部署
         """
     )
     
@@ -593,13 +665,15 @@ def main():
                         help='仅显示部署状态，不执行部署')
     parser.add_argument('--check-clean', action='store_true',
                         help='检查需要清理的文件（不实际删除）')
+    parser.add_argument('--no-gzip', action='store_true',
+                        help='不预压缩前端文件（默认将文本文件部署为 .gz）')
     parser.add_argument('--project-root', type=str,
                         help='项目根目录（默认为脚本所在目录的上级目录）')
     
     args = parser.parse_args()
     
     # 创建部署器
-    deployer = PicoDeployer(project_root=args.project_root)
+    deployer = PicoDeployer(project_root=args.project_root, use_gzip=not args.no_gzip)
     
     # 查找Pico
     if not deployer.find_pico():
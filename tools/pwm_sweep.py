@@ -0,0 +1,135 @@
+"""
+电机PWM参数扫描工具
+在模拟硬件上对不同的PWM频率、占空比量化位数、最小占空比/死区组合，
+把速度 0-100% 逐一写入电机驱动器，统计实际产生的不同输出级数
+"""
+import io
+import json
+import math
+import argparse
+import contextlib
+
+import sim_env
+
+
+def parse_list(text, cast=int):
+    """解析逗号分隔的数值列表"""
+    return [cast(item) for item in text.split(',') if item.strip()]
+
+
+def measure(controller_cls, pins, pwm_cfg):
+    """
+    测量一组PWM参数的输出分辨率
+
+    Args:
+        controller_cls: TB6612Controller
+        pins: 驱动器引脚（board.Pin）字典
+        pwm_cfg: PWM配置（frequency / resolution_bits / min_duty / deadband）
+
+    Returns:
+        dict: 测量结果
+    """
+    # 驱动器初始化时的打印不计入输出
+    with contextlib.redirect_stdout(io.StringIO()):
+        controller = controller_cls(pwm_a=pwm_cfg, pwm_b=pwm_cfg, **pins)
+
+    pwm = controller.pwma.pwm
+    levels = []
+    for speed in range(0, 101):
+        controller.set_motors(speed, 0)
+        levels.append(pwm.level)
+    controller.deinit()
+
+    full = pwm.top + 1
+    nonzero = [level for level in levels if level > 0]
+    first_speed = next((speed for speed, level in enumerate(levels) if level > 0), None)
+    return {
+        "frequency": pwm_cfg["frequency"],
+        "resolution_bits": pwm_cfg["resolution_bits"],
+        "min_duty": pwm_cfg["min_duty"],
+        "deadband": pwm_cfg["deadband"],
+        "hw_levels": full,
+        "hw_bits": round(math.log2(full), 1),
+        "speed_steps": len(set(nonzero)),
+        "first_speed": first_speed,
+        "first_duty_pct": round(100.0 * nonzero[0] / full, 2) if nonzero else None,
+    }
+
+
+def run_sweep(config, frequencies, bits_list, min_duty, deadband):
+    """
+    对所有参数组合执行测量
+
+    Returns:
+        list: 每个组合的测量结果
+    """
+    sim_env.install()
+    import board
+    from motor_controller import TB6612Controller
+
+    track_cfg = config["motors"]["tracks"]
+    pins = {}
+    for name in ("pwma_pin", "ain1_pin", "ain2_pin", "pwmb_pin", "bin1_pin", "bin2_pin", "stby_pin"):
+        pins[name] = getattr(board, track_cfg[name])
+
+    results = []
+    for frequency in frequencies:
+        for bits in bits_list:
+            pwm_cfg = {
+                "frequency": frequency,
+                "resolution_bits": bits,
+                "min_duty": min_duty,
+                "deadband": deadband,
+            }
+            results.append(measure(TB6612Controller, pins, pwm_cfg))
+    return results
+
+
+def print_report(results):
+    """打印结果表格"""
+    print("=" * 72)
+    print("电机PWM参数扫描（速度 0-100%，模拟RP2350 PWM）")
+    print("=" * 72)
+    print(f"{'频率Hz':>8}{'量化位':>8}{'硬件级数':>10}{'硬件位':>8}{'速度级数':>10}"
+          f"{'起转速度%':>10}{'起转占空比%':>12}")
+    for r in results:
+        first_speed = "-" if r["first_speed"] is None else r["first_speed"]
+        first_duty = "-" if r["first_duty_pct"] is None else r["first_duty_pct"]
+        print(f"{r['frequency']:>8}{r['resolution_bits']:>8}{r['hw_levels']:>10}{r['hw_bits']:>8}"
+              f"{r['speed_steps']:>10}{first_speed:>10}{first_duty:>12}")
+    print("\n速度级数 = 1-100% 命令实际产生的不同非零输出级数（最多100）")
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='电机PWM参数扫描（模拟硬件）')
+    parser.add_argument('--config', type=str,
+                        help='配置文件路径，默认 app/config.json')
+    parser.add_argument('--frequencies', type=str, default='1000,5000,20000,40000',
+                        help='PWM频率列表（Hz），逗号分隔')
+    parser.add_argument('--bits', type=str, default='16,12,10,8,6',
+                        help='占空比量化位数列表，逗号分隔')
+    parser.add_argument('--min-duty', type=float,
+                        help='最小占空比(%%)，默认取配置中 motors.tracks.pwm.min_duty')
+    parser.add_argument('--deadband', type=float,
+                        help='死区(%%)，默认取配置中 motors.tracks.pwm.deadband')
+    parser.add_argument('--output', type=str,
+                        help='把结果保存为JSON文件')
+    args = parser.parse_args()
+
+    config = sim_env.load_config(args.config)
+    pwm_cfg = config["motors"]["tracks"].get("pwm", {})
+    min_duty = args.min_duty if args.min_duty is not None else pwm_cfg.get("min_duty", 0)
+    deadband = args.deadband if args.deadband is not None else pwm_cfg.get("deadband", 0)
+
+    results = run_sweep(config, parse_list(args.frequencies), parse_list(args.bits), min_duty, deadband)
+    print_report(results)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n✓ 结果已保存: {args.output}")
+
+
+if __name__ == '__main__':
+    main()
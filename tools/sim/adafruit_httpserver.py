@@ -0,0 +1,189 @@
+"""
+Simulated `adafruit_httpserver`.
+
+Requests and WebSocket frames are injected in-process instead of arriving
+over sockets, so the whole `code.py` stack can be driven from a host script.
+"""
+
+import os
+from collections import deque
+
+GET = "GET"
+POST = "POST"
+
+
+class Request:
+    """Simulated HTTP request"""
+
+    def __init__(self, server, path, method=GET, headers=None, client_address=("127.0.0.1", 0)):
+        self.server = server
+        self.method = method
+        self.headers = headers or {}
+        self.client_address = client_address
+        # Socket stand-in (frames are recorded by Websocket._send_bytes)
+        self.connection = None
+        # "?a=1&b=2" -> query_params (QueryParams.get() in the real library)
+        self.path, _, query = path.partition("?")
+        self.query_params = {}
+        for pair in query.split("&"):
+            if pair:
+                name, _, value = pair.partition("=")
+                self.query_params[name] = value
+
+
+class Response:
+    """Simulated HTTP response"""
+
+    def __init__(self, request, body="", *, status=(200, "OK"), headers=None, content_type=None):
+        self.request = request
+        self.body = body
+        self.status = status
+        self.headers = dict(headers or {})
+        self.content_type = content_type
+
+
+class FileResponse(Response):
+    """Simulated file response, read in buffer_size chunks like the real one"""
+
+    def __init__(self, request, filename="index.html", root_path=None, *, status=(200, "OK"),
+                 headers=None, content_type=None, buffer_size=1024):
+        super().__init__(request, b"", status=status, headers=headers, content_type=content_type)
+        root_path = root_path or request.server.root_path
+        self.path = os.path.join(Server.static_dir or root_path, filename.lstrip("/"))
+        self.chunks = []
+        with open(self.path, "rb") as f:
+            while True:
+                chunk = f.read(buffer_size)
+                if not chunk:
+                    break
+                self.chunks.append(len(chunk))
+                self.body += chunk
+        self.headers["Content-Length"] = str(len(self.body))
+
+
+class Websocket:
+    """Simulated WebSocket connection backed by in-memory queues"""
+
+    TEXT = 0x1
+    BINARY = 0x2
+
+    def __init__(self, request, buffer_size=1024):
+        self.request = request
+        self._request = request
+        self.inbound = deque()
+        self.sent = []
+        self.closed = False
+        request.server.websockets.append(self)
+
+    def inject(self, message):
+        """Queue a client frame (str for text, bytes for binary)"""
+        self.inbound.append(message)
+
+    def receive(self, fail_silently=False):
+        if self.closed:
+            if fail_silently:
+                return None
+            raise RuntimeError("Websocket is closed")
+        if not self.inbound:
+            return None
+        return self.inbound.popleft()
+
+    def send_message(self, message, opcode=None, fail_silently=False):
+        if self.closed:
+            if fail_silently:
+                return
+            raise RuntimeError("Websocket is closed")
+        opcode = opcode or (self.TEXT if isinstance(message, str) else self.BINARY)
+        if opcode == self.TEXT:
+            # Like the library: text payloads must be str (bytes raise here)
+            message.encode()
+        self.sent.append(message)
+
+    def _send_bytes(self, conn, buffer):
+        """Write raw frame bytes; records the payload the client receives"""
+        frame = bytes(buffer)
+        length = frame[1] & 0x7F
+        offset = 2
+        if length == 126:
+            length = int.from_bytes(frame[2:4], "big")
+            offset = 4
+        elif length == 127:
+            length = int.from_bytes(frame[2:10], "big")
+            offset = 10
+        payload = frame[offset:offset + length]
+        self.sent.append(payload.decode() if frame[0] & 0x0F == self.TEXT else payload)
+
+    def close(self):
+        self.closed = True
+
+
+class Server:
+    """Simulated HTTP server dispatching injected requests to routes"""
+
+    instances = []
+    # Host directory standing in for the device root_path (e.g. frontend/dist)
+    static_dir = None
+
+    def __init__(self, socket_source, root_path=None, *, debug=False):
+        self.socket_source = socket_source
+        self.root_path = root_path
+        self.debug = debug
+        self.routes = {}
+        self.pending = deque()
+        self.websockets = []
+        self.host = None
+        self.port = None
+        Server.instances.append(self)
+
+    def route(self, path, methods=GET):
+        def decorator(handler):
+            self.routes[path] = handler
+            return handler
+        return decorator
+
+    def _match(self, path):
+        """Find a handler and its URL parameters ("<name>" matches one segment)"""
+        handler = self.routes.get(path)
+        if handler is not None:
+            return handler, {}
+        parts = path.split("/")
+        for pattern, handler in self.routes.items():
+            pattern_parts = pattern.split("/")
+            if "<" not in pattern or len(pattern_parts) != len(parts):
+                continue
+            params = {}
+            for want, got in zip(pattern_parts, parts):
+                if want.startswith("<") and want.endswith(">"):
+                    if not got:
+                        break
+                    params[want[1:-1]] = got
+                elif want != got:
+                    break
+            else:
+                return handler, params
+        return None, None
+
+    def start(self, host="0.0.0.0", port=5000):
+        self.host = host
+        self.port = port
+
+    def inject(self, path, headers=None):
+        """Queue a request to be served by the next poll()"""
+        self.pending.append(Request(self, path, headers=headers))
+
+    def request(self, path, headers=None):
+        """Serve a request immediately and return the handler result"""
+        return self._dispatch(Request(self, path, headers=headers))
+
+    def _dispatch(self, request):
+        handler, params = self._match(request.path)
+        if handler is None:
+            return Response(request, "Not Found", status=(404, "Not Found"))
+        return handler(request, **params)
+
+    def poll(self):
+        if self.pending:
+            self._dispatch(self.pending.popleft())
+
+    def stop(self):
+        pass
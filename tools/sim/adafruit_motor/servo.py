@@ -0,0 +1,47 @@
+"""
+Simulated `adafruit_motor.servo`, using the same duty-cycle math as the real library.
+"""
+
+
+class Servo:
+    """Positional servo driven through a 16-bit PWM output"""
+
+    def __init__(self, pwm_out, *, actuation_range=180, min_pulse=750, max_pulse=2250):
+        self._pwm_out = pwm_out
+        self.actuation_range = actuation_range
+        self.set_pulse_width_range(min_pulse, max_pulse)
+
+    def set_pulse_width_range(self, min_pulse=750, max_pulse=2250):
+        self._min_duty = int((min_pulse * self._pwm_out.frequency) / 1000000 * 0xFFFF)
+        max_duty = (max_pulse * self._pwm_out.frequency) / 1000000 * 0xFFFF
+        self._duty_range = int(max_duty - self._min_duty)
+
+    @property
+    def fraction(self):
+        if self._pwm_out.duty_cycle == 0:
+            return None
+        return (self._pwm_out.duty_cycle - self._min_duty) / self._duty_range
+
+    @fraction.setter
+    def fraction(self, value):
+        if value is None:
+            self._pwm_out.duty_cycle = 0
+            return
+        if not 0.0 <= value <= 1.0:
+            raise ValueError("Must be 0.0 to 1.0")
+        self._pwm_out.duty_cycle = self._min_duty + int(value * self._duty_range)
+
+    @property
+    def angle(self):
+        if self.fraction is None:
+            return None
+        return self.actuation_range * self.fraction
+
+    @angle.setter
+    def angle(self, new_angle):
+        if new_angle is None:
+            self.fraction = None
+            return
+        if new_angle < 0 or new_angle > self.actuation_range:
+            raise ValueError("Angle out of range")
+        self.fraction = new_angle / self.actuation_range
@@ -0,0 +1,126 @@
+"""
+Simulated `adafruit_pca9685` driver.
+
+Mirrors the register layout and duty-cycle math of the real library. Each
+I2C transaction is recorded as an "i2c" event and each LED register update
+as a "pca9685" event (channel, 12-bit OFF count).
+"""
+
+import struct
+
+from hwsim import RECORDER
+
+_MODE1 = 0x00
+_PRESCALE = 0xFE
+_LED0_ON_L = 0x06
+_CHANNELS = 16
+
+
+class _I2CDevice:
+    """Register-level stand-in for adafruit_bus_device.I2CDevice"""
+
+    def __init__(self, pca, address):
+        self.pca = pca
+        self.device_address = address
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def write(self, buf, *, start=0, end=None):
+        data = bytes(buf[start:end])
+        RECORDER.record("i2c", self.device_address, data)
+        self.pca._write_registers(data[0], data[1:])
+
+
+class PWMChannel:
+    """A single PCA9685 channel emulating a PWMOut"""
+
+    def __init__(self, pca, index):
+        self._pca = pca
+        self._index = index
+
+    @property
+    def frequency(self):
+        return self._pca.frequency
+
+    @property
+    def duty_cycle(self):
+        on, off = self._pca.pwm_regs[self._index]
+        if on == 0x1000:
+            return 0xFFFF
+        return off << 4
+
+    @duty_cycle.setter
+    def duty_cycle(self, value):
+        if not 0 <= value <= 0xFFFF:
+            raise ValueError(f"Out of range: value {value} not 0 <= value <= 65,535")
+        if value == 0xFFFF:
+            on, off = 0x1000, 0
+        else:
+            on, off = 0, (value + 1) >> 4
+        with self._pca.i2c_device as i2c:
+            i2c.write(struct.pack("<BHH", _LED0_ON_L + 4 * self._index, on, off))
+
+
+class PCA9685:
+    """Simulated PCA9685 16-channel PWM driver"""
+
+    def __init__(self, i2c_bus, *, address=0x40, reference_clock_speed=25000000):
+        self.i2c_bus = i2c_bus
+        self.i2c_device = _I2CDevice(self, address)
+        self.reference_clock_speed = reference_clock_speed
+        self.registers = bytearray(256)
+        self.registers[_PRESCALE] = 0x1E
+        self.pwm_regs = [(0, 0)] * _CHANNELS
+        self.channels = [PWMChannel(self, i) for i in range(_CHANNELS)]
+        self.reset()
+
+    def _write_registers(self, register, data):
+        """Apply a register write, honouring MODE1 auto-increment"""
+        auto_increment = self.registers[_MODE1] & 0x20
+        for offset, byte in enumerate(data if auto_increment else data[:1]):
+            reg = register + offset
+            self.registers[reg] = byte
+            if _LED0_ON_L <= reg < _LED0_ON_L + 4 * _CHANNELS and (reg - _LED0_ON_L) % 4 == 3:
+                channel = (reg - _LED0_ON_L) // 4
+                on, off = struct.unpack_from("<HH", self.registers, _LED0_ON_L + 4 * channel)
+                self.pwm_regs[channel] = (on, off)
+                RECORDER.record("pca9685", channel, off if on != 0x1000 else 0x1000)
+
+    @property
+    def mode1_reg(self):
+        return self.registers[_MODE1]
+
+    @mode1_reg.setter
+    def mode1_reg(self, value):
+        with self.i2c_device as i2c:
+            i2c.write(bytes((_MODE1, value & 0xFF)))
+
+    @property
+    def prescale_reg(self):
+        return self.registers[_PRESCALE]
+
+    def reset(self):
+        self.mode1_reg = 0x00
+
+    @property
+    def frequency(self):
+        return self.reference_clock_speed / 4096 / (self.prescale_reg + 1)
+
+    @frequency.setter
+    def frequency(self, freq):
+        prescale = int(self.reference_clock_speed / 4096.0 / freq + 0.5) - 1
+        if prescale < 3:
+            raise ValueError("PCA9685 cannot output at the given frequency")
+        old_mode = self.mode1_reg
+        self.mode1_reg = (old_mode & 0x7F) | 0x10
+        with self.i2c_device as i2c:
+            i2c.write(bytes((_PRESCALE, prescale)))
+        self.mode1_reg = old_mode
+        self.mode1_reg = old_mode | 0xA0
+
+    def deinit(self):
+        self.reset()
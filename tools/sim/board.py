@@ -0,0 +1,13 @@
+"""
+Simulated `board` module for a Raspberry Pi Pico 2W.
+"""
+
+from microcontroller import Pin
+
+for _i in range(29):
+    globals()[f"GP{_i}"] = Pin(f"GP{_i}")
+
+LED = Pin("LED")
+A0 = GP26
+A1 = GP27
+A2 = GP28
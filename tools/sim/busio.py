@@ -0,0 +1,38 @@
+"""
+Simulated `busio` module. I2C transactions are recorded per write.
+"""
+
+from hwsim import RECORDER
+
+
+class I2C:
+    """Simulated I2C bus"""
+
+    def __init__(self, scl, sda, *, frequency=100000, timeout=255):
+        self.scl = scl
+        self.sda = sda
+        self.frequency = frequency
+        self._locked = False
+
+    def try_lock(self):
+        if self._locked:
+            return False
+        self._locked = True
+        return True
+
+    def unlock(self):
+        self._locked = False
+
+    def scan(self):
+        return [0x40]
+
+    def writeto(self, address, buffer, *, start=0, end=None):
+        RECORDER.record("i2c", address, bytes(buffer[start:end]))
+
+    def readfrom_into(self, address, buffer, *, start=0, end=None):
+        end = len(buffer) if end is None else end
+        for i in range(start, end):
+            buffer[i] = 0
+
+    def deinit(self):
+        pass
@@ -0,0 +1,66 @@
+"""
+Simulated `digitalio` module recording every output write.
+"""
+
+import hwsim
+from hwsim import RECORDER
+
+
+class Direction:
+    INPUT = "input"
+    OUTPUT = "output"
+
+
+class Pull:
+    UP = "up"
+    DOWN = "down"
+
+
+class DriveMode:
+    PUSH_PULL = "push_pull"
+    OPEN_DRAIN = "open_drain"
+
+
+class DigitalInOut:
+    """Simulated GPIO pin"""
+
+    def __init__(self, pin):
+        self.pin = pin
+        self._direction = Direction.INPUT
+        self.pull = None
+        self._value = False
+
+    @property
+    def direction(self):
+        return self._direction
+
+    @direction.setter
+    def direction(self, direction):
+        if direction == Direction.OUTPUT and self not in hwsim.OUTPUTS:
+            hwsim.OUTPUTS.append(self)
+        self._direction = direction
+
+    @property
+    def value(self):
+        return self._value
+
+    @value.setter
+    def value(self, value):
+        self._value = bool(value)
+        RECORDER.record("gpio", self.pin.name, self._value)
+
+    def switch_to_output(self, value=False, drive_mode=DriveMode.PUSH_PULL):
+        self.direction = Direction.OUTPUT
+        self.value = value
+
+    def release(self):
+        """Chip reset: back to an input (recorded as low)"""
+        self.value = False
+        self.direction = Direction.INPUT
+
+    def switch_to_input(self, pull=None):
+        self.direction = Direction.INPUT
+        self.pull = pull
+
+    def deinit(self):
+        pass
@@ -0,0 +1,90 @@
+"""
+Hardware write recorder for the simulated CircuitPython backend.
+Every simulated pin, PWM and I2C write is appended here with a timestamp.
+"""
+
+import time
+
+
+class Recorder:
+    """Record simulated hardware writes as (t_ns, kind, target, value) tuples"""
+
+    def __init__(self):
+        self.events = []
+        self.counts = {}
+        self.listeners = []
+        self.enabled = True
+
+    def record(self, kind, target, value):
+        """
+        Record one hardware write
+
+        Args:
+            kind: Write type ("gpio", "pwm", "i2c", "pca9685", ...)
+            target: Pin name, I2C address or channel
+            value: Value written
+        """
+        if not self.enabled:
+            return
+        event = (time.monotonic_ns(), kind, target, value)
+        self.events.append(event)
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        for listener in self.listeners:
+            listener(event)
+
+    def reset(self):
+        """Drop all recorded events and counters"""
+        self.events = []
+        self.counts = {}
+
+    def last(self, kind=None, target=None):
+        """Get the most recent event matching kind/target, or None"""
+        for event in reversed(self.events):
+            if kind is not None and event[1] != kind:
+                continue
+            if target is not None and event[2] != target:
+                continue
+            return event
+        return None
+
+    def dump(self, path):
+        """Write all events to a JSON-lines file"""
+        import json
+        with open(path, "w") as f:
+            for t_ns, kind, target, value in self.events:
+                if isinstance(value, (bytes, bytearray)):
+                    value = value.hex()
+                f.write(json.dumps({"t_ns": t_ns, "kind": kind, "target": str(target), "value": value}) + "\n")
+
+
+RECORDER = Recorder()
+
+
+# Outputs driven low by a simulated chip reset (registered by pwmio/digitalio)
+OUTPUTS = []
+
+
+def _default_reset_handler(reason):
+    import os
+    print(f"[SIM] Chip reset by {reason} - exiting")
+    os._exit(75)
+
+
+# Called after a simulated reset has released all outputs; tools may replace it
+RESET_HANDLER = _default_reset_handler
+
+
+def hardware_reset(reason):
+    """
+    Simulate a chip reset: every output returns to its pulled-down input
+    state (recorded as writes of 0), then RESET_HANDLER(reason) runs
+
+    Args:
+        reason: Reset cause ("watchdog", ...)
+    """
+    import microcontroller
+    RECORDER.record("reset", reason, True)
+    for output in OUTPUTS:
+        output.release()
+    microcontroller.cpu.reset_reason = getattr(microcontroller.ResetReason, reason.upper(), None)
+    RESET_HANDLER(reason)
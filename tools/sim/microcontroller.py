@@ -0,0 +1,41 @@
+"""
+Simulated `microcontroller` module.
+"""
+
+from watchdog import WatchDogTimer
+
+
+class Pin:
+    """A named MCU pin"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"board.{self.name}"
+
+
+class ResetReason:
+    POWER_ON = "power_on"
+    BROWNOUT = "brownout"
+    SOFTWARE = "software"
+    DEEP_SLEEP_ALARM = "deep_sleep_alarm"
+    RESET_PIN = "reset_pin"
+    WATCHDOG = "watchdog"
+    UNKNOWN = "unknown"
+    RESCUE_DEBUG = "rescue_debug"
+
+
+class Processor:
+    """Simulated RP2350 core"""
+
+    frequency = 150_000_000
+    temperature = 25.0
+    voltage = 3.3
+    reset_reason = ResetReason.POWER_ON
+
+
+cpu = Processor()
+
+# Hardware watchdog (its thread starts when a mode is set)
+watchdog = WatchDogTimer()
@@ -0,0 +1,58 @@
+"""
+Simulated `pwmio` module recording every duty-cycle write.
+
+Models the RP2350 PWM slice: the counter wraps at TOP, chosen so that
+clock / (divider * (TOP + 1)) matches the requested frequency, and the
+16-bit duty_cycle is scaled to a compare level in 0..TOP+1. Higher
+frequencies therefore leave fewer distinct output levels.
+"""
+
+import microcontroller
+import hwsim
+from hwsim import RECORDER
+
+_MAX_TOP = 0xFFFF
+
+
+class PWMOut:
+    """Simulated PWM output (16-bit duty cycle)"""
+
+    def __init__(self, pin, *, duty_cycle=0, frequency=500, variable_frequency=False):
+        if frequency <= 0 or frequency > microcontroller.cpu.frequency // 2:
+            raise ValueError("Invalid PWM frequency")
+        self.pin = pin
+        self.frequency = frequency
+        self.variable_frequency = variable_frequency
+
+        # Smallest integer divider that lets TOP fit in 16 bits
+        cycles = microcontroller.cpu.frequency / frequency
+        divider = int(cycles // (_MAX_TOP + 1)) + 1
+        self.top = int(cycles / divider + 0.5) - 1
+
+        self._duty_cycle = 0
+        self.level = 0
+        self.duty_cycle = duty_cycle
+        hwsim.OUTPUTS.append(self)
+
+    @property
+    def duty_cycle(self):
+        return self._duty_cycle
+
+    @duty_cycle.setter
+    def duty_cycle(self, value):
+        if not 0 <= value <= 0xFFFF:
+            raise ValueError("duty_cycle must be 0-65535")
+        self._duty_cycle = int(value)
+        # Compare level actually loaded into the slice (TOP + 1 = always on)
+        if self._duty_cycle == 0xFFFF:
+            self.level = self.top + 1
+        else:
+            self.level = (self._duty_cycle * (self.top + 1) + 0x8000) >> 16
+        RECORDER.record("pwm", self.pin.name, self._duty_cycle)
+
+    def release(self):
+        """Chip reset: the pin stops driving (recorded as duty 0)"""
+        self.duty_cycle = 0
+
+    def deinit(self):
+        pass
@@ -0,0 +1,17 @@
+"""
+Simulated `rotaryio` module.
+The encoder count only changes when a test or script sets `position`.
+"""
+
+
+class IncrementalEncoder:
+    """Simulated quadrature encoder"""
+
+    def __init__(self, pin_a, pin_b, divisor=4):
+        self.pin_a = pin_a
+        self.pin_b = pin_b
+        self.divisor = divisor
+        self.position = 0
+
+    def deinit(self):
+        pass
@@ -0,0 +1,10 @@
+"""
+Simulated `socketpool` module. The simulated HTTP server never opens sockets.
+"""
+
+
+class SocketPool:
+    """Placeholder socket pool"""
+
+    def __init__(self, radio):
+        self.radio = radio
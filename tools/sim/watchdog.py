@@ -0,0 +1,95 @@
+"""
+Simulated `watchdog` module.
+
+WatchDogTimer runs on a host thread, independent of the simulated main
+loop, so a stalled loop that stops feeding it triggers a simulated chip
+reset (hwsim.hardware_reset) exactly as the RP2350 hardware would.
+Only RESET mode is supported and, as on the raspberrypi port, it cannot be
+left again: deinit() raises once the mode is RESET, and only the timeout
+can still be changed (which restarts the countdown).
+"""
+
+import threading
+import time
+
+import hwsim
+
+
+class WatchDogMode:
+    RAISE = "raise"
+    RESET = "reset"
+
+
+class WatchDogTimeout(Exception):
+    pass
+
+
+class WatchDogTimer:
+    """Simulated hardware watchdog"""
+
+    # Expiry check resolution of the background thread
+    POLL_S = 0.001
+
+    # Longest timeout the RP2350 watchdog counter can hold
+    MAX_TIMEOUT_S = 8.388
+
+    def __init__(self):
+        self._timeout = None
+        self._mode = None
+        self._deadline = None
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def timeout(self):
+        return self._timeout
+
+    @timeout.setter
+    def timeout(self, timeout):
+        if timeout > self.MAX_TIMEOUT_S:
+            raise ValueError("Invalid timeout")
+        self._timeout = timeout
+        # The port re-enables the watchdog with the new timeout
+        if self._mode is not None:
+            self.feed()
+
+    @property
+    def mode(self):
+        return self._mode
+
+    @mode.setter
+    def mode(self, mode):
+        if mode == WatchDogMode.RAISE:
+            raise NotImplementedError("RAISE mode is not supported on RP2350")
+        if mode is not None and not self.timeout:
+            raise ValueError("Set timeout before mode")
+        self._mode = mode
+        if mode is not None:
+            self.feed()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._watch, daemon=True)
+                self._thread.start()
+
+    def feed(self):
+        if self._mode is None:
+            raise ValueError("WatchDogTimer is not active")
+        with self._lock:
+            self._deadline = time.monotonic() + self.timeout
+
+    def deinit(self):
+        if self._mode == WatchDogMode.RESET:
+            raise NotImplementedError("WatchDogTimer cannot be deinitialized once mode is set to RESET")
+        with self._lock:
+            self._mode = None
+            self._deadline = None
+
+    def _watch(self):
+        while True:
+            time.sleep(self.POLL_S)
+            with self._lock:
+                expired = self._mode is not None and time.monotonic() >= self._deadline
+                if expired:
+                    self._mode = None
+                    self._deadline = None
+            if expired:
+                hwsim.hardware_reset("watchdog")
@@ -0,0 +1,41 @@
+"""
+仿真环境加载器
+把 tools/sim 中的模拟硬件模块（board、pwmio、digitalio、busio、wifi、
+adafruit_pca9685 等）和 app/ 目录加入 sys.path，使控制代码可以在 CPython 上运行。
+"""
+import os
+import sys
+from pathlib import Path
+
+TOOLS_DIR = Path(__file__).resolve().parent
+SIM_DIR = TOOLS_DIR / "sim"
+APP_DIR = TOOLS_DIR.parent / "app"
+
+
+def install(chdir=True):
+    """
+    安装模拟硬件后端
+
+    Args:
+        chdir: 是否切换工作目录到 app/（code.py 以相对路径读取 config.json）
+
+    Returns:
+        Recorder: 记录所有硬件写入的全局记录器
+    """
+    for path in (str(APP_DIR), str(SIM_DIR)):
+        if path in sys.path:
+            sys.path.remove(path)
+        sys.path.insert(0, path)
+    if chdir:
+        os.chdir(APP_DIR)
+
+    from hwsim import RECORDER
+    return RECORDER
+
+
+def load_config(path=None):
+    """读取 app/config.json（或指定文件）"""
+    import json
+    path = Path(path) if path else APP_DIR / "config.json"
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,78 @@
+"""
+主机端仿真运行工具
+在CPython上使用模拟硬件后端运行完整的 app/code.py，并记录所有硬件写入
+"""
+import sys
+import json
+import time
+import runpy
+import argparse
+import threading
+import _thread
+
+import sim_env
+
+
+def feed_websocket(script_path, interval_ms):
+    """
+    连接模拟WebSocket并按固定间隔发送脚本中的消息
+
+    Args:
+        script_path: 每行一条JSON消息的脚本文件
+        interval_ms: 消息间隔（毫秒）
+    """
+    from adafruit_httpserver import Server
+
+    # 等待code.py启动服务器
+    while not Server.instances or Server.instances[0].port is None:
+        time.sleep(0.05)
+    server = Server.instances[0]
+    server.inject("/ws")
+    while not server.websockets:
+        time.sleep(0.01)
+    ws = server.websockets[-1]
+
+    with open(script_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                ws.inject(line)
+                time.sleep(interval_ms / 1000.0)
+
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description='在模拟硬件上运行 app/code.py')
+    parser.add_argument('--duration', type=float, default=None,
+                        help='运行时长（秒），默认一直运行直到 Ctrl+C')
+    parser.add_argument('--ws-script', type=str,
+                        help='WebSocket消息脚本（每行一条JSON）')
+    parser.add_argument('--interval-ms', type=float, default=100,
+                        help='脚本消息发送间隔（毫秒），默认100')
+    parser.add_argument('--record', type=str,
+                        help='把硬件写入记录保存为JSON Lines文件')
+    args = parser.parse_args()
+
+    recorder = sim_env.install()
+
+    if args.ws_script:
+        threading.Thread(target=feed_websocket,
+                         args=(args.ws_script, args.interval_ms),
+                         daemon=True).start()
+    if args.duration:
+        # 到时后模拟Ctrl+C，走code.py的正常停机流程
+        threading.Timer(args.duration, _thread.interrupt_main).start()
+
+    try:
+        runpy.run_path("code.py", run_name="__main__")
+    except KeyboardInterrupt:
+        pass
+
+    print(f"\n硬件写入统计: {json.dumps(recorder.counts)}")
+    if args.record:
+        recorder.dump(args.record)
+        print(f"✓ 记录已保存: {args.record} ({len(recorder.events)} 条)")
+
+
+if __name__ == '__main__':
+    main()